@@ -3,16 +3,28 @@
 Application Configuration Management
 """
 
+import atexit
 import os
+import threading
 from configparser import ConfigParser
 from pathlib import Path
 
 
+# 修改配置后延迟写盘的秒数，期间的多次修改合并为一次写入
+SAVE_DELAY = 1.0
+
+_MISSING = object()
+
+
 class Config:
-    """应用配置类"""
+    """应用配置类
     
-    def __init__(self):
-        self.config_dir = Path.home() / ".offline_dictionary"
+    ``set`` 只修改内存中的配置，在 ``SAVE_DELAY`` 秒内没有新修改时合并写入一次；
+    ``save`` 立即写入尚未保存的修改。文件先写入临时文件再替换，写入中断不会损坏配置。
+    """
+    
+    def __init__(self, config_dir=None):
+        self.config_dir = Path(config_dir) if config_dir else Path.home() / ".offline_dictionary"
         self.config_file = self.config_dir / "config.ini"
         self.data_dir = self.config_dir / "data"
         self.images_dir = self.data_dir / "images"
@@ -23,9 +35,18 @@ class Config:
         # 创建必要的目录
         self._create_directories()
         
+        # 写盘状态和类型转换缓存
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer = None
+        self._cache = {}
+        
         # 加载配置
         self.config = ConfigParser()
         self._load_config()
+        
+        # 退出时写入尚未保存的修改
+        atexit.register(self.save)
     
     def _create_directories(self):
         """创建必要的目录"""
@@ -63,9 +84,53 @@ class Config:
         self.config['SEARCH'] = {
             'default_type': 'all',
             'save_history': 'true',
+            'history_limit': '500',
             'default_fuzzy': 'true',
             'case_sensitive': 'false',
-            'search_in_definitions': 'true'
+            'search_in_definitions': 'true',
+            'phonetic_algorithm': 'metaphone',
+            'phonetic_max_distance': '2',
+            'live_search': 'true',
+            'debounce_ms': '250'
+        }
+        
+        self.config['UI'] = {
+            'screen_cache_size': '4',
+            'prewarm_screens': ''
+        }
+        
+        self.config['IDS'] = {
+            'stroke_tolerance': '1.0',
+            'render_supersample': '4'
+        }
+        
+        self.config['NETWORK'] = {
+            'timeout': '10',
+            'max_workers': '8',
+            'url_cache_ttl': '3600'
+        }
+        
+        self.config['LOGGING'] = {
+            'level': 'INFO',
+            'file_enabled': 'true',
+            'console_enabled': 'false',
+            'max_file_size': '2MB',
+            'backup_count': '5',
+            'retention_days': '14',
+            'rate_limit': '20',
+            'rate_burst': '100'
+        }
+        
+        self.config['DEBUG'] = {
+            'instrumentation': 'false',
+            'histogram_size': '1024',
+            'slow_query_enabled': 'true',
+            'slow_query_ms': '200',
+            'slow_query_buffer': '100',
+            'slow_query_explain': 'true',
+            'profiler_rate': '100',
+            'frame_monitor': 'false',
+            'frame_jank_ms': '50'
         }
         
         self.config['DATABASE'] = {
@@ -83,32 +148,79 @@ class Config:
         self.save_config()
     
     def save_config(self):
-        """保存配置到文件"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            self.config.write(f)
+        """立即将配置写入文件（先写临时文件再原子替换）"""
+        with self._lock:
+            self._cancel_pending_save()
+            temp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                self.config.write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.config_file)
+            self._dirty = False
     
     def get(self, section, key, fallback=None):
         """获取配置值"""
-        return self.config.get(section, key, fallback=fallback)
+        return self._get_cached('str', section, key, fallback, self.config.get)
     
     def set(self, section, key, value):
-        """设置配置值"""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, key, str(value))
-        self.save_config()
+        """设置配置值（延迟合并写盘）"""
+        value = str(value)
+        with self._lock:
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            elif self.config.get(section, key, raw=True, fallback=None) == value:
+                return
+            self.config.set(section, key, value)
+            self._cache.clear()
+            self._dirty = True
+            self._schedule_save()
     
     def get_boolean(self, section, key, fallback=False):
         """获取布尔配置值"""
-        return self.config.getboolean(section, key, fallback=fallback)
+        return self._get_cached('bool', section, key, fallback, self.config.getboolean)
     
     def get_int(self, section, key, fallback=0):
         """获取整数配置值"""
-        return self.config.getint(section, key, fallback=fallback)
+        return self._get_cached('int', section, key, fallback, self.config.getint)
+    
+    def get_float(self, section, key, fallback=0.0):
+        """获取浮点数配置值"""
+        return self._get_cached('float', section, key, fallback, self.config.getfloat)
     
     def save(self):
-        """保存配置"""
-        self.save_config()
+        """保存配置（立即写入尚未保存的修改）"""
+        with self._lock:
+            if self._dirty:
+                self.save_config()
+    
+    @property
+    def has_pending_changes(self) -> bool:
+        """是否有尚未写盘的修改"""
+        return self._dirty
+    
+    def _get_cached(self, kind, section, key, fallback, getter):
+        """读取并缓存转换后的配置值，配置修改时清空缓存"""
+        cache_key = (kind, section, key, fallback)
+        value = self._cache.get(cache_key, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                value = getter(section, key, fallback=fallback)
+                self._cache[cache_key] = value
+        return value
+    
+    def _schedule_save(self):
+        """重新计时，延迟写盘"""
+        self._cancel_pending_save()
+        self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _cancel_pending_save(self):
+        """取消尚未执行的延迟写盘"""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
 
 
 # 全局配置实例
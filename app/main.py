@@ -5,13 +5,17 @@ Application Main Entry Point
 
 import sys
 import os
+import threading
 from pathlib import Path
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from utils.startup_timer import startup_timer
+
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.logger import Logger
 from kivymd.app import MDApp
@@ -21,6 +25,8 @@ from app.config import config
 from utils.logger import setup_logger
 from utils.theme_manager import theme_manager
 
+startup_timer.mark('imports')
+
 
 class OfflineDictionaryApp(MDApp):
     """GHLan自定义字典应用主类"""
@@ -51,6 +57,7 @@ class OfflineDictionaryApp(MDApp):
             "Caption": ["Roboto", font_size - 4, False, 1.5, None],
             "Overline": ["Roboto", font_size - 6, True, 1.5, None],
         })
+        startup_timer.mark('app_init')
     
     def build(self):
         """构建应用界面"""
@@ -60,10 +67,12 @@ class OfflineDictionaryApp(MDApp):
                 Window.size = (400, 800)  # 手机屏幕比例
             
             # 导入主界面
-            from views.main_screen import MainScreen
+            with startup_timer.phase('view_imports'):
+                from views.main_screen import MainScreen
             
             # 创建主界面
-            main_screen = MainScreen()
+            with startup_timer.phase('build'):
+                main_screen = MainScreen()
             
             Logger.info("应用启动成功")
             return main_screen
@@ -74,9 +83,30 @@ class OfflineDictionaryApp(MDApp):
     
     def on_start(self):
         """应用启动时的初始化"""
+        if config.get_boolean('DEBUG', 'instrumentation', False):
+            from services.instrumentation_service import instrumentation_service
+            instrumentation_service.enable()
+        if config.get_boolean('DEBUG', 'frame_monitor', False):
+            from services.frame_monitor_service import frame_monitor_service
+            from views.components.frame_overlay import show_frame_overlay
+            if frame_monitor_service.start():
+                show_frame_overlay(frame_monitor_service)
+        
+        # 数据库在首帧绘制之后再打开
+        Clock.schedule_once(self._on_first_frame, 0)
+    
+    def _on_first_frame(self, dt):
+        """首帧绘制后在后台初始化数据库"""
+        startup_timer.mark('first_frame')
+        threading.Thread(target=self._initialize_database, name='db-init', daemon=True).start()
+    
+    def _initialize_database(self):
+        """打开数据库，并用实际数据校正启动快照（后台线程）"""
         try:
             # 初始化数据库
             from services.database_service import db_service
+            with startup_timer.phase('database'):
+                db_service.get_instance()
             Logger.info("数据库服务已初始化")
             
             # 检查数据库连接
@@ -84,12 +114,38 @@ class OfflineDictionaryApp(MDApp):
             if db_info:
                 Logger.info(f"数据库信息: {db_info}")
             
+            from services.warm_start_service import warm_start_service
+            warm_start_service.reconcile(self._on_snapshot_reconciled)
+            
         except Exception as e:
             Logger.error(f"应用初始化失败: {e}")
+        finally:
+            startup_timer.report()
+    
+    def _on_snapshot_reconciled(self, snapshot):
+        """启动快照校正完成后刷新首页（主线程）"""
+        if self.root is not None and hasattr(self.root, 'apply_home_data'):
+            self.root.apply_home_data(snapshot.get('home', {}))
+    
+    def _save_warm_start(self):
+        """保存启动快照（数据库未打开过时无需更新）"""
+        from services.database_service import db_service
+        if db_service.is_loaded:
+            from services.warm_start_service import warm_start_service
+            warm_start_service.save()
     
     def on_pause(self):
         """应用暂停时调用（Android）"""
         Logger.info("应用暂停")
+        try:
+            # 应用可能在后台被系统结束，立即写入尚未保存的配置
+            config.save()
+        except Exception as e:
+            Logger.error(f"保存配置失败: {e}")
+        try:
+            self._save_warm_start()
+        except Exception as e:
+            Logger.error(f"保存启动快照失败: {e}")
         return True
     
     def on_resume(self):
@@ -99,9 +155,18 @@ class OfflineDictionaryApp(MDApp):
     def on_stop(self):
         """应用停止时调用"""
         try:
-            # 关闭数据库连接
+            # 写入尚未落库的搜索历史和配置
+            from services.search_history_service import search_history_service
+            search_history_service.flush()
+            config.save()
+            
+            # 保存启动快照
+            self._save_warm_start()
+            
+            # 关闭数据库连接（未打开过则无需关闭）
             from services.database_service import db_service
-            db_service.close()
+            if db_service.is_loaded:
+                db_service.close()
             Logger.info("应用已停止")
         except Exception as e:
             Logger.error(f"应用停止时出错: {e}")
@@ -0,0 +1,9 @@
+"""
+基准测试
+Benchmarks
+
+使用确定性生成的合成词典（1k ~ 1M 条）测量搜索、列表、导入、导出、备份和启动的耗时，
+结果以JSON保存，便于比较不同版本：
+
+    python -m benchmarks run --size 10k --repeat 20
+"""
@@ -0,0 +1,217 @@
+"""
+基准测试命令行
+Benchmark Command Line
+
+    python -m benchmarks run --size 100k --repeat 20 --output results.json
+    python -m benchmarks run --size 1k --only "search.*" listing
+    python -m benchmarks compare baseline.json results.json --threshold 0.10
+    python -m benchmarks history show search.all --size 100000
+    python -m benchmarks list
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 基准在无界面环境下运行，不解析Kivy的命令行参数
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks import suites  # noqa: E402,F401  仅为执行各基准的 @register 注册
+from benchmarks.dataset import BenchmarkContext, parse_dataset_size  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    BENCHMARKS, BenchmarkRunner, format_table, load_results, matches_patterns, select_benchmarks,
+    write_results
+)
+from benchmarks import compare  # noqa: E402
+from benchmarks.history import BenchmarkHistory  # noqa: E402
+
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+
+def _print(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def command_run(args) -> int:
+    """生成（或复用）数据集并执行基准"""
+    names = select_benchmarks(args.only)
+    if not names:
+        _print(f"没有匹配的基准: {' '.join(args.only)}")
+        return 2
+
+    context = BenchmarkContext(
+        parse_dataset_size(args.size), seed=args.seed, with_images=args.images,
+        workdir=args.workdir, import_rows=args.import_rows, export_rows=args.export_rows
+    )
+
+    if not context.dataset_path.exists():
+        _print(f"生成数据集 {context.size} 条 -> {context.dataset_path}")
+        started = time.perf_counter()
+        context.build(progress=lambda done, total: _print(f"  {done}/{total}"))
+        _print(f"数据集生成完成，用时 {time.perf_counter() - started:.1f}s")
+
+    runner = BenchmarkRunner(
+        repeat=args.repeat, warmup=args.warmup, min_samples=args.min_samples,
+        time_budget=args.time_budget, trace_memory=not args.no_memory,
+        progress=_print if args.verbose else None
+    )
+    with context:
+        document = runner.run(context, names)
+
+    output = args.output or (context.workdir / "results" /
+                             f"bench_{context.size}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    path = write_results(document, output)
+    print(format_table(document))
+    _print(f"结果已保存: {path}")
+
+    if args.history:
+        with BenchmarkHistory(args.history) as history:
+            history.add(document)
+        _print(f"已记录到历史: {args.history}")
+    return 1 if document.get('errors') else 0
+
+
+def command_compare(args) -> int:
+    """比较两份结果，有显著变慢时返回1"""
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    mismatch = compare.dataset_mismatch(baseline, current)
+    if mismatch:
+        _print(f"两次运行的数据集不同: {'; '.join(mismatch)}")
+        if not args.force:
+            return 2
+
+    comparisons = compare.compare_results(
+        baseline, current, threshold=args.threshold, confidence=args.confidence,
+        resamples=args.resamples, seed=args.seed
+    )
+    if args.only:
+        comparisons = [item for item in comparisons if matches_patterns(item['name'], args.only)]
+
+    print(compare.format_comparison(comparisons, args.confidence))
+    if args.json:
+        write_results({'baseline': str(args.baseline), 'current': str(args.current),
+                       'threshold': args.threshold, 'confidence': args.confidence,
+                       'comparisons': comparisons}, args.json)
+
+    regressions = [item['name'] for item in comparisons if item['status'] == compare.REGRESSION]
+    if regressions:
+        _print(f"显著变慢 {len(regressions)} 项: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _sparkline(values) -> str:
+    """用方块字符表示数值变化"""
+    values = [value for value in values if value is not None]
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return ''.join(SPARK_CHARS[int((value - low) / span * (len(SPARK_CHARS) - 1))] for value in values)
+
+
+def command_history(args) -> int:
+    """记录或查看基准历史"""
+    with BenchmarkHistory(args.history) as history:
+        if args.action == 'add':
+            for path in args.files:
+                run_id = history.add(load_results(path))
+                _print(f"{path}: {'已记录' if run_id else '已存在，跳过'}")
+            return 0
+
+        if args.action == 'list':
+            for name in history.benchmarks():
+                print(name)
+            return 0
+
+        size = parse_dataset_size(args.size) if args.size else None
+        if args.csv:
+            history.write_csv(args.benchmark, args.csv, size)
+            _print(f"已写出: {args.csv}")
+            return 0
+
+        rows = history.series(args.benchmark, size, args.limit)
+        if not rows:
+            _print(f"没有 {args.benchmark} 的历史记录")
+            return 1
+        for row in rows:
+            print(f"{row['created_at']}  {row['git_commit'] or '-':<10}{row['size']:>9}"
+                  f"{row['median']:>12.2f}{row['p95']:>12.2f}")
+        print(_sparkline(row['median'] for row in rows))
+        return 0
+
+
+def command_list(args) -> int:
+    """列出已注册的基准"""
+    for name, (group, _) in BENCHMARKS.items():
+        print(f"{group:<10}{name}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="离线词典基准测试")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help="执行基准")
+    run.add_argument('--size', default='10k', help="数据集规模：1k、10k、100k、1m 或词条数")
+    run.add_argument('--seed', type=int, default=42, help="生成器种子")
+    run.add_argument('--images', action='store_true', help="数据集包含词条图片")
+    run.add_argument('--repeat', type=int, default=10, help="每个基准的执行次数")
+    run.add_argument('--warmup', type=int, default=1, help="预热次数（不计入结果）")
+    run.add_argument('--min-samples', type=int, default=3, help="超出时间预算前至少执行的次数")
+    run.add_argument('--time-budget', type=float, default=30.0, help="每个基准的时间预算（秒）")
+    run.add_argument('--only', nargs='+', metavar='PATTERN', help="只执行匹配的基准或分组，支持通配符")
+    run.add_argument('--import-rows', type=int, help="导入基准的词条数（默认 min(规模, 1000)）")
+    run.add_argument('--export-rows', type=int, help="导出基准的词条数（默认 min(规模, 5000)）")
+    run.add_argument('--no-memory', action='store_true', help="不统计内存峰值")
+    run.add_argument('--workdir', help="数据集缓存和工作目录")
+    run.add_argument('--output', help="结果JSON路径")
+    run.add_argument('--history', help="同时记录到历史数据库")
+    run.add_argument('-v', '--verbose', action='store_true', help="输出每个基准的进度")
+    run.set_defaults(handler=command_run)
+
+    comparison = subparsers.add_parser('compare', help="比较两份结果，显著变慢时以状态1退出")
+    comparison.add_argument('baseline', help="基准版本的结果JSON")
+    comparison.add_argument('current', help="待检查版本的结果JSON")
+    comparison.add_argument('--threshold', type=float, default=compare.DEFAULT_THRESHOLD,
+                            help="视为变化的最小中位数变化比例")
+    comparison.add_argument('--confidence', type=float, default=compare.DEFAULT_CONFIDENCE, help="置信水平")
+    comparison.add_argument('--resamples', type=int, default=compare.DEFAULT_RESAMPLES, help="自助法重抽样次数")
+    comparison.add_argument('--seed', type=int, default=0, help="重抽样种子")
+    comparison.add_argument('--only', nargs='+', metavar='PATTERN', help="只比较匹配的基准或分组")
+    comparison.add_argument('--json', help="比较结果JSON路径")
+    comparison.add_argument('--force', action='store_true', help="数据集不同时仍然比较")
+    comparison.set_defaults(handler=command_compare)
+
+    history = subparsers.add_parser('history', help="基准历史")
+    history.add_argument('--history', help="历史数据库路径")
+    actions = history.add_subparsers(dest='action', required=True)
+    add = actions.add_parser('add', help="记录结果文件")
+    add.add_argument('files', nargs='+')
+    actions.add_parser('list', help="列出有记录的基准")
+    show = actions.add_parser('show', help="查看某个基准的趋势")
+    show.add_argument('benchmark')
+    show.add_argument('--size', help="只看某个数据集规模")
+    show.add_argument('--limit', type=int, default=30, help="最近的记录数")
+    show.add_argument('--csv', help="写出完整时间序列到CSV")
+    history.set_defaults(handler=command_history)
+
+    listing = subparsers.add_parser('list', help="列出全部基准")
+    listing.set_defaults(handler=command_list)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+基准结果比较
+Benchmark Comparison
+
+对两次运行中的每个基准，用自助法（bootstrap）估计中位数之比的置信区间：
+差异显著（区间不含1）且变化超过阈值的判为变慢或变快；有任一基准变慢时
+``python -m benchmarks compare`` 以非零状态退出，可直接用作发布前的检查。
+"""
+
+import random
+import statistics
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.harness import percentile
+
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 2000
+
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+INCONCLUSIVE = 'inconclusive'
+ADDED = 'added'
+REMOVED = 'removed'
+
+# 比较时必须一致的数据集参数
+DATASET_KEYS = ('size', 'seed', 'images', 'generator_version')
+
+
+def bootstrap_median_ratio(baseline: List[float], current: List[float],
+                           confidence: float = DEFAULT_CONFIDENCE,
+                           resamples: int = DEFAULT_RESAMPLES,
+                           seed: int = 0) -> Tuple[float, float, float]:
+    """中位数之比 ``median(current) / median(baseline)`` 及其置信区间 (比值, 下限, 上限)"""
+    if not baseline or not current:
+        raise ValueError("样本为空")
+    base_median = statistics.median(baseline)
+    ratio = statistics.median(current) / base_median if base_median else float('inf')
+
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        new = statistics.median(rng.choices(current, k=len(current)))
+        ratios.append(new / base if base else float('inf'))
+    ratios.sort()
+
+    tail = (1 - confidence) / 2 * 100
+    return ratio, percentile(ratios, tail), percentile(ratios, 100 - tail)
+
+
+def classify(ratio: float, low: float, high: float, threshold: float = DEFAULT_THRESHOLD) -> str:
+    """根据中位数之比及其置信区间判定变化
+
+    区间不含1（差异显著）且比值超出阈值时判为变慢或变快；
+    差异不显著且区间超出阈值范围时说明样本不足，判为无法判断。
+    """
+    if low > 1 and ratio > 1 + threshold:
+        return REGRESSION
+    if high < 1 and ratio < 1 - threshold:
+        return IMPROVEMENT
+    if low > 1 or high < 1 or (low >= 1 - threshold and high <= 1 + threshold):
+        return UNCHANGED
+    return INCONCLUSIVE
+
+
+def dataset_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """两次运行不一致的数据集参数"""
+    base = baseline.get('meta', {}).get('dataset', {})
+    new = current.get('meta', {}).get('dataset', {})
+    return [f"{key}: {base.get(key)} != {new.get(key)}" for key in DATASET_KEYS if base.get(key) != new.get(key)]
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD, confidence: float = DEFAULT_CONFIDENCE,
+                    resamples: int = DEFAULT_RESAMPLES, seed: int = 0) -> List[Dict[str, Any]]:
+    """逐个基准比较两份结果文档"""
+    base_results, new_results = baseline['results'], current['results']
+    comparisons = []
+    for name in list(base_results) + [name for name in new_results if name not in base_results]:
+        base, new = base_results.get(name), new_results.get(name)
+        if base is None or new is None:
+            comparisons.append({'name': name, 'status': ADDED if base is None else REMOVED})
+            continue
+
+        ratio, low, high = bootstrap_median_ratio(base['samples'], new['samples'],
+                                                  confidence, resamples, seed)
+        comparisons.append({
+            'name': name,
+            'status': classify(ratio, low, high, threshold),
+            'baseline_median': base['stats']['median'],
+            'current_median': new['stats']['median'],
+            'ratio': ratio,
+            'ci_low': low,
+            'ci_high': high,
+            'baseline_count': len(base['samples']),
+            'current_count': len(new['samples']),
+        })
+    return comparisons
+
+
+def has_regression(comparisons: List[Dict[str, Any]]) -> bool:
+    """是否存在显著变慢的基准"""
+    return any(item['status'] == REGRESSION for item in comparisons)
+
+
+def _interval(item: Dict[str, Any]) -> str:
+    """置信区间的变化百分比"""
+    return f"[{item['ci_low'] - 1:+.1%}, {item['ci_high'] - 1:+.1%}]"
+
+
+def format_comparison(comparisons: List[Dict[str, Any]], confidence: float = DEFAULT_CONFIDENCE) -> str:
+    """比较结果的文本表格"""
+    interval = f"{confidence:.0%} CI"
+    lines = [f"{'benchmark':<36}{'base ms':>11}{'new ms':>11}{'change':>9}{interval:>20}  status"]
+    for item in comparisons:
+        if 'ratio' not in item:
+            lines.append(f"{item['name']:<36}{'':>51}  {item['status']}")
+            continue
+        lines.append(
+            f"{item['name']:<36}{item['baseline_median']:>11.2f}{item['current_median']:>11.2f}"
+            f"{item['ratio'] - 1:>+9.1%}{_interval(item):>20}"
+            f"  {item['status']}"
+        )
+    return '\n'.join(lines)
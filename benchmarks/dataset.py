@@ -0,0 +1,129 @@
+"""
+基准数据集
+Benchmark Dataset
+
+按 (规模, 种子, 是否含图片, 生成器版本) 缓存生成好的数据库，
+每次运行复制一份工作副本，并让全局数据库服务指向它，不会改动用户的词典。
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.generator import DictionaryGenerator, GENERATOR_VERSION
+
+
+SIZES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+DEFAULT_WORKDIR = Path(tempfile.gettempdir()) / "offline_dictionary_benchmarks"
+
+
+def parse_dataset_size(value) -> int:
+    """解析 ``1k``/``10k``/``100k``/``1m`` 或词条数"""
+    text = str(value).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    count = int(text)
+    if count <= 0:
+        raise ValueError(f"数据集规模必须为正数: {value}")
+    return count
+
+
+class BenchmarkContext:
+    """一次基准运行使用的数据集和工作目录"""
+
+    def __init__(self, size: int, seed: int = 42, with_images: bool = False, workdir=None,
+                 query_count: int = 50, import_rows: int = None, export_rows: int = None):
+        self.size = size
+        self.seed = seed
+        self.with_images = with_images
+        self.workdir = Path(workdir) if workdir else DEFAULT_WORKDIR
+        self.generator = DictionaryGenerator(seed=seed, with_images=with_images)
+        self.query_count = query_count
+        self.import_rows = import_rows or min(size, 1000)
+        self.export_rows = export_rows or min(size, 5000)
+        self.run_dir = self.workdir / f"run_{os.getpid()}"
+        self.database_path = self.run_dir / "dictionary.db"
+        self._previous_database_path = None
+        self._queries = None
+
+    @property
+    def dataset_path(self) -> Path:
+        """缓存的数据集文件"""
+        images = '_img' if self.with_images else ''
+        return self.workdir / "datasets" / f"dictionary_{self.size}_s{self.seed}{images}_g{GENERATOR_VERSION}.db"
+
+    def describe(self) -> Dict[str, Any]:
+        """数据集参数（写入结果文件）"""
+        return {
+            'size': self.size,
+            'seed': self.seed,
+            'images': self.with_images,
+            'generator_version': GENERATOR_VERSION,
+            'import_rows': self.import_rows,
+            'export_rows': self.export_rows,
+        }
+
+    def build(self, progress=None) -> Path:
+        """生成数据集（已缓存时直接返回）"""
+        from services.database_service import DatabaseService
+
+        path = self.dataset_path
+        if path.exists():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        if temp_path.exists():
+            temp_path.unlink()
+
+        database = DatabaseService(str(temp_path))
+        try:
+            self.generator.populate(database, self.size, progress_callback=progress)
+            with database.engine.begin() as connection:
+                connection.exec_driver_sql("ANALYZE")
+        finally:
+            database.engine.dispose()
+        os.replace(temp_path, path)
+        return path
+
+    def __enter__(self):
+        """复制工作副本并切换全局数据库服务"""
+        from services.database_service import db_service
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.build(), self.database_path)
+        self._previous_database_path = db_service.database_path
+        db_service.database_path = self.database_path
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """切回原数据库并删除工作副本"""
+        from services.database_service import db_service
+
+        if self._previous_database_path is not None:
+            db_service.database_path = self._previous_database_path
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        return False
+
+    def queries(self) -> List[Dict[str, Any]]:
+        """查询用的词条（从数据集中确定性抽取）"""
+        if self._queries is None:
+            self._queries = [
+                self.generator.entry(index)
+                for index in self.generator.sample_indexes(self.size, self.query_count)
+            ]
+        return self._queries
+
+    def scratch_path(self, name: str) -> Path:
+        """工作目录下的临时文件路径"""
+        path = self.run_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
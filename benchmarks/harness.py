@@ -0,0 +1,257 @@
+"""
+基准测试运行器
+Benchmark Harness
+
+每个基准由工厂函数注册，工厂在计时之外完成准备工作并返回 ``BenchmarkCase``。
+运行器先预热，再重复执行若干次记录耗时（毫秒），最后单独执行一次统计内存峰值，
+避免 tracemalloc 的开销计入耗时。
+"""
+
+import fnmatch
+import gc
+import json
+import math
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 结果文件格式版本
+RESULT_SCHEMA = 1
+
+PERCENTILES = (50, 90, 95, 99)
+
+# 名称 -> (分组, 工厂函数)
+BENCHMARKS = OrderedDict()
+
+
+class BenchmarkCase:
+    """一个可重复执行的基准
+
+    ``run(arg)`` 是被计时的操作；``prepare(iteration)`` 在每次执行前调用（不计时），
+    其返回值作为 ``run`` 的参数；``teardown`` 在全部执行结束后调用。
+    """
+
+    def __init__(self, run: Callable[[Any], Any], prepare: Callable[[int], Any] = None,
+                 teardown: Callable[[], None] = None, params: Dict[str, Any] = None,
+                 trace_memory: bool = True):
+        self.run = run
+        self.prepare = prepare
+        self.teardown = teardown
+        self.params = params or {}
+        self.trace_memory = trace_memory
+
+
+def register(name: str, group: str = None):
+    """注册基准工厂（装饰器），工厂接收 ``BenchmarkContext`` 返回 ``BenchmarkCase``"""
+    def decorator(factory):
+        BENCHMARKS[name] = (group or name.split('.')[0], factory)
+        return factory
+    return decorator
+
+
+def matches_patterns(name: str, patterns: List[str], group: str = None) -> bool:
+    """名称或分组（默认为名称的第一段）是否匹配任一通配模式"""
+    group = group or name.split('.')[0]
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(group, pattern) for pattern in patterns)
+
+
+def select_benchmarks(patterns: List[str] = None) -> List[str]:
+    """按名称或分组的通配模式筛选基准"""
+    if not patterns:
+        return list(BENCHMARKS)
+    return [name for name, (group, _) in BENCHMARKS.items() if matches_patterns(name, patterns, group)]
+
+
+def percentile(sorted_samples: List[float], percent: float) -> float:
+    """线性插值的百分位数（样本需已排序）"""
+    if not sorted_samples:
+        return 0.0
+    position = (len(sorted_samples) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """样本统计：数量、最值、均值、标准差和百分位数"""
+    ordered = sorted(samples)
+    stats = {
+        'count': len(ordered),
+        'min': ordered[0] if ordered else 0.0,
+        'max': ordered[-1] if ordered else 0.0,
+        'mean': statistics.fmean(ordered) if ordered else 0.0,
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+    for percent in PERCENTILES:
+        stats['median' if percent == 50 else f'p{percent}'] = percentile(ordered, percent)
+    return stats
+
+
+def process_peak_rss_kb() -> Optional[int]:
+    """进程常驻内存峰值（KB），平台不支持时返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS以字节为单位，Linux以KB为单位
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def git_commit(cwd: Path = None) -> Optional[str]:
+    """当前代码的git提交（不在仓库中时返回None）"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class BenchmarkRunner:
+    """基准运行器类
+
+    每个基准至少执行 ``min_samples`` 次；之后若累计耗时超过 ``time_budget`` 秒则提前停止，
+    使大数据集上的慢操作不会拖住整个运行。
+    """
+
+    def __init__(self, repeat: int = 10, warmup: int = 1, min_samples: int = 3,
+                 time_budget: float = 30.0, trace_memory: bool = True, progress=None):
+        self.repeat = max(1, repeat)
+        self.warmup = max(0, warmup)
+        self.min_samples = max(1, min(min_samples, self.repeat))
+        self.time_budget = time_budget
+        self.trace_memory = trace_memory
+        self.progress = progress or (lambda message: None)
+
+    def run_case(self, case: BenchmarkCase) -> Dict[str, Any]:
+        """执行一个基准并返回结果"""
+        iteration = 0
+
+        def execute() -> float:
+            nonlocal iteration
+            arg = case.prepare(iteration) if case.prepare else None
+            iteration += 1
+            started = time.perf_counter()
+            case.run(arg)
+            return (time.perf_counter() - started) * 1000
+
+        try:
+            for _ in range(self.warmup):
+                execute()
+
+            samples = []
+            gc.collect()
+            budget_started = time.perf_counter()
+            while len(samples) < self.repeat:
+                samples.append(execute())
+                if (len(samples) >= self.min_samples
+                        and time.perf_counter() - budget_started > self.time_budget):
+                    break
+
+            peak_memory_kb = None
+            if self.trace_memory and case.trace_memory:
+                gc.collect()
+                tracemalloc.start()
+                try:
+                    execute()
+                    peak_memory_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                finally:
+                    tracemalloc.stop()
+        finally:
+            if case.teardown:
+                case.teardown()
+
+        return {
+            'unit': 'ms',
+            'samples': [round(sample, 4) for sample in samples],
+            'stats': {key: round(value, 4) for key, value in summarize(samples).items()},
+            'peak_memory_kb': peak_memory_kb,
+            'params': case.params,
+        }
+
+    def run(self, context, names: List[str]) -> Dict[str, Any]:
+        """依次执行选中的基准，返回完整的结果文档"""
+        results = OrderedDict()
+        errors = OrderedDict()
+        for name in names:
+            group, factory = BENCHMARKS[name]
+            self.progress(f"{name} ...")
+            try:
+                results[name] = self.run_case(factory(context))
+                results[name]['group'] = group
+                self.progress(f"{name}: median {results[name]['stats']['median']:.2f} ms "
+                              f"({results[name]['stats']['count']} samples)")
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+                self.progress(f"{name}: 失败 {errors[name]}")
+
+        document = {
+            'schema': RESULT_SCHEMA,
+            'meta': self.metadata(context),
+            'results': results,
+        }
+        if errors:
+            document['errors'] = errors
+        document['meta']['process_peak_rss_kb'] = process_peak_rss_kb()
+        return document
+
+    def metadata(self, context) -> Dict[str, Any]:
+        """运行环境和参数"""
+        from app import __version__
+
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'app_version': __version__,
+            'git_commit': git_commit(Path(__file__).resolve().parent.parent),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'sqlite': sqlite3.sqlite_version,
+            'dataset': context.describe(),
+            'repeat': self.repeat,
+            'warmup': self.warmup,
+            'time_budget': self.time_budget,
+        }
+
+
+def write_results(document: Dict[str, Any], path) -> Path:
+    """写出结果文件"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(path) -> Dict[str, Any]:
+    """读取结果文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('schema') != RESULT_SCHEMA:
+        raise ValueError(f"不支持的结果文件格式: {path}")
+    return document
+
+
+def format_table(document: Dict[str, Any]) -> str:
+    """结果的文本表格"""
+    lines = [f"{'benchmark':<36}{'n':>5}{'median':>12}{'p95':>12}{'p99':>12}{'peak KB':>12}"]
+    for name, result in document['results'].items():
+        stats = result['stats']
+        peak = result.get('peak_memory_kb')
+        lines.append(
+            f"{name:<36}{stats['count']:>5}{stats['median']:>12.2f}{stats['p95']:>12.2f}"
+            f"{stats['p99']:>12.2f}{(f'{peak:.0f}' if peak is not None else '-'):>12}"
+        )
+    for name, error in document.get('errors', {}).items():
+        lines.append(f"{name:<36}  ERROR {error}")
+    return '\n'.join(lines)
@@ -0,0 +1,126 @@
+"""
+基准历史
+Benchmark History
+
+将每次运行的统计结果保存到SQLite，按基准和数据集规模取出时间序列用于绘制趋势。
+"""
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.dataset import DEFAULT_WORKDIR
+
+
+DEFAULT_HISTORY_PATH = DEFAULT_WORKDIR / "history.db"
+
+SERIES_COLUMNS = ('created_at', 'git_commit', 'app_version', 'size', 'median', 'p95',
+                  'mean', 'stdev', 'count', 'peak_memory_kb')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    git_commit TEXT,
+    app_version TEXT,
+    size INTEGER,
+    seed INTEGER,
+    meta TEXT NOT NULL,
+    UNIQUE (created_at, git_commit, size, seed)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    benchmark TEXT NOT NULL,
+    median REAL,
+    p95 REAL,
+    mean REAL,
+    stdev REAL,
+    count INTEGER,
+    peak_memory_kb REAL,
+    samples TEXT,
+    PRIMARY KEY (benchmark, run_id)
+) WITHOUT ROWID;
+"""
+
+
+class BenchmarkHistory:
+    """基准历史存储类"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else DEFAULT_HISTORY_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def add(self, document: Dict[str, Any]) -> Optional[int]:
+        """记录一次运行，已记录过的运行返回None"""
+        meta = document['meta']
+        dataset = meta.get('dataset', {})
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs (created_at, git_commit, app_version, size, seed, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (meta['created_at'], meta.get('git_commit'), meta.get('app_version'),
+                 dataset.get('size'), dataset.get('seed'), json.dumps(meta, ensure_ascii=False))
+            )
+            if not cursor.rowcount:
+                return None
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO results (run_id, benchmark, median, p95, mean, stdev, count, peak_memory_kb, samples) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, name, result['stats']['median'], result['stats']['p95'],
+                     result['stats']['mean'], result['stats']['stdev'], result['stats']['count'],
+                     result.get('peak_memory_kb'), json.dumps(result['samples']))
+                    for name, result in document['results'].items()
+                ]
+            )
+        return run_id
+
+    def benchmarks(self) -> List[str]:
+        """记录过的基准名称"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT benchmark FROM results ORDER BY benchmark")]
+
+    def series(self, benchmark: str, size: int = None, limit: int = None) -> List[Dict[str, Any]]:
+        """某个基准按时间排列的结果（可按数据集规模筛选，``limit`` 取最近的若干次）"""
+        sql = (
+            "SELECT runs.created_at, runs.git_commit, runs.app_version, runs.size, results.median, "
+            "results.p95, results.mean, results.stdev, results.count, results.peak_memory_kb "
+            "FROM results JOIN runs ON runs.id = results.run_id WHERE results.benchmark = ?"
+        )
+        params = [benchmark]
+        if size is not None:
+            sql += " AND runs.size = ?"
+            params.append(size)
+        sql += " ORDER BY runs.created_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = [dict(row) for row in self.connection.execute(sql, params)]
+        rows.reverse()
+        return rows
+
+    def write_csv(self, benchmark: str, path, size: int = None) -> Path:
+        """将时间序列写出为CSV，便于用表格或绘图工具查看"""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SERIES_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.series(benchmark, size))
+        return path
@@ -0,0 +1,263 @@
+"""
+基准定义
+Benchmark Suites
+
+查询轮流使用数据集中抽取的词条，避免反复命中同一页缓存。
+会修改数据的基准（导入）放在最后，之前的基准都在原始数据集上执行。
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.harness import BenchmarkCase, register
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _rotating(context, build_query):
+    """按执行次数轮换查询参数"""
+    queries = [build_query(entry) for entry in context.queries()]
+    return lambda iteration: queries[iteration % len(queries)]
+
+
+# ---- 搜索 ----
+
+def _search_case(context, search_type, build_query, fuzzy=False):
+    from services.search_service import search_service
+
+    return BenchmarkCase(
+        run=lambda query: search_service.search_words(query, search_type, fuzzy=fuzzy),
+        prepare=_rotating(context, build_query),
+        params={'search_type': search_type, 'fuzzy': fuzzy}
+    )
+
+
+@register('search.latin_form')
+def search_latin_form(context):
+    return _search_case(context, 'latin_form', lambda entry: entry['latin_form'])
+
+
+@register('search.phonetic')
+def search_phonetic(context):
+    return _search_case(context, 'phonetic', lambda entry: entry['phonetic'].strip('/'))
+
+
+@register('search.definitions')
+def search_definitions(context):
+    return _search_case(context, 'definitions', lambda entry: entry['definitions'][0])
+
+
+@register('search.all')
+def search_all(context):
+    return _search_case(context, 'all', lambda entry: entry['latin_form'])
+
+
+@register('search.fuzzy')
+def search_fuzzy(context):
+    return _search_case(context, 'latin_form', lambda entry: entry['latin_form'][:4], fuzzy=True)
+
+
+@register('search.multi_field')
+def search_multi_field(context):
+    from services.search_service import search_service
+
+    fields = ['latin_form', 'phonetic', 'definitions', 'examples']
+    return BenchmarkCase(
+        run=lambda query: search_service.multi_field_search(query, fields),
+        prepare=_rotating(context, lambda entry: entry['latin_form']),
+        params={'search_fields': fields}
+    )
+
+
+@register('search.pattern')
+def search_pattern(context):
+    from services.search_service import search_service
+
+    return BenchmarkCase(
+        run=lambda pattern: search_service.search_by_pattern(pattern, ['latin_form']),
+        prepare=_rotating(context, lambda entry: f"^{re.escape(entry['latin_form'][:3])}.*us$"),
+        params={'search_fields': ['latin_form']}
+    )
+
+
+@register('search.sound_alike')
+def search_sound_alike(context):
+    from services.search_service import search_service
+
+    return BenchmarkCase(
+        run=lambda query: search_service.search_sound_alike(query),
+        prepare=_rotating(context, lambda entry: entry['latin_form'].replace('c', 'k')),
+    )
+
+
+@register('search.suggestions')
+def search_suggestions(context):
+    from services.search_service import search_service
+
+    return BenchmarkCase(
+        run=lambda prefix: search_service.get_search_suggestions(prefix),
+        prepare=_rotating(context, lambda entry: entry['latin_form'][:3]),
+    )
+
+
+# ---- 列表 ----
+
+def _listing_case(context, offset, sort_by='word_id', order='asc', limit=50):
+    from services.dictionary_service import dictionary_service
+
+    return BenchmarkCase(
+        run=lambda _: dictionary_service.get_all_word_entries(limit, offset, sort_by, order),
+        params={'limit': limit, 'offset': offset, 'sort_by': sort_by, 'order': order}
+    )
+
+
+@register('listing.first_page')
+def listing_first_page(context):
+    return _listing_case(context, 0)
+
+
+@register('listing.deep_page')
+def listing_deep_page(context):
+    return _listing_case(context, max(0, context.size // 2 - 50))
+
+
+@register('listing.sorted_latin_desc')
+def listing_sorted_latin(context):
+    return _listing_case(context, 0, 'latin_form', 'desc')
+
+
+@register('listing.word_count')
+def listing_word_count(context):
+    from services.dictionary_service import dictionary_service
+
+    return BenchmarkCase(run=lambda _: dictionary_service.get_word_count())
+
+
+# ---- 导出 ----
+
+def _export_case(context, export_method, suffix):
+    from sqlalchemy.orm import selectinload
+    from models import WordEntry
+    from services.database_service import db_service
+    from services.export_service import export_service
+
+    export_dir = context.scratch_path("exports")
+    export_dir.mkdir(parents=True, exist_ok=True)
+    previous_dir = export_service.export_dir
+
+    def run(filename):
+        with db_service.get_session() as session:
+            entries = session.query(WordEntry).options(
+                selectinload(WordEntry.definitions),
+                selectinload(WordEntry.examples)
+            ).order_by(WordEntry.word_id).limit(context.export_rows).all()
+            getattr(export_service, export_method)(entries, filename)
+
+    def teardown():
+        export_service.export_dir = previous_dir
+
+    export_service.export_dir = export_dir
+    return BenchmarkCase(
+        run=run,
+        prepare=lambda iteration: f"bench_{iteration}{suffix}",
+        teardown=teardown,
+        params={'rows': context.export_rows}
+    )
+
+
+@register('export.dict_format')
+def export_dict_format(context):
+    return _export_case(context, 'export_to_dict_format', '.txt')
+
+
+@register('export.excel')
+def export_excel(context):
+    return _export_case(context, 'export_to_excel', '.xlsx')
+
+
+# ---- 备份 ----
+
+@register('backup.copy')
+def backup_copy(context):
+    from services.database_service import db_service
+
+    def run(path):
+        if not db_service.backup_database(str(path)):
+            raise RuntimeError("备份失败")
+
+    return BenchmarkCase(
+        run=run,
+        prepare=lambda iteration: context.scratch_path(f"backups/backup_{iteration % 2}.db"),
+        params={'database_bytes': context.database_path.stat().st_size}
+    )
+
+
+# ---- 启动 ----
+
+@register('startup.open_database')
+def startup_open_database(context):
+    from services.database_service import DatabaseService
+
+    def run(_):
+        # 打开连接并执行建表/迁移检查，与应用启动时相同
+        DatabaseService(str(context.database_path)).engine.dispose()
+
+    return BenchmarkCase(run=run)
+
+
+@register('startup.warm_snapshot')
+def startup_warm_snapshot(context):
+    from services.warm_start_service import WarmStartService
+
+    service = WarmStartService(path=str(context.scratch_path("warm_start.json")))
+    return BenchmarkCase(run=lambda _: service.capture())
+
+
+@register('startup.process')
+def startup_process(context):
+    script = (
+        "from services.database_service import DatabaseService;"
+        "from services.search_service import search_service;"
+        f"DatabaseService({str(context.database_path)!r}).engine.dispose()"
+    )
+
+    def run(_):
+        subprocess.run([sys.executable, '-c', script], cwd=ROOT_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # 子进程的内存不在 tracemalloc 统计范围内
+    return BenchmarkCase(run=run, trace_memory=False, params={'python': sys.executable})
+
+
+# ---- 导入（修改数据，放在最后） ----
+
+def _import_case(context, write_file, import_method):
+    from services.import_service import import_service
+
+    def prepare(iteration):
+        # 每次使用不同前缀，导入的都是新词条
+        return write_file(context.scratch_path(f"imports/import_{iteration}"), f"I{iteration:03d}")
+
+    def run(path):
+        result = getattr(import_service, import_method)(str(path))
+        if result['failed']:
+            raise RuntimeError(f"导入失败 {result['failed']} 条: {result['errors'][:3]}")
+
+    return BenchmarkCase(run=run, prepare=prepare, params={'rows': context.import_rows})
+
+
+@register('import.csv')
+def import_csv(context):
+    def write_file(path, prefix):
+        return context.generator.write_csv(path.with_suffix('.csv'), 0, context.import_rows, prefix)
+    return _import_case(context, write_file, 'import_from_csv')
+
+
+@register('import.json')
+def import_json(context):
+    def write_file(path, prefix):
+        return context.generator.write_json(path.with_suffix('.json'), 0, context.import_rows, f"J{prefix}")
+    return _import_case(context, write_file, 'import_from_json')
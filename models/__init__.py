@@ -13,6 +13,10 @@ from .image import WordImage
 from .bookmark import Bookmark
 from .memo_word import MemoWord
 from .settings import UserSettings
+from .search_history import SearchHistory
+from .ids_symbol import IdsSymbol
+from .ids_component import IdsComponent
+from .stats import Stat
 
 __all__ = [
     'BaseModel',
@@ -22,5 +26,9 @@ __all__ = [
     'WordImage',
     'Bookmark',
     'MemoWord',
-    'UserSettings'
+    'UserSettings',
+    'SearchHistory',
+    'IdsSymbol',
+    'IdsComponent',
+    'Stat'
 ]
@@ -18,13 +18,21 @@ class Bookmark(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, comment='书签ID')
     title = Column(String(200), nullable=False, comment='书签标题')
     url = Column(String(500), nullable=False, comment='网址')
-    category = Column(String(100), default='未分类', comment='分类')
+    category = Column(String(100), default='未分类', index=True, comment='分类')
     description = Column(Text, comment='描述')
     
+    # 规范化网址的摘要，用于重复检测
+    url_hash = Column(String(40), index=True, comment='网址摘要')
+    
     # 时间信息
     created_at = Column(DateTime, default=func.now(), nullable=False, comment='创建时间')
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, comment='更新时间')
     
+    def refresh_url_hash(self):
+        """根据当前网址重新计算网址摘要"""
+        from utils.url_normalizer import url_hash
+        self.url_hash = url_hash(self.url)
+    
     def to_dict(self):
         """转换为字典"""
         return {
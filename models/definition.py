@@ -19,6 +19,7 @@ class Definition(Base):
     # 释义内容
     definition_text = Column(Text, nullable=False, comment='释义内容')
     definition_order = Column(Integer, default=1, comment='释义顺序')
+    definition_key = Column(Text, comment='释义搜索键')
     
     # 关联关系
     word_entry = relationship("WordEntry", back_populates="definitions")
@@ -20,6 +20,8 @@ class Example(Base):
     example_text = Column(Text, nullable=False, comment='例句内容')
     translation = Column(Text, comment='例句翻译')
     example_order = Column(Integer, default=1, comment='例句顺序')
+    example_key = Column(Text, comment='例句搜索键')
+    translation_key = Column(Text, comment='翻译搜索键')
     
     # 关联关系
     word_entry = relationship("WordEntry", back_populates="examples")
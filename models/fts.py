@@ -0,0 +1,52 @@
+"""
+全文索引定义
+Full-Text Search Indexes
+
+使用SQLite FTS5外部内容表为文本列建立全文索引，
+由触发器与源表保持同步；trigram分词支持中文和任意子串匹配。
+"""
+
+from typing import Dict, List, NamedTuple
+
+
+class FtsIndex(NamedTuple):
+    """全文索引定义"""
+    table: str
+    columns: List[str]
+
+
+# 全文索引名称 -> 定义
+FTS_INDEXES: Dict[str, FtsIndex] = {
+    'memo_words_fts': FtsIndex('memo_words', ['content']),
+    'bookmarks_fts': FtsIndex('bookmarks', ['title', 'description', 'url']),
+}
+
+# trigram分词器要求查询至少3个字符，更短的查询改用LIKE
+FTS_MIN_QUERY_LENGTH = 3
+
+
+def fts_ddl(name: str) -> List[str]:
+    """生成全文索引虚拟表及同步触发器的DDL"""
+    table, columns = FTS_INDEXES[name]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_row = (
+        f"INSERT INTO {name} ({name}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_row = f"INSERT INTO {name} (rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {table} BEGIN "
+        f"{insert_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {table} BEGIN "
+        f"{delete_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE OF {column_list} ON {table} BEGIN "
+        f"{delete_row} {insert_row} END",
+    ]
+
+
+def fts_phrase(query: str) -> str:
+    """将用户输入转换为FTS5短语查询（按子串匹配，不解析查询语法）"""
+    return '"' + query.replace('"', '""') + '"'
@@ -0,0 +1,50 @@
+"""
+IDS部件索引模型
+IDS Component Index Model
+
+部件 -> 符号的倒排索引，每行记录一个部件在某个符号结构中的位置，
+按部件和位置前缀查询后对多个条件的结果取交集即可完成结构检索。
+
+符号的 ``ids_normalized`` 为空表示索引待更新；触发器在IDS修改或符号删除时
+清除旧的索引行，由 ``IdsService.index_pending`` 增量重建。
+"""
+
+from typing import List
+
+from sqlalchemy import Column, Index, Integer, String
+
+from .base import Base
+
+
+class IdsComponent(Base):
+    """IDS部件索引模型"""
+
+    __tablename__ = 'ids_components'
+    __table_args__ = (
+        Index('ix_ids_components_symbol', 'symbol_id'),
+        {'sqlite_with_rowid': False},
+    )
+
+    # 索引表由IDS解析结果生成，不需要通用的ID和时间字段
+    id = None
+    created_at = None
+    updated_at = None
+
+    component = Column(String(64), primary_key=True, comment='部件')
+    position = Column(String(200), primary_key=True, comment='位置路径(如 right/bottom)')
+    symbol_id = Column(Integer, primary_key=True, comment='符号ID')
+    operator = Column(String(4), nullable=False, default='', comment='直接所在结构的描述符')
+
+    def __repr__(self):
+        return f"<IdsComponent(component='{self.component}', position='{self.position}', symbol_id={self.symbol_id})>"
+
+
+# 符号IDS修改或删除时清除旧索引行，并将符号标记为待索引
+IDS_COMPONENT_TRIGGERS: List[str] = [
+    "CREATE TRIGGER IF NOT EXISTS ids_components_symbol_update AFTER UPDATE OF ids_string ON ids_symbols "
+    "WHEN new.ids_string IS NOT old.ids_string BEGIN "
+    "DELETE FROM ids_components WHERE symbol_id = old.id; "
+    "UPDATE ids_symbols SET ids_normalized = NULL WHERE id = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS ids_components_symbol_delete AFTER DELETE ON ids_symbols BEGIN "
+    "DELETE FROM ids_components WHERE symbol_id = old.id; END",
+]
@@ -3,7 +3,7 @@ IDS符号模型
 IDS Symbol Model
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, func, text
 from datetime import datetime
 
 from .base import Base
@@ -13,18 +13,37 @@ class IdsSymbol(Base):
     """IDS符号模型"""
     
     __tablename__ = 'ids_symbols'
+    __table_args__ = (
+        # 只包含待索引的符号，增量索引时无需扫描全表
+        Index('ix_ids_symbols_pending', 'id',
+              sqlite_where=text('ids_string IS NOT NULL AND ids_normalized IS NULL')),
+    )
     
     # 基本信息
     id = Column(Integer, primary_key=True, autoincrement=True, comment='符号ID')
     name = Column(String(200), nullable=False, comment='符号名称')
     description = Column(Text, comment='符号描述')
-    symbols_data = Column(Text, nullable=False, comment='符号数据(JSON)')
+    symbols_data = Column(Text, nullable=False, comment='符号数据(二进制打包，旧数据为JSON)')
     canvas_size = Column(String(50), nullable=False, comment='画布大小(JSON)')
     
+    # 结构描述
+    ids_string = Column(String(500), comment='表意文字描述序列')
+    ids_normalized = Column(String(500), comment='规范化的IDS(为空表示部件索引待更新)')
+    
     # 时间信息
     created_at = Column(DateTime, default=func.now(), nullable=False, comment='创建时间')
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, comment='更新时间')
     
+    def get_symbols(self):
+        """解析符号数据（线条坐标为 float32 数组）"""
+        from utils.stroke_codec import unpack_symbols
+        return unpack_symbols(self.symbols_data)
+    
+    def set_symbols(self, symbols):
+        """以紧凑二进制格式保存符号数据"""
+        from utils.stroke_codec import pack_symbols
+        self.symbols_data = pack_symbols(symbols)
+    
     def to_dict(self):
         """转换为字典"""
         return {
@@ -33,6 +52,7 @@ class IdsSymbol(Base):
             'description': self.description,
             'symbols_data': self.symbols_data,
             'canvas_size': self.canvas_size,
+            'ids_string': self.ids_string,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
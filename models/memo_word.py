@@ -3,7 +3,7 @@
 Memo Word Model
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index, func
 from datetime import datetime
 
 from .base import Base
@@ -13,6 +13,10 @@ class MemoWord(Base):
     """备忘词条模型"""
     
     __tablename__ = 'memo_words'
+    __table_args__ = (
+        # 按状态筛选、按优先级和时间排序的列表查询
+        Index('ix_memo_words_status', 'is_completed', 'priority', 'created_at'),
+    )
     
     # 基本信息
     id = Column(Integer, primary_key=True, autoincrement=True, comment='备忘ID')
@@ -0,0 +1,42 @@
+"""
+搜索历史模型
+Search History Model
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func
+from .base import Base
+
+
+class SearchHistory(Base):
+    """搜索历史模型"""
+    
+    __tablename__ = 'search_history'
+    __table_args__ = (
+        Index('ix_search_history_last_used_at', 'last_used_at'),
+        Index('ix_search_history_hit_count', 'hit_count', 'last_used_at'),
+    )
+    
+    # 查询信息
+    query = Column(String(200), nullable=False, comment='原始查询')
+    normalized_query = Column(String(200), nullable=False, unique=True, comment='规范化查询')
+    params = Column(Text, comment='搜索参数(JSON)')
+    
+    # 统计信息
+    hit_count = Column(Integer, default=1, nullable=False, comment='搜索次数')
+    result_count = Column(Integer, default=0, comment='最近一次结果数')
+    last_used_at = Column(DateTime, default=func.now(), nullable=False, comment='最近使用时间')
+    
+    def to_dict(self):
+        """转换为字典"""
+        return {
+            'id': self.id,
+            'query': self.query,
+            'normalized_query': self.normalized_query,
+            'params': self.params,
+            'hit_count': self.hit_count,
+            'result_count': self.result_count,
+            'last_used_at': self.last_used_at
+        }
+    
+    def __repr__(self):
+        return f"<SearchHistory(id={self.id}, query='{self.query}', hits={self.hit_count})>"
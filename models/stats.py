@@ -0,0 +1,170 @@
+"""
+统计计数模型
+Statistics Counter Model
+
+统计数据由SQLite触发器在增删改时维护，读取统计只需按主键查询，
+无需对业务表做 COUNT 扫描。
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from .base import Base
+
+
+# 统计键：固定键为 "<表名>.<名称>"，分组键为 "<表名>.<分组>:<值>"
+WORD_TOTAL = 'word_entries.total'
+WORD_FAVORITES = 'word_entries.favorites'
+DEFINITION_TOTAL = 'definitions.total'
+EXAMPLE_TOTAL = 'examples.total'
+BOOKMARK_TOTAL = 'bookmarks.total'
+BOOKMARK_CATEGORY_PREFIX = 'bookmarks.category:'
+MEMO_TOTAL = 'memo_words.total'
+MEMO_PENDING = 'memo_words.pending'
+MEMO_COMPLETED = 'memo_words.completed'
+MEMO_PRIORITY_PREFIX = 'memo_words.priority:'
+IDS_SYMBOL_TOTAL = 'ids_symbols.total'
+
+# 统计定义版本，触发器或统计键变化时递增，启动时会重建统计
+STATS_VERSION = 1
+STATS_VERSION_KEY = 'stats.version'
+
+
+class Stat(Base):
+    """统计计数模型"""
+
+    __tablename__ = 'stats'
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    # 计数表只按键读写，不需要通用的ID和时间字段
+    id = None
+    created_at = None
+    updated_at = None
+
+    key = Column(String(200), primary_key=True, comment='统计键')
+    value = Column(Integer, nullable=False, default=0, comment='计数')
+
+    def __repr__(self):
+        return f"<Stat(key='{self.key}', value={self.value})>"
+
+
+def _bump(key: str, delta: str) -> str:
+    """生成将统计键加上 delta 的SQL（键不存在时先创建）"""
+    return (
+        f"INSERT OR IGNORE INTO stats (key, value) VALUES ({key}, 0);\n"
+        f"    UPDATE stats SET value = value + ({delta}) WHERE key = {key};"
+    )
+
+
+def _flag(column: str) -> str:
+    """布尔列转换为 0/1"""
+    return f"COALESCE({column}, 0)"
+
+
+def _group_key(prefix: str, column: str) -> str:
+    """分组统计键表达式"""
+    return f"'{prefix}' || IFNULL({column}, '')"
+
+
+# 触发器名称 -> (触发时机, 条件, 语句列表)
+STAT_TRIGGERS = {
+    'stats_word_entries_insert': ('AFTER INSERT ON word_entries', None, [
+        _bump(f"'{WORD_TOTAL}'", '1'),
+        _bump(f"'{WORD_FAVORITES}'", _flag('NEW.is_favorite')),
+    ]),
+    'stats_word_entries_delete': ('AFTER DELETE ON word_entries', None, [
+        _bump(f"'{WORD_TOTAL}'", '-1'),
+        _bump(f"'{WORD_FAVORITES}'", f"-{_flag('OLD.is_favorite')}"),
+    ]),
+    'stats_word_entries_favorite': (
+        'AFTER UPDATE OF is_favorite ON word_entries',
+        f"{_flag('NEW.is_favorite')} <> {_flag('OLD.is_favorite')}", [
+            _bump(f"'{WORD_FAVORITES}'", f"{_flag('NEW.is_favorite')} - {_flag('OLD.is_favorite')}"),
+        ]),
+    'stats_definitions_insert': ('AFTER INSERT ON definitions', None, [
+        _bump(f"'{DEFINITION_TOTAL}'", '1'),
+    ]),
+    'stats_definitions_delete': ('AFTER DELETE ON definitions', None, [
+        _bump(f"'{DEFINITION_TOTAL}'", '-1'),
+    ]),
+    'stats_examples_insert': ('AFTER INSERT ON examples', None, [
+        _bump(f"'{EXAMPLE_TOTAL}'", '1'),
+    ]),
+    'stats_examples_delete': ('AFTER DELETE ON examples', None, [
+        _bump(f"'{EXAMPLE_TOTAL}'", '-1'),
+    ]),
+    'stats_bookmarks_insert': ('AFTER INSERT ON bookmarks', None, [
+        _bump(f"'{BOOKMARK_TOTAL}'", '1'),
+        _bump(_group_key(BOOKMARK_CATEGORY_PREFIX, 'NEW.category'), '1'),
+    ]),
+    'stats_bookmarks_delete': ('AFTER DELETE ON bookmarks', None, [
+        _bump(f"'{BOOKMARK_TOTAL}'", '-1'),
+        _bump(_group_key(BOOKMARK_CATEGORY_PREFIX, 'OLD.category'), '-1'),
+    ]),
+    'stats_bookmarks_category': (
+        'AFTER UPDATE OF category ON bookmarks',
+        "NEW.category IS NOT OLD.category", [
+            _bump(_group_key(BOOKMARK_CATEGORY_PREFIX, 'OLD.category'), '-1'),
+            _bump(_group_key(BOOKMARK_CATEGORY_PREFIX, 'NEW.category'), '1'),
+        ]),
+    'stats_memo_words_insert': ('AFTER INSERT ON memo_words', None, [
+        _bump(f"'{MEMO_TOTAL}'", '1'),
+        _bump(f"'{MEMO_PENDING}'", f"1 - {_flag('NEW.is_completed')}"),
+        _bump(f"'{MEMO_COMPLETED}'", _flag('NEW.is_completed')),
+        _bump(_group_key(MEMO_PRIORITY_PREFIX, 'NEW.priority'), '1'),
+    ]),
+    'stats_memo_words_delete': ('AFTER DELETE ON memo_words', None, [
+        _bump(f"'{MEMO_TOTAL}'", '-1'),
+        _bump(f"'{MEMO_PENDING}'", f"{_flag('OLD.is_completed')} - 1"),
+        _bump(f"'{MEMO_COMPLETED}'", f"-{_flag('OLD.is_completed')}"),
+        _bump(_group_key(MEMO_PRIORITY_PREFIX, 'OLD.priority'), '-1'),
+    ]),
+    'stats_memo_words_completed': (
+        'AFTER UPDATE OF is_completed ON memo_words',
+        f"{_flag('NEW.is_completed')} <> {_flag('OLD.is_completed')}", [
+            _bump(f"'{MEMO_PENDING}'", f"{_flag('OLD.is_completed')} - {_flag('NEW.is_completed')}"),
+            _bump(f"'{MEMO_COMPLETED}'", f"{_flag('NEW.is_completed')} - {_flag('OLD.is_completed')}"),
+        ]),
+    'stats_memo_words_priority': (
+        'AFTER UPDATE OF priority ON memo_words',
+        "NEW.priority IS NOT OLD.priority", [
+            _bump(_group_key(MEMO_PRIORITY_PREFIX, 'OLD.priority'), '-1'),
+            _bump(_group_key(MEMO_PRIORITY_PREFIX, 'NEW.priority'), '1'),
+        ]),
+    'stats_ids_symbols_insert': ('AFTER INSERT ON ids_symbols', None, [
+        _bump(f"'{IDS_SYMBOL_TOTAL}'", '1'),
+    ]),
+    'stats_ids_symbols_delete': ('AFTER DELETE ON ids_symbols', None, [
+        _bump(f"'{IDS_SYMBOL_TOTAL}'", '-1'),
+    ]),
+}
+
+
+def trigger_ddl(name: str) -> str:
+    """生成触发器的 CREATE TRIGGER 语句"""
+    timing, condition, statements = STAT_TRIGGERS[name]
+    when = f" WHEN {condition}" if condition else ''
+    body = '\n    '.join(statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {timing} FOR EACH ROW{when}\nBEGIN\n    {body}\nEND"
+
+
+# 从业务表重新计算全部统计（安装触发器或版本变化时执行）
+STATS_REBUILD_SQL = [
+    "DELETE FROM stats",
+    f"INSERT INTO stats (key, value) SELECT '{WORD_TOTAL}', COUNT(*) FROM word_entries",
+    f"INSERT INTO stats (key, value) SELECT '{WORD_FAVORITES}', COUNT(*) FROM word_entries "
+    f"WHERE {_flag('is_favorite')} <> 0",
+    f"INSERT INTO stats (key, value) SELECT '{DEFINITION_TOTAL}', COUNT(*) FROM definitions",
+    f"INSERT INTO stats (key, value) SELECT '{EXAMPLE_TOTAL}', COUNT(*) FROM examples",
+    f"INSERT INTO stats (key, value) SELECT '{BOOKMARK_TOTAL}', COUNT(*) FROM bookmarks",
+    f"INSERT INTO stats (key, value) SELECT {_group_key(BOOKMARK_CATEGORY_PREFIX, 'category')}, COUNT(*) "
+    f"FROM bookmarks GROUP BY 1",
+    f"INSERT INTO stats (key, value) SELECT '{MEMO_TOTAL}', COUNT(*) FROM memo_words",
+    f"INSERT INTO stats (key, value) SELECT '{MEMO_PENDING}', COUNT(*) FROM memo_words "
+    f"WHERE {_flag('is_completed')} = 0",
+    f"INSERT INTO stats (key, value) SELECT '{MEMO_COMPLETED}', COUNT(*) FROM memo_words "
+    f"WHERE {_flag('is_completed')} <> 0",
+    f"INSERT INTO stats (key, value) SELECT {_group_key(MEMO_PRIORITY_PREFIX, 'priority')}, COUNT(*) "
+    f"FROM memo_words GROUP BY 1",
+    f"INSERT INTO stats (key, value) SELECT '{IDS_SYMBOL_TOTAL}', COUNT(*) FROM ids_symbols",
+    f"INSERT INTO stats (key, value) VALUES ('{STATS_VERSION_KEY}', {STATS_VERSION})",
+]
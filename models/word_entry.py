@@ -24,6 +24,13 @@ class WordEntry(Base):
     sort_order = Column(Integer, default=0, comment='排序顺序')
     notes = Column(Text, comment='备注')
     
+    # 搜索键（写入时由词典服务维护）
+    word_id_key = Column(String(50), index=True, comment='字序号搜索键')
+    latin_key = Column(String(200), index=True, comment='拉丁写法搜索键')
+    phonetic_key = Column(String(200), index=True, comment='音标搜索键')
+    latin_sound_key = Column(String(50), index=True, comment='拉丁写法语音键')
+    phonetic_sound_key = Column(String(200), index=True, comment='音标语音键')
+    
     # 关联关系
     definitions = relationship("Definition", back_populates="word_entry", cascade="all, delete-orphan")
     examples = relationship("Example", back_populates="word_entry", cascade="all, delete-orphan")
@@ -32,6 +39,16 @@ class WordEntry(Base):
     def __repr__(self):
         return f"<WordEntry(id={self.id}, word_id='{self.word_id}', latin_form='{self.latin_form}')>"
     
+    def refresh_search_keys(self):
+        """根据当前字段重新计算搜索键"""
+        from utils.text_normalizer import normalize_search_key, normalize_phonetic_key
+        from utils.phonetic import latin_sound_key, phonetic_sound_key
+        self.word_id_key = normalize_search_key(self.word_id)
+        self.latin_key = normalize_search_key(self.latin_form)
+        self.phonetic_key = normalize_phonetic_key(self.phonetic)
+        self.latin_sound_key = latin_sound_key(self.latin_form)
+        self.phonetic_sound_key = phonetic_sound_key(self.phonetic)
+    
     def get_primary_definition(self):
         """获取主要释义"""
         if self.definitions:
@@ -53,6 +70,10 @@ class WordEntry(Base):
     def to_dict(self):
         """转换为字典，包含关联数据"""
         data = super().to_dict()
+        # 搜索键属于内部字段
+        for key in ('word_id_key', 'latin_key', 'phonetic_key',
+                    'latin_sound_key', 'phonetic_sound_key'):
+            data.pop(key, None)
         data['definitions'] = self.get_all_definitions()
         data['examples'] = self.get_all_examples()
         data['has_images'] = self.has_images()
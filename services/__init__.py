@@ -3,14 +3,23 @@
 Business Logic Layer
 
 包含所有业务服务和数据处理逻辑
+
+服务类按需导入：访问 ``services.ExportService`` 时才加载对应模块，
+导入本包本身不会加载导出、导入等较重的依赖。
 """
 
-from .database_service import DatabaseService
-from .dictionary_service import DictionaryService
-from .search_service import SearchService
-from .export_service import ExportService
-from .import_service import ImportService
-from .utility_service import UtilityService
+import importlib
+
+_SERVICE_MODULES = {
+    'DatabaseService': '.database_service',
+    'DictionaryService': '.dictionary_service',
+    'SearchService': '.search_service',
+    'ExportService': '.export_service',
+    'ImportService': '.import_service',
+    'UtilityService': '.utility_service',
+    'ServiceRegistry': '.registry',
+    'service_registry': '.registry',
+}
 
 __all__ = [
     'DatabaseService',
@@ -18,5 +27,14 @@ __all__ = [
     'SearchService',
     'ExportService',
     'ImportService',
-    'UtilityService'
+    'UtilityService',
+    'ServiceRegistry',
+    'service_registry'
 ]
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        module = importlib.import_module(_SERVICE_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
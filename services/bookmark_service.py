@@ -4,11 +4,19 @@ Bookmark Service
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
+from sqlalchemy import func
+
 from models.bookmark import Bookmark
+from models.stats import BOOKMARK_TOTAL, BOOKMARK_CATEGORY_PREFIX
 from services.database_service import db_service
+from utils.url_normalizer import url_hash
+
+
+# 书签全文索引
+BOOKMARK_FTS = 'bookmarks_fts'
 
 
 class BookmarkService:
@@ -28,6 +36,12 @@ class BookmarkService:
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
+            bookmark.refresh_url_hash()
+            
+            duplicate = self.find_duplicate(bookmark.url)
+            if duplicate:
+                self.logger.warning(f"书签已存在: {bookmark.url} (ID: {duplicate.id})")
+                return None
             
             db_service.add_object(bookmark)
             self.logger.info(f"添加书签成功: {bookmark.title}")
@@ -39,12 +53,43 @@ class BookmarkService:
     
     def get_all_bookmarks(self) -> List[Bookmark]:
         """获取所有书签"""
+        return self.query_bookmarks()
+    
+    def query_bookmarks(self, category: str = None, query: str = '',
+                        limit: int = None, offset: int = 0) -> List[Bookmark]:
+        """按分类和关键词筛选书签（在数据库中筛选，最新的在前）"""
         try:
-            return db_service.get_all_objects(Bookmark)
+            with db_service.get_session() as session:
+                bookmark_query = self._filtered_query(session.query(Bookmark), category, query)
+                bookmark_query = bookmark_query.order_by(Bookmark.created_at.desc(), Bookmark.id.desc())
+                if offset:
+                    bookmark_query = bookmark_query.offset(offset)
+                if limit:
+                    bookmark_query = bookmark_query.limit(limit)
+                return bookmark_query.all()
         except Exception as e:
             self.logger.error(f"获取书签列表失败: {e}")
             return []
     
+    def _filtered_query(self, bookmark_query, category: str = None, query: str = ''):
+        """为查询添加分类和关键词（全文索引）筛选条件"""
+        if category:
+            bookmark_query = bookmark_query.filter(Bookmark.category == category)
+        if query:
+            bookmark_query = bookmark_query.filter(
+                db_service.text_search_condition(Bookmark, BOOKMARK_FTS, query)
+            )
+        return bookmark_query
+    
+    def find_duplicate(self, url: str) -> Optional[Bookmark]:
+        """查找与网址指向同一页面的已有书签（按规范化网址摘要索引查询）"""
+        try:
+            matches = db_service.get_objects_by_filter(Bookmark, {'url_hash': url_hash(url)}, limit=1)
+            return matches[0] if matches else None
+        except Exception as e:
+            self.logger.error(f"查找重复书签失败: {e}")
+            return None
+    
     def get_bookmark_by_id(self, bookmark_id: int) -> Optional[Bookmark]:
         """根据ID获取书签"""
         try:
@@ -62,29 +107,16 @@ class BookmarkService:
             return []
     
     def search_bookmarks(self, query: str) -> List[Bookmark]:
-        """搜索书签"""
-        try:
-            # 简单的文本搜索
-            all_bookmarks = self.get_all_bookmarks()
-            query_lower = query.lower()
-            
-            results = []
-            for bookmark in all_bookmarks:
-                if (query_lower in bookmark.title.lower() or 
-                    query_lower in bookmark.url.lower() or 
-                    query_lower in (bookmark.description or "").lower()):
-                    results.append(bookmark)
-            
-            return results
-            
-        except Exception as e:
-            self.logger.error(f"搜索书签失败: {e}")
+        """搜索书签（标题、描述、网址）"""
+        if not query:
             return []
+        return self.query_bookmarks(query=query)
     
     def update_bookmark(self, bookmark: Bookmark) -> bool:
         """更新书签"""
         try:
             bookmark.updated_at = datetime.now()
+            bookmark.refresh_url_hash()
             db_service.update_object(bookmark)
             self.logger.info(f"更新书签成功: {bookmark.title}")
             return True
@@ -110,25 +142,44 @@ class BookmarkService:
     def get_categories(self) -> List[str]:
         """获取所有分类"""
         try:
-            bookmarks = self.get_all_bookmarks()
-            categories = list(set([b.category for b in bookmarks if b.category]))
-            return sorted(categories)
+            categories = db_service.get_stat_group(BOOKMARK_CATEGORY_PREFIX)
+            return sorted(category for category in categories if category)
         except Exception as e:
             self.logger.error(f"获取分类失败: {e}")
             return []
     
+    def get_category_counts(self, query: str = '') -> Dict[str, int]:
+        """各分类的书签数量
+        
+        无关键词时读取触发器维护的统计；有关键词时对搜索结果按分类分组计数。
+        """
+        try:
+            if not query:
+                return dict(sorted(db_service.get_stat_group(BOOKMARK_CATEGORY_PREFIX).items()))
+            with db_service.get_session() as session:
+                rows = self._filtered_query(
+                    session.query(Bookmark.category, func.count(Bookmark.id)), query=query
+                ).group_by(Bookmark.category).order_by(Bookmark.category).all()
+                return {category or '': count for category, count in rows}
+        except Exception as e:
+            self.logger.error(f"获取分类统计失败: {e}")
+            return {}
+    
     def get_bookmark_stats(self) -> Dict[str, Any]:
         """获取书签统计信息"""
         try:
-            bookmarks = self.get_all_bookmarks()
             categories = self.get_categories()
             
+            with db_service.get_session() as session:
+                recent_count = session.query(func.count(Bookmark.id)).filter(
+                    Bookmark.created_at >= datetime.now() - timedelta(days=7)
+                ).scalar()
+            
             stats = {
-                'total_count': len(bookmarks),
+                'total_count': db_service.get_stat(BOOKMARK_TOTAL),
                 'category_count': len(categories),
                 'categories': categories,
-                'recent_count': len([b for b in bookmarks if 
-                                   (datetime.now() - b.created_at).days <= 7])
+                'recent_count': recent_count
             }
             
             return stats
@@ -3,38 +3,86 @@
 Database Service
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, inspect, bindparam, and_, or_, delete, update
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 import logging
 
 from models.base import Base
 from models.settings import SettingsBase
-from models import WordEntry, Definition, Example, WordImage, Bookmark, MemoWord, UserSettings
+from models import WordEntry, Definition, Example, WordImage, Bookmark, MemoWord, UserSettings, Stat
+from models.ids_component import IDS_COMPONENT_TRIGGERS
+from models.fts import FTS_INDEXES, FTS_MIN_QUERY_LENGTH, fts_ddl, fts_phrase
+from models.stats import STAT_TRIGGERS, STATS_REBUILD_SQL, STATS_VERSION, STATS_VERSION_KEY, trigger_ddl
 from app.config import config
+from services.registry import service_registry
+from utils.text_normalizer import fold_text, normalize_search_key, normalize_phonetic_key
+from utils.phonetic import latin_sound_key, latin_sound_prefix, phonetic_sound_key
+from utils.url_normalizer import url_hash
+
+
+# 过滤条件后缀 -> 条件构造函数，用法如 {'completed_at__lt': cutoff, 'category__in': [...]}
+FILTER_OPERATORS = {
+    'exact': lambda column, value: column.is_(None) if value is None else column == value,
+    'ne': lambda column, value: column.isnot(None) if value is None else column != value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'in': lambda column, value: column.in_(list(value)),
+    'not_in': lambda column, value: column.not_in(list(value)),
+    'isnull': lambda column, value: column.is_(None) if value else column.isnot(None),
+    'contains': lambda column, value: column.contains(value, autoescape=True),
+    # 前缀使用范围比较以命中索引
+    'startswith': lambda column, value: and_(column >= value, column < value + '\U0010ffff'),
+}
 
 
 class DatabaseService:
     """数据库服务类"""
     
-    def __init__(self):
+    def __init__(self, database_path: str = None):
         self.engine = None
         self.SessionLocal = None
+        self.fts_indexes = set()
         self.logger = logging.getLogger(__name__)
+        self._database_path = Path(database_path or config.database_path)
+        self._initialize_database()
+    
+    @property
+    def database_path(self) -> Path:
+        """数据库文件路径"""
+        return self._database_path
+    
+    @database_path.setter
+    def database_path(self, path):
+        """切换到另一个数据库文件（重新建立连接）"""
+        if Path(path) == self._database_path:
+            return
+        if self.engine:
+            self.engine.dispose()
+        self._database_path = Path(path)
+        self.fts_indexes = set()
         self._initialize_database()
     
     def _initialize_database(self):
         """初始化数据库连接"""
         try:
             # 创建数据库引擎
-            database_url = f"sqlite:///{config.database_path}"
+            database_url = f"sqlite:///{self.database_path}"
             self.engine = create_engine(
                 database_url,
                 echo=False,  # 生产环境设为False
                 pool_pre_ping=True
             )
             
+            # 记录超过阈值的慢查询
+            if config.get_boolean('DEBUG', 'slow_query_enabled', True):
+                from services.slow_query_service import slow_query_service
+                slow_query_service.attach(self.engine)
+            
             # 创建会话工厂
             self.SessionLocal = sessionmaker(
                 autocommit=False,
@@ -56,15 +104,355 @@ class DatabaseService:
         try:
             Base.metadata.create_all(bind=self.engine)
             SettingsBase.metadata.create_all(bind=self.engine)
+            self._migrate_schema()
+            self._backfill_search_keys()
+            self._install_stats()
+            self._install_fts()
+            self._install_ids_index()
             self.logger.info("数据库表创建成功")
         except Exception as e:
             self.logger.error(f"创建数据库表失败: {e}")
             raise
     
+    def _migrate_schema(self):
+        """为已有数据库补充新增的列和索引"""
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                    ))
+                    self.logger.info(f"数据库列已添加: {table.name}.{column.name}")
+                
+                for index in table.indexes:
+                    index.create(bind=connection, checkfirst=True)
+    
+    def _backfill_search_keys(self, chunk_size: int = 500):
+        """为尚未生成搜索键的旧数据补全搜索键"""
+        backfills = [
+            ("word_entries", "latin_key",
+             "SELECT id, word_id, latin_form, phonetic FROM word_entries WHERE latin_key IS NULL LIMIT :n",
+             "UPDATE word_entries SET word_id_key = :a, latin_key = :b, phonetic_key = :c WHERE id = :id",
+             lambda row: {'a': normalize_search_key(row[1]), 'b': normalize_search_key(row[2]),
+                          'c': normalize_phonetic_key(row[3])}),
+            ("definitions", "definition_key",
+             "SELECT id, definition_text FROM definitions WHERE definition_key IS NULL LIMIT :n",
+             "UPDATE definitions SET definition_key = :a WHERE id = :id",
+             lambda row: {'a': fold_text(row[1])}),
+            ("examples", "example_key",
+             "SELECT id, example_text, translation FROM examples WHERE example_key IS NULL LIMIT :n",
+             "UPDATE examples SET example_key = :a, translation_key = :b WHERE id = :id",
+             lambda row: {'a': fold_text(row[1]), 'b': fold_text(row[2])}),
+            ("bookmarks", "url_hash",
+             "SELECT id, url FROM bookmarks WHERE url_hash IS NULL LIMIT :n",
+             "UPDATE bookmarks SET url_hash = :a WHERE id = :id",
+             lambda row: {'a': url_hash(row[1])}),
+            # 语音键：切换算法后前缀不匹配的旧键也会重新生成
+            ("word_entries", "latin_sound_key",
+             "SELECT id, latin_form, phonetic FROM word_entries "
+             "WHERE latin_sound_key IS NULL OR latin_sound_key NOT LIKE :prefix LIMIT :n",
+             "UPDATE word_entries SET latin_sound_key = :a, phonetic_sound_key = :b WHERE id = :id",
+             lambda row: {'a': latin_sound_key(row[1]), 'b': phonetic_sound_key(row[2])}),
+        ]
+        params = {'n': chunk_size, 'prefix': latin_sound_prefix() + '%'}
+        
+        for table_name, key_column, select_sql, update_sql, compute in backfills:
+            total = 0
+            while True:
+                with self.engine.begin() as connection:
+                    rows = connection.execute(text(select_sql), params).fetchall()
+                    if not rows:
+                        break
+                    connection.execute(text(update_sql), [
+                        dict(compute(row), id=row[0]) for row in rows
+                    ])
+                total += len(rows)
+            if total:
+                self.logger.info(f"已补全搜索键: {table_name}.{key_column} {total} 条")
+    
+    def _install_stats(self):
+        """安装统计触发器；触发器缺失或统计版本变化时重建统计"""
+        with self.engine.begin() as connection:
+            existing = {row[0] for row in connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'stats_%'"
+            ))}
+            version = connection.execute(
+                text("SELECT value FROM stats WHERE key = :key"), {'key': STATS_VERSION_KEY}
+            ).scalar()
+            if version == STATS_VERSION and existing == set(STAT_TRIGGERS):
+                return
+            
+            for name in existing:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            for name in STAT_TRIGGERS:
+                connection.execute(text(trigger_ddl(name)))
+            self._rebuild_stats(connection)
+        self.logger.info("统计触发器已安装")
+    
+    def _rebuild_stats(self, connection):
+        """从业务表重新计算统计"""
+        for sql in STATS_REBUILD_SQL:
+            connection.execute(text(sql))
+    
+    def rebuild_stats(self) -> bool:
+        """重新计算全部统计（用于修复计数）"""
+        try:
+            with self.engine.begin() as connection:
+                self._rebuild_stats(connection)
+            return True
+        except Exception as e:
+            self.logger.error(f"重建统计失败: {e}")
+            return False
+    
+    def _install_fts(self):
+        """创建全文索引；新建的索引从源表填充"""
+        created = False
+        for name in FTS_INDEXES:
+            try:
+                with self.engine.begin() as connection:
+                    exists = connection.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                    ), {'name': name}).scalar()
+                    for ddl in fts_ddl(name):
+                        connection.execute(text(ddl))
+                    if not exists:
+                        connection.execute(text(f"INSERT INTO {name} ({name}) VALUES ('rebuild')"))
+                        self.logger.info(f"全文索引已创建: {name}")
+                        created = True
+                self.fts_indexes.add(name)
+            except SQLAlchemyError as e:
+                # 旧版SQLite可能不支持FTS5或trigram分词，搜索退回LIKE
+                self.logger.warning(f"创建全文索引失败 {name}: {e}")
+        if created:
+            # 在同一连接上建表并重建全文索引后，该连接对源表执行带RETURNING的INSERT
+            # 会报 no such table（SQLite 3.40），丢弃池中的连接
+            self.engine.dispose()
+    
+    def _install_ids_index(self):
+        """安装维护IDS部件索引的触发器"""
+        with self.engine.begin() as connection:
+            for ddl in IDS_COMPONENT_TRIGGERS:
+                connection.execute(text(ddl))
+    
+    def has_fts(self, name: str) -> bool:
+        """全文索引是否可用"""
+        return name in self.fts_indexes
+    
+    def text_search_condition(self, model, name: str, query: str):
+        """全文搜索条件：全文索引可用且查询足够长时使用FTS，否则对索引的各列做LIKE"""
+        table, columns = FTS_INDEXES[name]
+        if len(query) >= FTS_MIN_QUERY_LENGTH and self.has_fts(name):
+            param = f"{name}_match"
+            return text(
+                f"{table}.id IN (SELECT rowid FROM {name} WHERE {name} MATCH :{param})"
+            ).bindparams(**{param: fts_phrase(query)})
+        return or_(*(getattr(model, column).contains(query, autoescape=True) for column in columns))
+    
+    def get_stat(self, key: str) -> int:
+        """按键读取统计计数"""
+        return self.get_stats(key).get(key, 0)
+    
+    def get_stats(self, *keys: str) -> Dict[str, int]:
+        """按键批量读取统计计数（缺失的键计为0）"""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text("SELECT key, value FROM stats WHERE key IN :keys").bindparams(
+                    bindparam('keys', expanding=True)
+                ),
+                {'keys': list(keys)}
+            ).fetchall()
+        values = dict.fromkeys(keys, 0)
+        values.update(rows)
+        return values
+    
+    def get_stat_group(self, prefix: str) -> Dict[str, int]:
+        """读取一组分组统计（如各分类的书签数），返回 {分组值: 计数}，不含计数为0的分组"""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text("SELECT key, value FROM stats WHERE key >= :low AND key < :high AND value > 0"),
+                {'low': prefix, 'high': prefix + '\U0010ffff'}
+            ).fetchall()
+        return {key[len(prefix):]: value for key, value in rows}
+    
     def get_session(self) -> Session:
         """获取数据库会话"""
         return self.SessionLocal()
     
+    def compile_filters(self, model, filters: Dict[str, Any]) -> List:
+        """将 ``{'字段__操作': 值}`` 形式的过滤条件编译为SQL条件列表
+        
+        无后缀时为相等比较，支持的操作见 ``FILTER_OPERATORS``。
+        """
+        conditions = []
+        for key, value in (filters or {}).items():
+            field, _, operator = key.partition('__')
+            operator = operator or 'exact'
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"不支持的过滤操作: {key}")
+            column = getattr(model, field, None)
+            if column is None:
+                raise ValueError(f"{model.__name__} 没有字段: {field}")
+            conditions.append(FILTER_OPERATORS[operator](column, value))
+        return conditions
+    
+    def _build_query(self, session: Session, model, filters: Dict[str, Any] = None,
+                     order_by=None, limit: int = None, offset: int = 0):
+        """构造带过滤、排序和分页的查询"""
+        query = session.query(model).filter(*self.compile_filters(model, filters))
+        if order_by is not None:
+            order_by = order_by if isinstance(order_by, (list, tuple)) else [order_by]
+            query = query.order_by(*order_by)
+        else:
+            query = query.order_by(*inspect(model).primary_key)
+        if offset:
+            query = query.offset(offset)
+        if limit:
+            query = query.limit(limit)
+        return query
+    
+    def add_object(self, obj):
+        """添加对象，返回已分配主键的对象"""
+        try:
+            with self.get_session() as session:
+                session.add(obj)
+                session.commit()
+                session.refresh(obj)
+                session.expunge(obj)
+            return obj
+        except SQLAlchemyError as e:
+            self.logger.error(f"添加对象失败: {e}")
+            raise
+    
+    def add_objects(self, objects: List[Any]) -> int:
+        """在一个事务中批量添加对象（同一表的插入合并为批量INSERT）"""
+        try:
+            with self.get_session() as session:
+                session.add_all(objects)
+                session.commit()
+            return len(objects)
+        except SQLAlchemyError as e:
+            self.logger.error(f"批量添加对象失败: {e}")
+            raise
+    
+    def get_object_by_id(self, model, object_id) -> Optional[Any]:
+        """按主键获取对象"""
+        try:
+            with self.get_session() as session:
+                return session.get(model, object_id)
+        except SQLAlchemyError as e:
+            self.logger.error(f"获取对象失败: {e}")
+            raise
+    
+    def get_all_objects(self, model, order_by=None, limit: int = None, offset: int = 0) -> List[Any]:
+        """获取表中的对象（默认按主键排序）"""
+        return self.get_objects_by_filter(model, None, order_by=order_by, limit=limit, offset=offset)
+    
+    def get_objects_by_filter(self, model, filters: Dict[str, Any], order_by=None,
+                              limit: int = None, offset: int = 0) -> List[Any]:
+        """按过滤条件获取对象，如 ``{'is_completed': True, 'completed_at__lt': cutoff}``"""
+        try:
+            with self.get_session() as session:
+                return self._build_query(session, model, filters, order_by, limit, offset).all()
+        except SQLAlchemyError as e:
+            self.logger.error(f"查询对象失败: {e}")
+            raise
+    
+    def count_objects(self, model, filters: Dict[str, Any] = None) -> int:
+        """统计满足过滤条件的行数"""
+        try:
+            with self.get_session() as session:
+                return session.query(model).filter(*self.compile_filters(model, filters)).count()
+        except SQLAlchemyError as e:
+            self.logger.error(f"统计对象失败: {e}")
+            raise
+    
+    def iter_objects(self, model, filters: Dict[str, Any] = None, order_by=None,
+                     chunk_size: int = 500) -> Iterator[Any]:
+        """流式遍历对象，每次只从数据库取 ``chunk_size`` 行
+        
+        遍历期间会话保持打开，生成的对象在会话关闭后不应再访问延迟加载的关系。
+        """
+        with self.get_session() as session:
+            query = self._build_query(session, model, filters, order_by)
+            yield from query.yield_per(chunk_size)
+    
+    def update_object(self, obj):
+        """保存对象的修改，返回更新后的对象"""
+        try:
+            with self.get_session() as session:
+                merged = session.merge(obj)
+                session.commit()
+                session.refresh(merged)
+                session.expunge(merged)
+            return merged
+        except SQLAlchemyError as e:
+            self.logger.error(f"更新对象失败: {e}")
+            raise
+    
+    def bulk_update(self, model, filters: Dict[str, Any], values: Dict[str, Any]) -> int:
+        """用一条UPDATE语句更新满足条件的行，返回影响的行数"""
+        try:
+            with self.get_session() as session:
+                result = session.execute(
+                    update(model).where(*self.compile_filters(model, filters)).values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                session.commit()
+                return result.rowcount
+        except SQLAlchemyError as e:
+            self.logger.error(f"批量更新失败: {e}")
+            raise
+    
+    def delete_object(self, obj) -> bool:
+        """删除对象（按ORM关系级联删除子对象）"""
+        try:
+            with self.get_session() as session:
+                identity = inspect(obj).identity
+                instance = session.get(type(obj), identity) if identity else None
+                if instance is None:
+                    return False
+                session.delete(instance)
+                session.commit()
+                return True
+        except SQLAlchemyError as e:
+            self.logger.error(f"删除对象失败: {e}")
+            raise
+    
+    def delete_where(self, model, filters: Dict[str, Any]) -> int:
+        """用一条DELETE语句删除满足条件的行，返回删除的行数
+        
+        不经过ORM级联，只用于没有子表或子表由外键级联删除的模型。
+        """
+        try:
+            with self.get_session() as session:
+                result = session.execute(
+                    delete(model).where(*self.compile_filters(model, filters))
+                    .execution_options(synchronize_session=False)
+                )
+                session.commit()
+                return result.rowcount
+        except SQLAlchemyError as e:
+            self.logger.error(f"批量删除失败: {e}")
+            raise
+    
+    def clear_all_data(self):
+        """清空所有业务表（保留表结构和用户设置）"""
+        try:
+            with self.engine.begin() as connection:
+                for table in reversed(Base.metadata.sorted_tables):
+                    if table.name != Stat.__tablename__:
+                        connection.execute(table.delete())
+                self._rebuild_stats(connection)
+            self.logger.info("数据库数据已清空")
+        except SQLAlchemyError as e:
+            self.logger.error(f"清空数据失败: {e}")
+            raise
+    
     def execute_raw_sql(self, sql: str, params=None):
         """执行原始SQL"""
         try:
@@ -79,7 +467,7 @@ class DatabaseService:
         """备份数据库"""
         try:
             import shutil
-            shutil.copy2(config.database_path, backup_path)
+            shutil.copy2(self.database_path, backup_path)
             self.logger.info(f"数据库备份成功: {backup_path}")
             return True
         except Exception as e:
@@ -90,7 +478,10 @@ class DatabaseService:
         """恢复数据库"""
         try:
             import shutil
-            shutil.copy2(backup_path, config.database_path)
+            shutil.copy2(backup_path, self.database_path)
+            # 丢弃指向旧文件的连接；备份可能来自旧版本，需要补充新增的表、列、索引和触发器
+            self.engine.dispose()
+            self.create_tables()
             self.logger.info(f"数据库恢复成功: {backup_path}")
             return True
         except Exception as e:
@@ -100,22 +491,19 @@ class DatabaseService:
     def get_database_info(self):
         """获取数据库信息"""
         try:
-            with self.get_session() as session:
-                # 获取表信息
-                tables_info = {}
-                for table_name in ['word_entries', 'definitions', 'examples', 'bookmarks', 'memo_words']:
-                    result = session.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                    count = result.scalar()
-                    tables_info[table_name] = count
-                
-                # 获取数据库文件大小
-                db_size = Path(config.database_path).stat().st_size if Path(config.database_path).exists() else 0
-                
-                return {
-                    'tables': tables_info,
-                    'size_mb': round(db_size / (1024 * 1024), 2),
-                    'path': str(config.database_path)
-                }
+            # 获取表信息（读取触发器维护的统计）
+            table_names = ['word_entries', 'definitions', 'examples', 'bookmarks', 'memo_words']
+            counts = self.get_stats(*(f"{table_name}.total" for table_name in table_names))
+            tables_info = {table_name: counts[f"{table_name}.total"] for table_name in table_names}
+            
+            # 获取数据库文件大小
+            db_size = self.database_path.stat().st_size if self.database_path.exists() else 0
+            
+            return {
+                'tables': tables_info,
+                'size_mb': round(db_size / (1024 * 1024), 2),
+                'path': str(self.database_path)
+            }
         except Exception as e:
             self.logger.error(f"获取数据库信息失败: {e}")
             return None
@@ -128,4 +516,4 @@ class DatabaseService:
 
 
 # 全局数据库服务实例
-db_service = DatabaseService()
+db_service = service_registry.register('db_service', DatabaseService)
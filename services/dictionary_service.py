@@ -9,12 +9,17 @@ from typing import List, Optional, Dict, Any
 import logging
 
 from models import WordEntry, Definition, Example, WordImage
+from models.stats import WORD_TOTAL
 from services.database_service import db_service
+from utils.text_normalizer import fold_text
 
 
 class DictionaryService:
     """词典服务类"""
     
+    # 批量添加时每次查询已存在字序号的数量（低于SQLite的参数个数上限）
+    BATCH_LOOKUP_SIZE = 500
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
@@ -31,38 +36,8 @@ class DictionaryService:
                     self.logger.warning(f"词条已存在: {word_data['word_id']}")
                     return None
                 
-                # 创建词条
-                word_entry = WordEntry(
-                    word_id=word_data['word_id'],
-                    latin_form=word_data['latin_form'],
-                    phonetic=word_data.get('phonetic'),
-                    word_type=word_data.get('word_type'),
-                    notes=word_data.get('notes'),
-                    is_favorite=word_data.get('is_favorite', False),
-                    sort_order=word_data.get('sort_order', 0)
-                )
-                
+                word_entry = self._build_word_entry(word_data)
                 session.add(word_entry)
-                session.flush()  # 获取ID
-                
-                # 添加释义
-                for i, definition_text in enumerate(word_data.get('definitions', [])):
-                    definition = Definition(
-                        word_entry_id=word_entry.id,
-                        definition_text=definition_text,
-                        definition_order=i + 1
-                    )
-                    session.add(definition)
-                
-                # 添加例句
-                for i, example_data in enumerate(word_data.get('examples', [])):
-                    example = Example(
-                        word_entry_id=word_entry.id,
-                        example_text=example_data.get('text', ''),
-                        translation=example_data.get('translation'),
-                        example_order=i + 1
-                    )
-                    session.add(example)
                 
                 session.commit()
                 self.logger.info(f"词条添加成功: {word_entry.word_id}")
@@ -72,6 +47,75 @@ class DictionaryService:
             self.logger.error(f"添加词条失败: {e}")
             return None
     
+    def add_word_entries(self, entries: List[Dict[str, Any]]) -> List[bool]:
+        """批量添加词条（导入使用）
+        
+        每批只查询一次已存在的字序号、提交一次；已存在或批内重复的词条跳过。
+        提交失败时改为逐条添加，单个无效词条不影响其他词条。
+        返回与输入顺序对应的结果。
+        """
+        if not entries:
+            return []
+        try:
+            with db_service.get_session() as session:
+                word_ids = [word_data['word_id'] for word_data in entries]
+                seen = set()
+                for start in range(0, len(word_ids), self.BATCH_LOOKUP_SIZE):
+                    chunk = word_ids[start:start + self.BATCH_LOOKUP_SIZE]
+                    seen.update(row[0] for row in session.query(WordEntry.word_id).filter(
+                        WordEntry.word_id.in_(chunk)
+                    ))
+                
+                results = []
+                for word_data in entries:
+                    if word_data['word_id'] in seen:
+                        self.logger.warning(f"词条已存在: {word_data['word_id']}")
+                        results.append(False)
+                        continue
+                    seen.add(word_data['word_id'])
+                    session.add(self._build_word_entry(word_data))
+                    results.append(True)
+                
+                session.commit()
+                self.logger.info(f"批量添加词条成功: {sum(results)}条")
+                return results
+                
+        except Exception as e:
+            self.logger.error(f"批量添加词条失败，改为逐条添加: {e}")
+            return [self.add_word_entry(word_data) is not None for word_data in entries]
+    
+    def _build_word_entry(self, word_data: Dict[str, Any]) -> WordEntry:
+        """根据词条数据创建词条及其释义和例句"""
+        word_entry = WordEntry(
+            word_id=word_data['word_id'],
+            latin_form=word_data['latin_form'],
+            phonetic=word_data.get('phonetic'),
+            word_type=word_data.get('word_type'),
+            notes=word_data.get('notes'),
+            is_favorite=word_data.get('is_favorite', False),
+            sort_order=word_data.get('sort_order', 0)
+        )
+        word_entry.refresh_search_keys()
+        
+        # 添加释义
+        for i, definition_text in enumerate(word_data.get('definitions', [])):
+            word_entry.definitions.append(Definition(
+                definition_text=definition_text,
+                definition_key=fold_text(definition_text),
+                definition_order=i + 1
+            ))
+        
+        # 添加例句
+        for i, example_data in enumerate(word_data.get('examples', [])):
+            word_entry.examples.append(Example(
+                example_text=example_data.get('text', ''),
+                translation=example_data.get('translation'),
+                example_key=fold_text(example_data.get('text', '')),
+                translation_key=fold_text(example_data.get('translation')),
+                example_order=i + 1
+            ))
+        return word_entry
+    
     def update_word_entry(self, word_id: str, word_data: Dict[str, Any]) -> bool:
         """更新词条"""
         try:
@@ -91,6 +135,7 @@ class DictionaryService:
                 word_entry.notes = word_data.get('notes', word_entry.notes)
                 word_entry.is_favorite = word_data.get('is_favorite', word_entry.is_favorite)
                 word_entry.sort_order = word_data.get('sort_order', word_entry.sort_order)
+                word_entry.refresh_search_keys()
                 
                 # 更新释义
                 if 'definitions' in word_data:
@@ -104,6 +149,7 @@ class DictionaryService:
                         definition = Definition(
                             word_entry_id=word_entry.id,
                             definition_text=definition_text,
+                            definition_key=fold_text(definition_text),
                             definition_order=i + 1
                         )
                         session.add(definition)
@@ -121,6 +167,8 @@ class DictionaryService:
                             word_entry_id=word_entry.id,
                             example_text=example_data.get('text', ''),
                             translation=example_data.get('translation'),
+                            example_key=fold_text(example_data.get('text', '')),
+                            translation_key=fold_text(example_data.get('translation')),
                             example_order=i + 1
                         )
                         session.add(example)
@@ -219,8 +267,7 @@ class DictionaryService:
     def get_word_count(self) -> int:
         """获取词条总数"""
         try:
-            with db_service.get_session() as session:
-                return session.query(WordEntry).count()
+            return db_service.get_stat(WORD_TOTAL)
         except Exception as e:
             self.logger.error(f"获取词条总数失败: {e}")
             return 0
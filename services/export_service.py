@@ -8,16 +8,9 @@ from pathlib import Path
 from typing import List, Dict, Any
 import logging
 
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side
-
 from models import WordEntry
 from services.database_service import db_service
+from services.registry import service_registry
 from app.config import config
 
 
@@ -31,6 +24,13 @@ class ExportService:
     
     def export_to_pdf(self, word_entries: List[WordEntry] = None, filename: str = None, progress_callback=None) -> str:
         """导出为PDF格式"""
+        # reportlab 体积较大，仅在导出时加载
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib import colors
+        
         try:
             if word_entries is None:
                 from services.dictionary_service import dictionary_service
@@ -128,6 +128,9 @@ class ExportService:
     
     def export_to_excel(self, word_entries: List[WordEntry], filename: str = None) -> str:
         """导出为Excel格式"""
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, Alignment
+        
         try:
             if not filename:
                 filename = f"dictionary_export_{self._get_timestamp()}.xlsx"
@@ -241,4 +244,4 @@ class ExportService:
 
 
 # 全局导出服务实例
-export_service = ExportService()
+export_service = service_registry.register('export_service', ExportService)
@@ -0,0 +1,283 @@
+"""
+帧时间监测服务
+Frame Monitor Service
+
+在Kivy ``Clock`` 上注册每帧回调，记录帧间隔并按当前屏幕分别统计（滚动直方图）。
+超过阈值的长帧由看门狗线程归因：帧超时期间采样渲染线程的调用栈，
+Kivy时钟/事件循环之下最外层的项目代码函数（如 ``WordListScreen._update_display``）
+记为占用这一帧的回调，最内层的项目代码函数（如其中构造的 ``WordCard.__init__``）记为热点。
+
+Kivy的Clock回调由Cython实现，无法逐个计时，采样归因不需要修改任何回调。
+不依赖窗口，无显示环境下手动调用 ``Clock.tick()`` 同样可以测量。
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from app.config import config
+from services.registry import service_registry
+from utils.metrics import RollingHistogram
+
+
+DEFAULT_JANK_MS = 50.0
+
+# 保留的最近长帧数
+LONG_FRAME_BUFFER = 100
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Kivy调度回调的模块（时钟和事件循环），其外层的项目代码不属于这一帧的回调
+_EVENT_LOOP_FILES = (str(Path('kivy') / 'clock.py'), str(Path('kivy') / 'base.py'))
+
+
+def current_screen_name() -> str:
+    """正在运行的应用中当前显示的屏幕名称"""
+    from kivy.app import App
+
+    app = App.get_running_app()
+    manager = getattr(getattr(app, 'root', None), 'screen_manager', None)
+    return (manager.current if manager is not None else None) or 'unknown'
+
+
+def _code_label(code) -> str:
+    filename = code.co_filename
+    if not filename.startswith('<'):
+        try:
+            filename = Path(filename).resolve().relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            filename = Path(filename).name
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{code.co_firstlineno})"
+
+
+def _is_project_code(code) -> bool:
+    filename = code.co_filename
+    return (filename.startswith(str(PROJECT_ROOT)) and filename != __file__
+            and '/site-packages/' not in filename)
+
+
+def attribute_frame(frame) -> Tuple[Optional[str], Optional[str]]:
+    """调用栈归因：(回调, 热点)
+
+    由内向外查找到Kivy时钟或事件循环为止：其下最外层的项目代码函数是被调度的回调，
+    最内层的项目代码函数是热点。没有项目代码时说明时间花在Kivy自身（布局、绘制等），
+    两者都返回最内层函数。
+    """
+    if frame is None:
+        return None, None
+    innermost = frame
+    outer_code = inner_code = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.endswith(_EVENT_LOOP_FILES):
+            break
+        if _is_project_code(code):
+            inner_code = inner_code or code
+            outer_code = code
+        frame = frame.f_back
+    hotspot = _code_label(inner_code or innermost.f_code)
+    return (_code_label(outer_code) if outer_code else hotspot), hotspot
+
+
+class FrameMonitorService:
+    """帧时间监测服务类
+
+    帧时间为相邻两次每帧回调之间的间隔，包含这一帧中所有Clock回调、布局和绘制的时间。
+    """
+
+    def __init__(self, jank_ms: float = None, histogram_size: int = None,
+                 screen_provider: Callable[[], str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.jank_ms = jank_ms or config.get_float('DEBUG', 'frame_jank_ms', DEFAULT_JANK_MS)
+        self.histogram_size = histogram_size or config.get_int('DEBUG', 'histogram_size', 1024)
+        self.screen_provider = screen_provider or current_screen_name
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._long_counts = Counter()
+        self._long_frames = deque(maxlen=LONG_FRAME_BUFFER)
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._event = None
+        self._watchdog = None
+        self._stop_event = threading.Event()
+        self._last_frame = None
+        self._frame_thread = None
+        self.started_at = None
+
+    @property
+    def enabled(self) -> bool:
+        """是否正在监测"""
+        return self._event is not None
+
+    def start(self) -> bool:
+        """开始监测（保留之前的统计）"""
+        if self._event is not None:
+            return True
+        try:
+            from kivy.clock import Clock
+
+            self._last_frame = None
+            self._frame_thread = None
+            self._event = Clock.schedule_interval(self._on_frame, 0)
+            self._stop_event.clear()
+            self._watchdog = threading.Thread(target=self._watch, name='frame-watchdog', daemon=True)
+            self._watchdog.start()
+            self.started_at = self.started_at or datetime.now()
+            self.logger.info(f"帧时间监测已开启，长帧阈值 {self.jank_ms:g}ms")
+            return True
+        except Exception as e:
+            self.logger.error(f"开启帧时间监测失败: {e}")
+            self._event = None
+            return False
+
+    def stop(self):
+        """停止监测（统计保留）"""
+        if self._event is None:
+            return
+        self._event.cancel()
+        self._event = None
+        self._stop_event.set()
+        self._watchdog.join()
+        self._watchdog = None
+        self.logger.info("帧时间监测已关闭")
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._histograms = {}
+            self._long_counts = Counter()
+            self._long_frames.clear()
+            self._pending = Counter()
+        self.started_at = datetime.now() if self.enabled else None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各屏幕的帧时间统计（按长帧数降序）"""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            long_counts = dict(self._long_counts)
+        stats = {}
+        for screen, histogram in histograms:
+            item = histogram.snapshot()
+            item['long_frames'] = long_counts.get(screen, 0)
+            item['fps'] = 1000 / item['mean'] if item['mean'] else 0.0
+            stats[screen] = item
+        return dict(sorted(stats.items(), key=lambda pair: pair[1]['long_frames'], reverse=True))
+
+    def get_long_frames(self, limit: int = None) -> List[Dict[str, Any]]:
+        """最近的长帧（新的在前）"""
+        with self._lock:
+            frames = list(reversed(self._long_frames))
+        return frames[:limit] if limit else frames
+
+    def top_callbacks(self, limit: int = 10) -> List[tuple]:
+        """导致长帧最多的回调"""
+        counts = Counter(frame['callback'] for frame in self.get_long_frames() if frame['callback'])
+        return counts.most_common(limit)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """可序列化的完整数据"""
+        return {
+            'enabled': self.enabled,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'dumped_at': datetime.now().isoformat(),
+            'jank_ms': self.jank_ms,
+            'screens': self.get_stats(),
+            'long_frames': self.get_long_frames(),
+        }
+
+    def dump_json(self, filepath: str = None) -> Optional[str]:
+        """导出为JSON文件（默认写入导出目录）"""
+        try:
+            path = Path(filepath) if filepath else (
+                Path(config.exports_dir) / f"frames_{datetime.now():%Y%m%d_%H%M%S}.json"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            self.logger.info(f"帧时间统计已导出: {path}")
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"导出帧时间统计失败: {e}")
+            return None
+
+    def format_report(self, limit: int = 10) -> str:
+        """文本报告（调试面板使用）"""
+        stats = self.get_stats()
+        if not stats:
+            return "暂无数据" if self.enabled else "帧时间监测未开启"
+        lines = [
+            f"{screen}: p50 {item['p50']:.0f}ms p95 {item['p95']:.0f}ms p99 {item['p99']:.0f}ms "
+            f"长帧 {item['long_frames']}/{item['count']}"
+            for screen, item in list(stats.items())[:limit]
+        ]
+        callbacks = self.top_callbacks(5)
+        if callbacks:
+            lines.append("\n长帧回调:")
+            lines.extend(f"  {count}x {callback}" for callback, count in callbacks)
+        return '\n'.join(lines)
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        previous, self._last_frame = self._last_frame, now
+        self._frame_thread = threading.get_ident()
+        if previous is None:
+            return
+        duration_ms = (now - previous) * 1000
+        try:
+            screen = self.screen_provider()
+        except Exception:
+            screen = 'unknown'
+
+        with self._lock:
+            histogram = self._histograms.get(screen)
+            if histogram is None:
+                histogram = self._histograms[screen] = RollingHistogram(self.histogram_size)
+            pending, self._pending = self._pending, Counter()
+            if duration_ms >= self.jank_ms:
+                self._long_counts[screen] += 1
+                callback, hotspot, samples = self._summarize(pending)
+                self._long_frames.append({
+                    'at': datetime.now().isoformat(timespec='milliseconds'),
+                    'screen': screen,
+                    'duration_ms': round(duration_ms, 2),
+                    'callback': callback,
+                    'hotspot': hotspot,
+                    'samples': samples,
+                })
+        histogram.add(duration_ms)
+
+    def _watch(self):
+        """帧超过阈值仍未结束时采样渲染线程的调用栈"""
+        interval = max(self.jank_ms / 4000, 0.005)
+        threshold = self.jank_ms / 1000
+        while not self._stop_event.wait(interval):
+            last_frame, thread_id = self._last_frame, self._frame_thread
+            if last_frame is None or time.perf_counter() - last_frame < threshold:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            callback, hotspot = attribute_frame(frame)
+            del frame
+            if callback:
+                with self._lock:
+                    self._pending[(callback, hotspot)] += 1
+
+    @staticmethod
+    def _summarize(pending: Counter) -> Tuple[Optional[str], Optional[str], Dict[str, int]]:
+        """一帧内的采样汇总：采样最多的回调、该回调中采样最多的热点及各回调的采样次数"""
+        callbacks = Counter()
+        for (callback, _), count in pending.items():
+            callbacks[callback] += count
+        if not callbacks:
+            return None, None, {}
+        callback = callbacks.most_common(1)[0][0]
+        hotspots = Counter({hotspot: count for (name, hotspot), count in pending.items() if name == callback})
+        return callback, hotspots.most_common(1)[0][0], dict(callbacks.most_common(3))
+
+
+# 全局帧时间监测服务实例
+frame_monitor_service = service_registry.register('frame_monitor_service', FrameMonitorService)
@@ -0,0 +1,306 @@
+"""
+IDS符号渲染服务
+IDS Symbol Rasterization Service
+
+按指定尺寸将IDS符号渲染为图片：
+- 超采样后缩小，输出抗锯齿图像
+- 内存和磁盘两级缓存，键为 (符号ID, 更新时间, 尺寸)，符号修改后自动失效
+- 批量导出整个符号库到目录或拼图（sprite sheet），在进程池中并行渲染
+"""
+
+import io
+import json
+import math
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import logging
+import threading
+
+from app.config import config
+from services.registry import service_registry
+
+
+# 预设尺寸：列表缩略图、详情、导出
+RENDER_SIZES = {
+    'thumbnail': (64, 64),
+    'detail': (256, 256),
+    'export': (1024, 1024),
+}
+
+DEFAULT_SUPERSAMPLE = 4
+
+# 原始画布上的线宽（像素）
+STROKE_WIDTH = 2.0
+
+SizeSpec = Union[str, int, Tuple[int, int]]
+
+
+def resolve_size(size: SizeSpec) -> Tuple[int, int]:
+    """将预设名称、边长或 (宽, 高) 转换为 (宽, 高)"""
+    if isinstance(size, str):
+        return RENDER_SIZES[size]
+    if isinstance(size, int):
+        return (size, size)
+    return (int(size[0]), int(size[1]))
+
+
+def render_symbols(symbols: List[Dict[str, Any]], canvas_size: Sequence[float],
+                   size: SizeSpec, supersample: int = DEFAULT_SUPERSAMPLE,
+                   background: str = 'white', color: str = 'black'):
+    """将符号列表渲染为PIL图像
+
+    符号坐标使用Kivy画布坐标（原点在左下角），按比例缩放并居中到目标尺寸；
+    先以 ``supersample`` 倍尺寸绘制，再用Lanczos缩小得到抗锯齿效果。
+    """
+    from PIL import Image, ImageDraw
+
+    width, height = resolve_size(size)
+    factor = max(1, int(supersample))
+    canvas_width, canvas_height = (float(canvas_size[0]) or 1.0, float(canvas_size[1]) or 1.0)
+
+    scale = min(width / canvas_width, height / canvas_height) * factor
+    offset_x = (width * factor - canvas_width * scale) / 2
+    offset_y = (height * factor - canvas_height * scale) / 2
+
+    def point(x, y):
+        return (offset_x + x * scale, offset_y + (canvas_height - y) * scale)
+
+    def box(pos, box_size):
+        left, top = point(pos[0], pos[1] + box_size[1])
+        right, bottom = point(pos[0] + box_size[0], pos[1])
+        return [left, top, right, bottom]
+
+    image = Image.new('RGB', (width * factor, height * factor), background)
+    draw = ImageDraw.Draw(image)
+    line_width = max(1, round(STROKE_WIDTH * scale))
+
+    for symbol in symbols:
+        symbol_type = symbol.get('type')
+        if symbol_type == 'rectangle':
+            draw.rectangle(box(symbol['pos'], symbol['size']), outline=color, width=line_width)
+        elif symbol_type == 'circle':
+            draw.ellipse(box(symbol['pos'], symbol['size']), outline=color, width=line_width)
+        elif symbol_type == 'line':
+            points = symbol['points']
+            coordinates = [point(points[i], points[i + 1]) for i in range(0, len(points) - 1, 2)]
+            if len(coordinates) >= 2:
+                draw.line(coordinates, fill=color, width=line_width, joint='curve')
+
+    if factor > 1:
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+    return image
+
+
+def _render_job(job: Dict[str, Any]) -> Tuple[Any, Optional[bytes], str]:
+    """进程池任务：解析并渲染一个符号，返回 (符号ID, PNG数据, 错误信息)"""
+    from utils.stroke_codec import unpack_symbols
+
+    try:
+        image = render_symbols(
+            unpack_symbols(job['symbols_data']),
+            json.loads(job['canvas_size']),
+            job['size'],
+            job['supersample']
+        )
+        output = io.BytesIO()
+        image.save(output, format='PNG', optimize=True)
+        return job['id'], output.getvalue(), ''
+    except Exception as e:
+        return job['id'], None, str(e)
+
+
+class IdsRenderService:
+    """IDS符号渲染服务类"""
+
+    def __init__(self, cache_dir: str = None, memory_cache_size: int = 256,
+                 supersample: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(config.data_dir) / "ids_render_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_cache_size = max(1, memory_cache_size)
+        self.supersample = supersample or config.get_int('IDS', 'render_supersample', DEFAULT_SUPERSAMPLE)
+        self._memory_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cache_key(self, symbol, size: SizeSpec) -> Tuple[Any, str, Tuple[int, int]]:
+        """缓存键：(符号ID, 更新时间, 尺寸)"""
+        updated_at = symbol.updated_at.strftime('%Y%m%d%H%M%S%f') if symbol.updated_at else '0'
+        return (symbol.id, updated_at, resolve_size(size))
+
+    def render_png(self, symbol, size: SizeSpec = 'detail') -> Optional[bytes]:
+        """获取符号在指定尺寸下的PNG数据（优先读取缓存）"""
+        key = self.cache_key(symbol, size)
+        with self._lock:
+            data = self._memory_cache.get(key)
+            if data is not None:
+                self._memory_cache.move_to_end(key)
+                return data
+
+        path = self._cache_path(key)
+        try:
+            if path.exists():
+                data = path.read_bytes()
+            else:
+                _, data, error = _render_job(self._job(symbol, key[2]))
+                if data is None:
+                    self.logger.error(f"渲染IDS符号失败 {symbol.id}: {error}")
+                    return None
+                self._write_cache_file(key, data)
+        except Exception as e:
+            self.logger.error(f"渲染IDS符号失败 {symbol.id}: {e}")
+            return None
+
+        self._remember(key, data)
+        return data
+
+    def render(self, symbol, size: SizeSpec = 'detail'):
+        """获取符号在指定尺寸下的PIL图像"""
+        from PIL import Image
+
+        data = self.render_png(symbol, size)
+        return Image.open(io.BytesIO(data)) if data is not None else None
+
+    def export_library(self, symbols: List[Any], output_dir: str, size: SizeSpec = 'export',
+                       sprite_sheet: bool = False, columns: int = None,
+                       max_workers: int = None) -> Dict[str, Any]:
+        """批量导出符号库
+
+        ``sprite_sheet`` 为False时每个符号保存为 ``ids_<ID>.png``；
+        为True时拼成一张 ``ids_sprites.png``，并生成记录各符号位置的 ``ids_sprites.json``。
+        缓存未命中的符号在进程池中并行渲染。
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        width, height = resolve_size(size)
+
+        rendered = self._render_many(symbols, (width, height), max_workers)
+        failed = [symbol.id for symbol in symbols if symbol.id not in rendered]
+
+        if not sprite_sheet:
+            files = []
+            for symbol in symbols:
+                data = rendered.get(symbol.id)
+                if data is None:
+                    continue
+                path = output_dir / f"ids_{symbol.id}.png"
+                path.write_bytes(data)
+                files.append(str(path))
+            self.logger.info(f"导出IDS符号图片 {len(files)} 个: {output_dir}")
+            return {'files': files, 'failed': failed}
+
+        from PIL import Image
+
+        ordered = [symbol for symbol in symbols if symbol.id in rendered]
+        columns = columns or max(1, math.ceil(math.sqrt(len(ordered))))
+        rows = max(1, math.ceil(len(ordered) / columns))
+        sheet = Image.new('RGB', (columns * width, rows * height), 'white')
+        frames = {}
+        for index, symbol in enumerate(ordered):
+            x, y = (index % columns) * width, (index // columns) * height
+            with Image.open(io.BytesIO(rendered[symbol.id])) as image:
+                sheet.paste(image, (x, y))
+            frames[str(symbol.id)] = {'name': symbol.name, 'x': x, 'y': y, 'width': width, 'height': height}
+
+        sheet_path = output_dir / "ids_sprites.png"
+        index_path = output_dir / "ids_sprites.json"
+        sheet.save(sheet_path, optimize=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'image': sheet_path.name, 'frames': frames}, f, ensure_ascii=False, indent=2)
+        self.logger.info(f"导出IDS符号拼图 {len(frames)} 个: {sheet_path}")
+        return {'files': [str(sheet_path), str(index_path)], 'failed': failed}
+
+    def clear_cache(self):
+        """清空内存和磁盘缓存"""
+        with self._lock:
+            self._memory_cache.clear()
+        for path in self.cache_dir.glob("*.png"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _render_many(self, symbols: List[Any], size: Tuple[int, int],
+                     max_workers: int = None) -> Dict[Any, bytes]:
+        """渲染多个符号：先查缓存，未命中的在进程池中渲染"""
+        rendered = {}
+        jobs = {}
+        for symbol in symbols:
+            key = self.cache_key(symbol, size)
+            path = self._cache_path(key)
+            with self._lock:
+                data = self._memory_cache.get(key)
+            if data is None and path.exists():
+                data = path.read_bytes()
+            if data is not None:
+                rendered[symbol.id] = data
+            else:
+                jobs[symbol.id] = (key, self._job(symbol, size))
+
+        if not jobs:
+            return rendered
+
+        for symbol_id, data, error in self._run_jobs([job for _, job in jobs.values()], max_workers):
+            if data is None:
+                self.logger.error(f"渲染IDS符号失败 {symbol_id}: {error}")
+                continue
+            key = jobs[symbol_id][0]
+            self._write_cache_file(key, data)
+            self._remember(key, data)
+            rendered[symbol_id] = data
+        return rendered
+
+    def _run_jobs(self, jobs: List[Dict[str, Any]], max_workers: int = None) -> List[Tuple[Any, Optional[bytes], str]]:
+        """在进程池中执行渲染任务；进程池不可用时（如部分移动平台）在当前进程执行"""
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) > 1:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                    chunksize = max(1, len(jobs) // (workers * 4))
+                    return list(executor.map(_render_job, jobs, chunksize=chunksize))
+            except (OSError, NotImplementedError, ImportError) as e:
+                self.logger.warning(f"进程池不可用，改为单进程渲染: {e}")
+        return [_render_job(job) for job in jobs]
+
+    def _job(self, symbol, size: Tuple[int, int]) -> Dict[str, Any]:
+        """构造可在子进程中执行的渲染任务"""
+        return {
+            'id': symbol.id,
+            'symbols_data': symbol.symbols_data,
+            'canvas_size': symbol.canvas_size,
+            'size': size,
+            'supersample': self.supersample
+        }
+
+    def _cache_path(self, key) -> Path:
+        """缓存文件路径"""
+        symbol_id, updated_at, (width, height) = key
+        return self.cache_dir / f"{symbol_id}_{updated_at}_{width}x{height}.png"
+
+    def _write_cache_file(self, key, data: bytes):
+        """写入磁盘缓存，并删除该符号同尺寸的旧版本"""
+        symbol_id, _, (width, height) = key
+        path = self._cache_path(key)
+        for stale in self.cache_dir.glob(f"{symbol_id}_*_{width}x{height}.png"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        temp_path = path.with_suffix('.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def _remember(self, key, data: bytes):
+        """写入内存缓存（LRU）"""
+        with self._lock:
+            self._memory_cache[key] = data
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
+
+# 全局IDS渲染服务实例
+ids_render_service = service_registry.register('ids_render_service', IdsRenderService)
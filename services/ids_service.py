@@ -4,14 +4,21 @@ IDS Symbol Service
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import json
 import os
 from pathlib import Path
 
+from sqlalchemy import and_, func, intersect, or_, select, text
+
 from models.ids_symbol import IdsSymbol
+from models.ids_component import IdsComponent
+from models.stats import IDS_SYMBOL_TOTAL
+from utils.stroke_codec import pack_symbols
+from utils.ids_parser import IdsParseError, POSITION_SEPARATOR, iter_components, parse_ids, to_ids
 from services.database_service import db_service
+from services.registry import service_registry
 from app.config import config
 
 
@@ -29,13 +36,15 @@ class IdsService:
             symbol = IdsSymbol(
                 name=symbol_data['name'],
                 description=symbol_data.get('description', ''),
-                symbols_data=json.dumps(symbol_data['symbols']),
+                symbols_data=pack_symbols(symbol_data['symbols']),
                 canvas_size=json.dumps(symbol_data['canvas_size']),
+                ids_string=symbol_data.get('ids_string') or None,
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
             
             db_service.add_object(symbol)
+            self.index_pending()
             self.logger.info(f"保存IDS符号成功: {symbol.name}")
             return symbol
             
@@ -82,6 +91,7 @@ class IdsService:
         try:
             symbol.updated_at = datetime.now()
             db_service.update_object(symbol)
+            self.index_pending()
             self.logger.info(f"更新IDS符号成功: {symbol.name}")
             return True
             
@@ -103,37 +113,125 @@ class IdsService:
             self.logger.error(f"删除IDS符号失败: {e}")
             return False
     
-    def export_symbol_to_image(self, symbol: IdsSymbol, filepath: str) -> bool:
-        """导出符号为图片"""
+    def index_pending(self, chunk_size: int = 2000) -> int:
+        """为新增或IDS已修改的符号增量建立部件索引，返回处理的符号数"""
+        select_sql = text(
+            "SELECT id, ids_string FROM ids_symbols "
+            "WHERE ids_string IS NOT NULL AND ids_normalized IS NULL LIMIT :n"
+        )
+        total = invalid = 0
         try:
-            from PIL import Image, ImageDraw
-            
-            # 解析画布大小
-            canvas_size = json.loads(symbol.canvas_size)
-            symbols_data = json.loads(symbol.symbols_data)
-            
-            # 创建PIL图像
-            img = Image.new('RGB', canvas_size, 'white')
-            draw = ImageDraw.Draw(img)
-            
-            # 绘制符号
-            for symbol_data in symbols_data:
-                if symbol_data['type'] == 'rectangle':
-                    pos = symbol_data['pos']
-                    size = symbol_data['size']
-                    draw.rectangle([pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]], outline='black')
-                elif symbol_data['type'] == 'circle':
-                    pos = symbol_data['pos']
-                    size = symbol_data['size']
-                    draw.ellipse([pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]], outline='black')
-                elif symbol_data['type'] == 'line':
-                    points = symbol_data['points']
-                    if len(points) >= 4:
-                        for i in range(0, len(points) - 2, 2):
-                            draw.line([points[i], points[i+1], points[i+2], points[i+3]], fill='black', width=2)
+            while True:
+                with db_service.engine.begin() as connection:
+                    rows = connection.execute(select_sql, {'n': chunk_size}).fetchall()
+                    if not rows:
+                        break
+                    
+                    components, normalized = [], []
+                    for symbol_id, ids_string in rows:
+                        try:
+                            tree = parse_ids(ids_string)
+                        except IdsParseError as e:
+                            # 无法解析的IDS标记为空字符串，不再重复处理
+                            self.logger.warning(f"IDS格式错误 {symbol_id}: {e}")
+                            normalized.append(('', symbol_id))
+                            invalid += 1
+                            continue
+                        normalized.append((to_ids(tree), symbol_id))
+                        components.extend(
+                            (component, position, symbol_id, operator)
+                            for component, position, operator in set(iter_components(tree))
+                        )
+                    
+                    # 大批量写入直接使用驱动的 executemany，省去逐行构造参数的开销
+                    connection.execute(
+                        IdsComponent.__table__.delete().where(
+                            IdsComponent.symbol_id.in_([row[0] for row in rows])
+                        )
+                    )
+                    if components:
+                        connection.exec_driver_sql(
+                            "INSERT INTO ids_components (component, position, symbol_id, operator) "
+                            "VALUES (?, ?, ?, ?)", components
+                        )
+                    connection.exec_driver_sql(
+                        "UPDATE ids_symbols SET ids_normalized = ? WHERE id = ?", normalized
+                    )
+                total += len(rows)
+            
+            if total:
+                self.logger.info(f"IDS部件索引已更新: {total} 个符号（{invalid} 个格式错误）")
+            return total
+            
+        except Exception as e:
+            self.logger.error(f"更新IDS部件索引失败: {e}")
+            return total
+    
+    def find_by_components(self, criteria: List[Any], limit: Optional[int] = None) -> List[IdsSymbol]:
+        """按部件检索符号，多个条件取交集
+
+        每个条件为部件字符串，或 (部件, 位置) 元组；位置按路径前缀匹配，
+        如 ``('氵', 'left')`` 匹配左侧（含左侧内部任意位置）包含 ``氵`` 的符号。
+        """
+        if not criteria:
+            return []
+        try:
+            self.index_pending()
+            
+            selects = []
+            for criterion in criteria:
+                component, position = (criterion, None) if isinstance(criterion, str) else criterion
+                condition = IdsComponent.component == component
+                if position:
+                    nested = position + POSITION_SEPARATOR
+                    condition = and_(condition, or_(
+                        IdsComponent.position == position,
+                        and_(IdsComponent.position >= nested, IdsComponent.position < nested + '\U0010ffff')
+                    ))
+                selects.append(select(IdsComponent.symbol_id).where(condition))
+            
+            matched = selects[0] if len(selects) == 1 else intersect(*selects)
+            with db_service.get_session() as session:
+                query = session.query(IdsSymbol).filter(
+                    IdsSymbol.id.in_(select(matched.subquery().c.symbol_id))
+                ).order_by(IdsSymbol.name, IdsSymbol.id)
+                if limit:
+                    query = query.limit(limit)
+                symbols = query.all()
+                session.expunge_all()
+                return symbols
+            
+        except Exception as e:
+            self.logger.error(f"按部件检索IDS符号失败: {e}")
+            return []
+    
+    def get_symbol_components(self, symbol_id: int) -> List[Dict[str, str]]:
+        """获取符号的部件索引"""
+        try:
+            self.index_pending()
+            rows = db_service.get_objects_by_filter(
+                IdsComponent, {'symbol_id': symbol_id}, order_by=IdsComponent.position
+            )
+            return [
+                {'component': row.component, 'position': row.position, 'operator': row.operator}
+                for row in rows
+            ]
+        except Exception as e:
+            self.logger.error(f"获取IDS部件失败: {e}")
+            return []
+    
+    def export_symbol_to_image(self, symbol: IdsSymbol, filepath: str, size='export') -> bool:
+        """导出符号为图片（size为预设名称、边长或 (宽, 高)）"""
+        try:
+            from services.ids_render_service import ids_render_service
+            
+            data = ids_render_service.render_png(symbol, size)
+            if data is None:
+                return False
             
             # 保存图片
-            img.save(filepath)
+            with open(filepath, 'wb') as f:
+                f.write(data)
             self.logger.info(f"导出IDS符号图片成功: {filepath}")
             return True
             
@@ -188,12 +286,14 @@ class IdsService:
     def get_symbol_stats(self) -> Dict[str, Any]:
         """获取符号统计信息"""
         try:
-            symbols = self.get_all_symbols()
+            with db_service.get_session() as session:
+                recent_count = session.query(func.count(IdsSymbol.id)).filter(
+                    IdsSymbol.created_at >= datetime.now() - timedelta(days=7)
+                ).scalar()
             
             stats = {
-                'total_count': len(symbols),
-                'recent_count': len([s for s in symbols if 
-                                   (datetime.now() - s.created_at).days <= 7])
+                'total_count': db_service.get_stat(IDS_SYMBOL_TOTAL),
+                'recent_count': recent_count
             }
             
             return stats
@@ -204,5 +304,5 @@ class IdsService:
 
 
 # 全局IDS服务实例
-ids_service = IdsService()
+ids_service = service_registry.register('ids_service', IdsService)
 
@@ -10,18 +10,23 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
 
-from openpyxl import load_workbook
 from services.dictionary_service import dictionary_service
+from services.registry import service_registry
 
 
 class ImportService:
     """导入服务类"""
     
+    # 每次写入数据库的词条数（一次查重、一次提交）
+    BATCH_SIZE = 500
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
     def import_from_excel(self, filepath: str, progress_callback=None) -> Dict[str, Any]:
         """从Excel文件导入词条"""
+        from openpyxl import load_workbook
+        
         try:
             results = {
                 'success': 0,
@@ -42,8 +47,9 @@ class ImportService:
             total_rows = ws.max_row - 1  # 减去标题行
             results['total'] = total_rows
             
-            # 读取数据行
+            # 读取数据行（解析后按批写入）
             current_row = 0
+            batch = []
             for row in ws.iter_rows(min_row=2, values_only=True):
                 current_row += 1
                 
@@ -55,15 +61,13 @@ class ImportService:
                 try:
                     word_data = self._parse_excel_row(headers, row)
                     if word_data:
-                        success = dictionary_service.add_word_entry(word_data)
-                        if success:
-                            results['success'] += 1
-                        else:
-                            results['failed'] += 1
-                            results['errors'].append(f"添加词条失败: {word_data.get('word_id', 'Unknown')}")
+                        batch.append(word_data)
+                        if len(batch) >= self.BATCH_SIZE:
+                            self._add_batch(batch, results)
                 except Exception as e:
                     results['failed'] += 1
                     results['errors'].append(f"解析行数据失败: {str(e)}")
+            self._add_batch(batch, results)
             
             self.logger.info(f"Excel导入完成: 成功{results['success']}条, 失败{results['failed']}条")
             return results
@@ -88,6 +92,7 @@ class ImportService:
                 total_rows = len(rows)
                 results['total'] = total_rows
                 
+                batch = []
                 for index, row in enumerate(rows):
                     current_row = index + 1
                     
@@ -99,15 +104,13 @@ class ImportService:
                     try:
                         word_data = self._parse_csv_row(row)
                         if word_data:
-                            success = dictionary_service.add_word_entry(word_data)
-                            if success:
-                                results['success'] += 1
-                            else:
-                                results['failed'] += 1
-                                results['errors'].append(f"添加词条失败: {word_data.get('word_id', 'Unknown')}")
+                            batch.append(word_data)
+                            if len(batch) >= self.BATCH_SIZE:
+                                self._add_batch(batch, results)
                     except Exception as e:
                         results['failed'] += 1
                         results['errors'].append(f"解析行数据失败: {str(e)}")
+                self._add_batch(batch, results)
             
             self.logger.info(f"CSV导入完成: 成功{results['success']}条, 失败{results['failed']}条")
             return results
@@ -134,18 +137,17 @@ class ImportService:
             elif not isinstance(data, list):
                 raise ValueError("JSON文件格式不正确")
             
+            batch = []
             for word_data in data:
                 try:
                     if self._validate_word_data(word_data):
-                        success = dictionary_service.add_word_entry(word_data)
-                        if success:
-                            results['success'] += 1
-                        else:
-                            results['failed'] += 1
-                            results['errors'].append(f"添加词条失败: {word_data.get('word_id', 'Unknown')}")
+                        batch.append(word_data)
+                        if len(batch) >= self.BATCH_SIZE:
+                            self._add_batch(batch, results)
                 except Exception as e:
                     results['failed'] += 1
                     results['errors'].append(f"处理词条失败: {str(e)}")
+            self._add_batch(batch, results)
             
             self.logger.info(f"JSON导入完成: 成功{results['success']}条, 失败{results['failed']}条")
             return results
@@ -154,6 +156,16 @@ class ImportService:
             self.logger.error(f"JSON导入失败: {e}")
             raise
     
+    def _add_batch(self, batch: List[Dict[str, Any]], results: Dict[str, Any]):
+        """写入一批已解析的词条并累计结果，然后清空批次"""
+        for word_data, added in zip(batch, dictionary_service.add_word_entries(batch)):
+            if added:
+                results['success'] += 1
+            else:
+                results['failed'] += 1
+                results['errors'].append(f"添加词条失败: {word_data.get('word_id', 'Unknown')}")
+        batch.clear()
+    
     def _parse_excel_row(self, headers: List[str], row: tuple) -> Optional[Dict[str, Any]]:
         """解析Excel行数据"""
         try:
@@ -282,4 +294,4 @@ class ImportService:
 
 
 # 全局导入服务实例
-import_service = ImportService()
+import_service = service_registry.register('import_service', ImportService)
@@ -0,0 +1,286 @@
+"""
+性能统计服务
+Instrumentation Service
+
+为搜索、词条、导入、导出和数据库服务的公开方法计时，并通过SQLAlchemy的
+``before_cursor_execute`` / ``after_cursor_execute`` 事件统计每次操作执行的SQL语句数、
+影响行数和SQL耗时。
+
+关闭时不修改任何类、不注册事件监听，对正常运行没有额外开销；
+开启时才替换方法并注册监听，关闭后恢复原方法。
+"""
+
+import functools
+import importlib
+import inspect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+import logging
+
+from app.config import config
+from services.registry import service_registry
+from utils.metrics import RollingHistogram
+
+
+# (模块, 类名, 不统计的方法)
+INSTRUMENTED_CLASSES = (
+    ('services.search_service', 'SearchService', ()),
+    ('services.dictionary_service', 'DictionaryService', ()),
+    ('services.import_service', 'ImportService', ()),
+    ('services.export_service', 'ExportService', ()),
+    # 会话和查询条件构造是其他操作的组成部分，单独计时没有意义
+    ('services.database_service', 'DatabaseService',
+     ('get_session', 'compile_filters', 'text_search_condition', 'has_fts')),
+)
+
+
+class OperationStats:
+    """单个操作的累计统计"""
+
+    def __init__(self, histogram_size: int):
+        self.durations = RollingHistogram(histogram_size)
+        self.errors = 0
+        self.statements = 0
+        self.rows = 0
+        self.sql_ms = 0.0
+        self.max_statements = 0
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms: float, statements: int, rows: int, sql_ms: float, error: bool):
+        self.durations.add(duration_ms)
+        with self._lock:
+            self.statements += statements
+            self.rows += rows
+            self.sql_ms += sql_ms
+            self.max_statements = max(self.max_statements, statements)
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self.durations.snapshot()
+        calls = stats['count'] or 1
+        stats.update({
+            'total_ms': self.durations.total,
+            'errors': self.errors,
+            'statements': self.statements,
+            'statements_per_call': self.statements / calls,
+            'max_statements': self.max_statements,
+            'rows': self.rows,
+            'sql_ms': self.sql_ms,
+        })
+        return stats
+
+
+class _Frame:
+    """正在执行的操作（用于归属SQL语句）"""
+
+    __slots__ = ('statements', 'rows', 'sql_ms')
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.sql_ms = 0.0
+
+
+class InstrumentationService:
+    """性能统计服务类
+
+    每个线程维护一个正在执行的操作栈，SQL语句计入栈中所有操作
+    （如导入过程中添加词条的语句同时计入两者）。
+    """
+
+    def __init__(self, histogram_size: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.histogram_size = histogram_size or config.get_int('DEBUG', 'histogram_size', 1024)
+        self._stats: Dict[str, OperationStats] = {}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._patched = []
+        self._enabled = False
+        self._toggle_lock = threading.Lock()
+        self.started_at = None
+
+    @property
+    def enabled(self) -> bool:
+        """是否正在统计"""
+        return self._enabled
+
+    def enable(self) -> bool:
+        """开始统计：替换服务方法并注册SQL事件监听"""
+        with self._toggle_lock:
+            if self._enabled:
+                return True
+            try:
+                from sqlalchemy import event
+                from sqlalchemy.engine import Engine
+
+                for module_name, class_name, excluded in INSTRUMENTED_CLASSES:
+                    cls = getattr(importlib.import_module(module_name), class_name)
+                    self._patch_class(cls, set(excluded))
+                event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+                self._enabled = True
+                self.started_at = datetime.now()
+                self.logger.info(f"性能统计已开启，统计 {len(self._patched)} 个方法")
+                return True
+            except Exception as e:
+                self._restore_methods()
+                self.logger.error(f"开启性能统计失败: {e}")
+                return False
+
+    def disable(self):
+        """停止统计并恢复原方法（已收集的数据保留）"""
+        with self._toggle_lock:
+            if not self._enabled:
+                return
+            from sqlalchemy import event
+            from sqlalchemy.engine import Engine
+
+            event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._restore_methods()
+            self._enabled = False
+            self.logger.info("性能统计已关闭")
+
+    def reset(self):
+        """清空已收集的数据"""
+        with self._stats_lock:
+            self._stats = {}
+        self.started_at = datetime.now() if self._enabled else None
+
+    @contextmanager
+    def operation(self, name: str):
+        """统计一段代码（未开启时直接执行）"""
+        if not self._enabled:
+            yield
+            return
+        frame = self._push()
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self._pop(name, frame, started, error)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各操作的统计摘要（按累计耗时降序）"""
+        with self._stats_lock:
+            items = list(self._stats.items())
+        snapshots = {name: stats.snapshot() for name, stats in items}
+        return dict(sorted(snapshots.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """可序列化的完整数据"""
+        return {
+            'enabled': self._enabled,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'dumped_at': datetime.now().isoformat(),
+            'histogram_size': self.histogram_size,
+            'operations': self.get_stats(),
+        }
+
+    def dump_json(self, filepath: str = None) -> Optional[str]:
+        """导出为JSON文件（默认写入导出目录）"""
+        try:
+            path = Path(filepath) if filepath else (
+                Path(config.exports_dir) / f"instrumentation_{datetime.now():%Y%m%d_%H%M%S}.json"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            self.logger.info(f"性能统计已导出: {path}")
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"导出性能统计失败: {e}")
+            return None
+
+    def format_report(self, limit: int = 15) -> str:
+        """文本报告（调试面板使用）"""
+        stats = self.get_stats()
+        if not stats:
+            return "暂无数据" if self._enabled else "性能统计未开启"
+        lines = []
+        for name, item in list(stats.items())[:limit]:
+            lines.append(
+                f"{name}\n  {item['count']}次 p50 {item['p50']:.1f}ms p95 {item['p95']:.1f}ms "
+                f"p99 {item['p99']:.1f}ms SQL {item['statements_per_call']:.1f}条/次"
+            )
+        return '\n'.join(lines)
+
+    def _patch_class(self, cls, excluded: set):
+        """替换类中公开的普通方法"""
+        for name, func in list(vars(cls).items()):
+            if (name.startswith('_') or name in excluded or not inspect.isfunction(func)
+                    or inspect.isgeneratorfunction(func)):
+                continue
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", func))
+            self._patched.append((cls, name, func))
+
+    def _restore_methods(self):
+        for cls, name, func in reversed(self._patched):
+            setattr(cls, name, func)
+        self._patched = []
+
+    def _wrap(self, operation: str, func):
+        service = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frame = service._push()
+            started = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                service._pop(operation, frame, started, error)
+
+        return wrapper
+
+    def _push(self) -> _Frame:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = _Frame()
+        stack.append(frame)
+        return frame
+
+    def _pop(self, operation: str, frame: _Frame, started: float, error: bool):
+        duration_ms = (time.perf_counter() - started) * 1000
+        self._local.stack.pop()
+        stats = self._stats.get(operation)
+        if stats is None:
+            with self._stats_lock:
+                stats = self._stats.setdefault(operation, OperationStats(self.histogram_size))
+        stats.record(duration_ms, frame.statements, frame.rows, frame.sql_ms, error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and getattr(self._local, 'stack', None):
+            context._instrumentation_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return
+        started = getattr(context, '_instrumentation_started', None)
+        sql_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        # SQLite只对写操作提供影响行数，查询的rowcount为-1
+        rows = max(cursor.rowcount, 0)
+        for frame in stack:
+            frame.statements += 1
+            frame.rows += rows
+            frame.sql_ms += sql_ms
+
+
+# 全局性能统计服务实例
+instrumentation_service = service_registry.register('instrumentation_service', InstrumentationService)
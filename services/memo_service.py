@@ -4,13 +4,20 @@ Memo Service
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
+from sqlalchemy import func
+
 from models.memo_word import MemoWord
+from models.stats import MEMO_TOTAL, MEMO_PENDING, MEMO_COMPLETED, MEMO_PRIORITY_PREFIX
 from services.database_service import db_service
 
 
+# 备忘全文索引
+MEMO_FTS = 'memo_words_fts'
+
+
 class MemoService:
     """备忘服务类"""
     
@@ -38,8 +45,32 @@ class MemoService:
     
     def get_all_memo_words(self) -> List[MemoWord]:
         """获取所有备忘词条"""
+        return self.query_memo_words()
+    
+    def query_memo_words(self, is_completed: Optional[bool] = None, query: str = '',
+                         limit: int = None, offset: int = 0) -> List[MemoWord]:
+        """按状态和内容筛选备忘
+        
+        筛选、排序和分页都在数据库中完成：待处理在前，同状态按优先级、创建时间倒序。
+        """
         try:
-            return db_service.get_all_objects(MemoWord)
+            with db_service.get_session() as session:
+                memo_query = session.query(MemoWord)
+                if is_completed is not None:
+                    memo_query = memo_query.filter(MemoWord.is_completed == is_completed)
+                if query:
+                    memo_query = memo_query.filter(db_service.text_search_condition(MemoWord, MEMO_FTS, query))
+                
+                memo_query = memo_query.order_by(
+                    MemoWord.is_completed.asc(),
+                    MemoWord.priority.desc(),
+                    MemoWord.created_at.desc()
+                )
+                if offset:
+                    memo_query = memo_query.offset(offset)
+                if limit:
+                    memo_query = memo_query.limit(limit)
+                return memo_query.all()
         except Exception as e:
             self.logger.error(f"获取备忘列表失败: {e}")
             return []
@@ -54,36 +85,17 @@ class MemoService:
     
     def get_pending_memo_words(self) -> List[MemoWord]:
         """获取待处理的备忘词条"""
-        try:
-            return db_service.get_objects_by_filter(MemoWord, {'is_completed': False})
-        except Exception as e:
-            self.logger.error(f"获取待处理备忘失败: {e}")
-            return []
+        return self.query_memo_words(is_completed=False)
     
     def get_completed_memo_words(self) -> List[MemoWord]:
         """获取已完成的备忘词条"""
-        try:
-            return db_service.get_objects_by_filter(MemoWord, {'is_completed': True})
-        except Exception as e:
-            self.logger.error(f"获取已完成备忘失败: {e}")
-            return []
+        return self.query_memo_words(is_completed=True)
     
     def search_memo_words(self, query: str) -> List[MemoWord]:
         """搜索备忘词条"""
-        try:
-            all_memos = self.get_all_memo_words()
-            query_lower = query.lower()
-            
-            results = []
-            for memo in all_memos:
-                if query_lower in memo.content.lower():
-                    results.append(memo)
-            
-            return results
-            
-        except Exception as e:
-            self.logger.error(f"搜索备忘失败: {e}")
+        if not query:
             return []
+        return self.query_memo_words(query=query)
     
     def update_memo_word(self, memo_word: MemoWord) -> bool:
         """更新备忘词条"""
@@ -131,25 +143,19 @@ class MemoService:
     def get_memo_stats(self) -> Dict[str, Any]:
         """获取备忘统计信息"""
         try:
-            all_memos = self.get_all_memo_words()
-            pending_memos = self.get_pending_memo_words()
-            completed_memos = self.get_completed_memo_words()
+            # 一次读取全部备忘统计（总数、状态、各优先级）
+            priority_keys = {f'priority_{priority}': f'{MEMO_PRIORITY_PREFIX}{priority}'
+                             for priority in range(1, 6)}
+            counts = db_service.get_stats(MEMO_TOTAL, MEMO_PENDING, MEMO_COMPLETED, *priority_keys.values())
             
             # 按优先级统计
-            priority_stats = {}
-            for priority in range(1, 6):
-                count = len([m for m in all_memos if m.priority == priority])
-                priority_stats[f'priority_{priority}'] = count
-            
-            # 最近添加的备忘
-            recent_memos = [m for m in all_memos if 
-                          (datetime.now() - m.created_at).days <= 7]
+            priority_stats = {name: counts[key] for name, key in priority_keys.items()}
             
             stats = {
-                'total_count': len(all_memos),
-                'pending_count': len(pending_memos),
-                'completed_count': len(completed_memos),
-                'recent_count': len(recent_memos),
+                'total_count': counts[MEMO_TOTAL],
+                'pending_count': counts[MEMO_PENDING],
+                'completed_count': counts[MEMO_COMPLETED],
+                'recent_count': self._count_recent(),
                 'priority_stats': priority_stats
             }
             
@@ -159,20 +165,22 @@ class MemoService:
             self.logger.error(f"获取备忘统计失败: {e}")
             return {}
     
+    def _count_recent(self, days: int = 7) -> int:
+        """统计最近添加的备忘数量"""
+        with db_service.get_session() as session:
+            return session.query(func.count(MemoWord.id)).filter(
+                MemoWord.created_at >= datetime.now() - timedelta(days=days)
+            ).scalar()
+    
     def cleanup_old_memos(self, days: int = 30) -> int:
         """清理旧的已完成备忘"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
-            old_memos = db_service.get_objects_by_filter(
-                MemoWord, 
+            count = db_service.delete_where(
+                MemoWord,
                 {'is_completed': True, 'completed_at__lt': cutoff_date}
             )
             
-            count = 0
-            for memo in old_memos:
-                if self.delete_memo_word(memo.id):
-                    count += 1
-            
             self.logger.info(f"清理了 {count} 个旧备忘")
             return count
             
@@ -0,0 +1,193 @@
+"""
+采样分析服务
+Sampling Profiler Service
+
+后台线程按固定频率读取 ``sys._current_frames()``，记录主线程和工作线程（搜索、导入等）
+当前的调用栈，汇总为折叠栈格式（每行 ``线程;外层函数;...;内层函数 次数``），
+可直接用 flamegraph.pl、speedscope 等工具生成火焰图。
+
+只在开启期间运行，不修改任何代码，适合在移动设备上定位界面卡顿。
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from app.config import config
+from services.registry import service_registry
+
+
+DEFAULT_RATE_HZ = 100
+
+# 调用栈最多记录的层数（超出部分从外层截断）
+MAX_STACK_DEPTH = 128
+
+# 线程阻塞等待时的最内层函数（文件名, 函数名），默认不记录
+IDLE_FUNCTIONS = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('thread.py', '_worker'),
+}
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _frame_label(code, cache: Dict) -> str:
+    """栈帧的显示名称：``函数 (文件:行)``，项目内文件使用相对路径"""
+    label = cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        if not filename.startswith('<'):
+            try:
+                filename = Path(filename).resolve().relative_to(PROJECT_ROOT).as_posix()
+            except ValueError:
+                filename = Path(filename).name
+        name = getattr(code, 'co_qualname', code.co_name)
+        # 折叠栈格式以分号分隔栈帧
+        label = cache[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(';', ',')
+    return label
+
+
+class ProfilerService:
+    """采样分析服务类
+
+    采样线程只在开启期间存在；结果在停止时写入导出目录。
+    """
+
+    def __init__(self, rate_hz: float = None, include_idle: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self.rate_hz = rate_hz or config.get_float('DEBUG', 'profiler_rate', DEFAULT_RATE_HZ)
+        self.include_idle = include_idle
+        self._stacks = Counter()
+        self._lock = threading.Lock()
+        self._labels = {}
+        self._thread_names = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+
+    @property
+    def running(self) -> bool:
+        """是否正在采样"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, rate_hz: float = None) -> bool:
+        """开始采样（清空上一次的结果）"""
+        if self.running:
+            return True
+        if rate_hz:
+            self.rate_hz = rate_hz
+        with self._lock:
+            self._stacks = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self.started_at = datetime.now()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+        self.logger.info(f"采样分析已开始: {self.rate_hz:g}Hz")
+        return True
+
+    def stop(self, write: bool = True) -> Optional[str]:
+        """停止采样，默认写出折叠栈文件并返回路径"""
+        if not self.running:
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.logger.info(f"采样分析已停止: {self.samples}次采样, {self.duration:.1f}秒")
+        return self.write_collapsed() if write else None
+
+    def get_stacks(self) -> Dict[Tuple[str, ...], int]:
+        """汇总的调用栈（由外向内，第一项为线程名）及采样次数"""
+        with self._lock:
+            return dict(self._stacks)
+
+    def collapsed_lines(self) -> List[str]:
+        """折叠栈格式的各行（按次数降序）"""
+        stacks = sorted(self.get_stacks().items(), key=lambda item: item[1], reverse=True)
+        return [f"{';'.join(stack)} {count}" for stack, count in stacks]
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """自身耗时（作为最内层栈帧的采样次数）最多的函数"""
+        leaves = Counter()
+        for stack, count in self.get_stacks().items():
+            leaves[stack[-1]] += count
+        return leaves.most_common(limit)
+
+    def write_collapsed(self, filepath: str = None) -> Optional[str]:
+        """写出折叠栈文件（默认写入导出目录）"""
+        try:
+            path = Path(filepath) if filepath else (
+                Path(config.exports_dir) / f"profile_{self.started_at or datetime.now():%Y%m%d_%H%M%S}.folded"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                for line in self.collapsed_lines():
+                    f.write(line + '\n')
+            self.logger.info(f"采样结果已导出: {path}")
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"导出采样结果失败: {e}")
+            return None
+
+    def _run(self):
+        interval = 1.0 / max(self.rate_hz, 1.0)
+        own_ident = threading.get_ident()
+        started = time.perf_counter()
+        next_sample = started
+        while not self._stop_event.is_set():
+            try:
+                self._sample(own_ident)
+            except Exception as e:
+                self.logger.debug(f"采样失败: {e}")
+            # 按固定节拍采样，处理耗时不累积到间隔中
+            next_sample += interval
+            delay = next_sample - time.perf_counter()
+            if delay < 0:
+                next_sample = time.perf_counter()
+                delay = 0
+            self._stop_event.wait(delay)
+        self.duration = time.perf_counter() - started
+
+    def _sample(self, own_ident: int):
+        frames = sys._current_frames()
+        if any(ident not in self._thread_names for ident in frames):
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        collected = []
+        for ident, frame in frames.items():
+            if ident == own_ident:
+                continue
+            if not self.include_idle and self._is_idle(frame):
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(_frame_label(frame.f_code, self._labels))
+                frame = frame.f_back
+            stack.append(self._thread_names.get(ident, f"thread-{ident}"))
+            collected.append(tuple(reversed(stack)))
+        del frames
+
+        with self._lock:
+            self._stacks.update(collected)
+            self.samples += 1
+
+    @staticmethod
+    def _is_idle(frame) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_FUNCTIONS
+
+
+# 全局采样分析服务实例
+profiler_service = service_registry.register('profiler_service', ProfilerService)
@@ -0,0 +1,88 @@
+"""
+服务注册表
+Service Registry
+
+全局服务实例在首次使用时才构造，避免启动时加载用不到的服务及其依赖
+"""
+
+import threading
+from typing import Any, Callable, Dict, List
+import logging
+import time
+
+
+class LazyService:
+    """延迟构造的服务代理
+
+    模块级的 ``xxx_service`` 保持原有用法，首次访问属性时才调用工厂创建实例，
+    之后所有属性读写都转发给该实例。
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    @property
+    def is_loaded(self) -> bool:
+        """是否已构造实例"""
+        return self._instance is not None
+
+    def get_instance(self) -> Any:
+        """获取（必要时构造）服务实例"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    start = time.perf_counter()
+                    instance = self._factory()
+                    object.__setattr__(self, '_instance', instance)
+                    logging.getLogger(__name__).debug(
+                        f"服务已加载: {self._name} ({(time.perf_counter() - start) * 1000:.1f}ms)"
+                    )
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get_instance(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.get_instance(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self.get_instance(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'pending'
+        return f"<LazyService(name='{self._name}', {state})>"
+
+
+class ServiceRegistry:
+    """服务注册表类"""
+
+    def __init__(self):
+        self._services: Dict[str, LazyService] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> LazyService:
+        """注册服务工厂，返回延迟代理"""
+        service = LazyService(name, factory)
+        self._services[name] = service
+        return service
+
+    def get(self, name: str) -> Any:
+        """获取服务实例"""
+        return self._services[name].get_instance()
+
+    def is_loaded(self, name: str) -> bool:
+        """服务是否已构造"""
+        service = self._services.get(name)
+        return service is not None and service.is_loaded
+
+    def loaded_services(self) -> List[str]:
+        """已构造的服务名称列表"""
+        return [name for name, service in self._services.items() if service.is_loaded]
+
+
+# 全局服务注册表
+service_registry = ServiceRegistry()
@@ -0,0 +1,171 @@
+"""
+异步搜索执行器
+Asynchronous Search Executor
+
+在后台线程执行搜索，避免阻塞Kivy主线程
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from kivy.clock import Clock
+
+from app.config import config
+
+
+class SearchExecutor:
+    """搜索执行器类
+
+    - 按键防抖：在 ``delay`` 秒内连续提交只执行最后一次
+    - 代次令牌：每次提交生成新的代次，过期代次的结果会被丢弃
+    - 结果通过 ``Clock.schedule_once`` 回到主线程
+    """
+
+    def __init__(self, delay: float = None, max_workers: int = 1):
+        self.logger = logging.getLogger(__name__)
+        if delay is None:
+            delay = config.get_int('SEARCH', 'debounce_ms', 250) / 1000.0
+        self.delay = delay
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._pending_event = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search')
+
+    @property
+    def generation(self) -> int:
+        """当前代次"""
+        return self._generation
+
+    def is_current(self, token: int) -> bool:
+        """判断令牌是否仍为最新代次"""
+        return token == self._generation
+
+    def submit(self, func: Callable, args: Tuple = (), kwargs: Dict[str, Any] = None,
+               callback: Callable = None, error_callback: Callable = None,
+               delay: float = None, cancellable: bool = False) -> int:
+        """提交搜索任务
+
+        ``cancellable`` 为True时向 ``func`` 注入 ``is_cancelled`` 参数，
+        以便长时间运行的搜索在被新查询取代后尽早退出。
+        返回本次提交的代次令牌。
+        """
+        token, kwargs = self._next_token(kwargs, cancellable)
+        self._schedule(token, delay, self._run,
+                       token, func, args, kwargs, callback, error_callback)
+        return token
+
+    def submit_stream(self, func: Callable, args: Tuple = (), kwargs: Dict[str, Any] = None,
+                      batch_callback: Callable = None, complete_callback: Callable = None,
+                      error_callback: Callable = None, delay: float = None,
+                      cancellable: bool = False) -> int:
+        """提交流式搜索任务
+
+        ``func`` 返回一个按批次产出结果列表的生成器，每个批次都会单独
+        投递给 ``batch_callback``；全部完成后以结果总数调用 ``complete_callback``。
+        """
+        token, kwargs = self._next_token(kwargs, cancellable)
+        self._schedule(token, delay, self._run_stream,
+                       token, func, args, kwargs, batch_callback, complete_callback, error_callback)
+        return token
+
+    def cancel(self):
+        """取消所有未完成的搜索"""
+        with self._lock:
+            self._generation += 1
+            self._cancel_pending()
+
+    def shutdown(self, wait: bool = False):
+        """关闭执行器"""
+        self.cancel()
+        self._pool.shutdown(wait=wait)
+
+    def _next_token(self, kwargs: Optional[Dict[str, Any]], cancellable: bool):
+        """生成新的代次令牌并取消等待中的任务"""
+        kwargs = dict(kwargs or {})
+        with self._lock:
+            self._generation += 1
+            token = self._generation
+            self._cancel_pending()
+
+        if cancellable:
+            kwargs['is_cancelled'] = lambda: not self.is_current(token)
+        return token, kwargs
+
+    def _schedule(self, token: int, delay: Optional[float], runner: Callable, *task):
+        """按防抖延迟调度任务"""
+        delay = self.delay if delay is None else delay
+        if delay > 0:
+            self._pending_event = Clock.schedule_once(lambda dt: self._start(token, runner, task), delay)
+        else:
+            self._start(token, runner, task)
+
+    def _cancel_pending(self):
+        """取消尚未开始的防抖任务"""
+        if self._pending_event is not None:
+            self._pending_event.cancel()
+            self._pending_event = None
+
+    def _start(self, token: int, runner: Callable, task: Tuple):
+        """防抖结束，提交到后台线程"""
+        if not self.is_current(token):
+            return
+        self._pending_event = None
+        self._pool.submit(runner, *task)
+
+    def _run(self, token, func, args, kwargs, callback, error_callback):
+        """在后台线程中执行搜索"""
+        if not self.is_current(token):
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"后台搜索失败: {e}")
+            if error_callback:
+                self._deliver(token, error_callback, e)
+            return
+        if callback:
+            self._deliver(token, callback, result)
+
+    def _run_stream(self, token, func, args, kwargs, batch_callback, complete_callback,
+                    error_callback):
+        """在后台线程中逐批执行流式搜索"""
+        if not self.is_current(token):
+            return
+        total = 0
+        generator = None
+        try:
+            generator = func(*args, **kwargs)
+            for batch in generator:
+                # 被新查询取代时提前终止生成器
+                if not self.is_current(token):
+                    return
+                if not batch:
+                    continue
+                total += len(batch)
+                if batch_callback:
+                    self._deliver(token, batch_callback, batch)
+        except Exception as e:
+            self.logger.error(f"后台流式搜索失败: {e}")
+            if error_callback:
+                self._deliver(token, error_callback, e)
+            return
+        finally:
+            if generator is not None:
+                generator.close()
+        if complete_callback:
+            self._deliver(token, complete_callback, total)
+
+    def _deliver(self, token: int, callback: Callable, value: Any):
+        """将结果投递回主线程，过期结果直接丢弃"""
+        def deliver(dt):
+            if self.is_current(token):
+                callback(value)
+            else:
+                self.logger.debug(f"丢弃过期搜索结果: {token}")
+        Clock.schedule_once(deliver, 0)
+
+
+# 全局搜索执行器实例
+search_executor = SearchExecutor()
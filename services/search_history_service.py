@@ -0,0 +1,249 @@
+"""
+搜索历史服务
+Search History Service
+"""
+
+import json
+import re
+import threading
+from datetime import datetime
+from typing import List, Dict, Any
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+
+from models.search_history import SearchHistory
+from services.database_service import db_service
+from app.config import config
+
+
+class SearchHistoryService:
+    """搜索历史服务类
+
+    写入先在内存中按规范化查询合并，由后台线程批量落库；
+    读取走 ``last_used_at`` / ``hit_count`` 索引并限制条数，再合并内存中尚未落库的条目，
+    不在界面线程上写库。每次落库后按最近使用时间裁剪，表大小不超过 ``history_limit``。
+    """
+
+    # 排序时从每个索引各取的候选条数
+    RANK_CANDIDATES = 100
+
+    def __init__(self, flush_interval: float = 2.0, batch_size: int = 20, database=None):
+        self.logger = logging.getLogger(__name__)
+        self._database = database
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_entries = config.get_int('SEARCH', 'history_limit', 500)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._writer = None
+
+    @property
+    def db(self):
+        """使用的数据库服务（默认为全局数据库服务）"""
+        return self._database or db_service
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """规范化查询文本"""
+        return re.sub(r'\s+', ' ', query or '').strip().casefold()
+
+    def is_enabled(self) -> bool:
+        """是否启用搜索历史"""
+        return config.get_boolean('SEARCH', 'save_history', True)
+
+    def record(self, query: str, params: Dict[str, Any] = None, result_count: int = 0):
+        """记录一次搜索（异步批量写入）"""
+        normalized = self.normalize_query(query)
+        if not normalized or not self.is_enabled():
+            return
+
+        with self._lock:
+            entry = self._pending.get(normalized)
+            if entry:
+                entry['hits'] += 1
+            else:
+                entry = {'hits': 1}
+                self._pending[normalized] = entry
+            entry.update({
+                'query': query.strip(),
+                'params': json.dumps(params, ensure_ascii=False, default=str) if params else None,
+                'result_count': result_count,
+                'last_used_at': datetime.now()
+            })
+            pending_count = len(self._pending)
+
+        self._ensure_writer()
+        if pending_count >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """将待写入的历史批量落库，返回写入条数"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            with self.db.get_session() as session:
+                for normalized, entry in pending.items():
+                    stmt = insert(SearchHistory.__table__).values(
+                        query=entry['query'],
+                        normalized_query=normalized,
+                        params=entry['params'],
+                        hit_count=entry['hits'],
+                        result_count=entry['result_count'],
+                        last_used_at=entry['last_used_at'],
+                        created_at=entry['last_used_at'],
+                        updated_at=entry['last_used_at']
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['normalized_query'],
+                        set_={
+                            'query': stmt.excluded.query,
+                            'params': stmt.excluded.params,
+                            'hit_count': SearchHistory.__table__.c.hit_count + stmt.excluded.hit_count,
+                            'result_count': stmt.excluded.result_count,
+                            'last_used_at': stmt.excluded.last_used_at,
+                            'updated_at': stmt.excluded.updated_at
+                        }
+                    )
+                    session.execute(stmt)
+                self._prune(session)
+                session.commit()
+            return len(pending)
+        except Exception as e:
+            self.logger.error(f"保存搜索历史失败: {e}")
+            return 0
+
+    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """按最近使用时间获取历史"""
+        pending = self._pending_entries()
+        try:
+            with self.db.get_session() as session:
+                rows = session.query(SearchHistory).order_by(
+                    SearchHistory.last_used_at.desc()
+                ).limit(limit).all()
+                items = self._merge_pending(session, rows, pending)
+        except Exception as e:
+            self.logger.error(f"获取搜索历史失败: {e}")
+            return []
+        items.sort(key=lambda item: item['last_used_at'], reverse=True)
+        return items[:limit]
+
+    def get_ranked(self, limit: int = 10, prefix: str = None) -> List[Dict[str, Any]]:
+        """按频率和最近使用时间综合排序获取历史
+
+        ``prefix`` 通过 ``normalized_query`` 唯一索引做范围查询，用于自动补全。
+        候选取最近使用和次数最多的各 ``RANK_CANDIDATES`` 条（均走索引），在内存中打分排序。
+        """
+        normalized = self.normalize_query(prefix) if prefix else ''
+        pending = {key: entry for key, entry in self._pending_entries().items()
+                   if key.startswith(normalized)}
+        try:
+            with self.db.get_session() as session:
+                query = session.query(SearchHistory)
+                if normalized:
+                    query = query.filter(
+                        SearchHistory.normalized_query >= normalized,
+                        SearchHistory.normalized_query < normalized + '\U0010ffff'
+                    )
+                candidates = {}
+                for order_by in ((SearchHistory.last_used_at.desc(),),
+                                 (SearchHistory.hit_count.desc(), SearchHistory.last_used_at.desc())):
+                    for row in query.order_by(*order_by).limit(self.RANK_CANDIDATES):
+                        candidates[row.id] = row
+                items = self._merge_pending(session, candidates.values(), pending)
+        except Exception as e:
+            self.logger.error(f"获取搜索历史排名失败: {e}")
+            return []
+        now = datetime.now()
+        items.sort(key=lambda item: self._score(item, now), reverse=True)
+        return items[:limit]
+
+    def clear(self) -> bool:
+        """清除全部搜索历史"""
+        with self._lock:
+            self._pending.clear()
+        try:
+            with self.db.get_session() as session:
+                session.query(SearchHistory).delete()
+                session.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"清除搜索历史失败: {e}")
+            return False
+
+    def _prune(self, session):
+        """裁剪超出上限的旧历史"""
+        session.execute(text(
+            "DELETE FROM search_history WHERE id NOT IN ("
+            "SELECT id FROM search_history ORDER BY last_used_at DESC LIMIT :max_entries)"
+        ), {'max_entries': self.max_entries})
+
+    def _pending_entries(self) -> Dict[str, Dict[str, Any]]:
+        """尚未落库的条目快照"""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._pending.items()}
+
+    def _merge_pending(self, session, rows, pending: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """合并已落库的行和尚未落库的条目（次数累加，其余字段以内存中的为准）"""
+        items = {row.normalized_query: self._to_item(row) for row in rows}
+        missing = [key for key in pending if key not in items]
+        if missing:
+            # 不在本次结果中但已落库的条目，取出已有次数（走唯一索引）
+            for row in session.query(SearchHistory).filter(SearchHistory.normalized_query.in_(missing)):
+                items[row.normalized_query] = self._to_item(row)
+        for key, entry in pending.items():
+            item = items.setdefault(key, {'hit_count': 0})
+            item.update({
+                'query': entry['query'],
+                'params': self._parse_params(entry['params']),
+                'hit_count': item['hit_count'] + entry['hits'],
+                'result_count': entry['result_count'],
+                'last_used_at': entry['last_used_at']
+            })
+        return list(items.values())
+
+    @staticmethod
+    def _score(item: Dict[str, Any], now: datetime) -> float:
+        """频率按距上次使用的天数衰减"""
+        age_days = max((now - item['last_used_at']).total_seconds(), 0) / 86400
+        return item['hit_count'] / (1.0 + age_days)
+
+    @staticmethod
+    def _parse_params(params: str) -> Dict[str, Any]:
+        try:
+            return json.loads(params) if params else {}
+        except ValueError:
+            return {}
+
+    def _to_item(self, row: SearchHistory) -> Dict[str, Any]:
+        """转换为界面使用的历史条目"""
+        return {
+            'query': row.query,
+            'params': self._parse_params(row.params),
+            'hit_count': row.hit_count,
+            'result_count': row.result_count,
+            'last_used_at': row.last_used_at
+        }
+
+    def _ensure_writer(self):
+        """按需启动后台写入线程"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._writer_loop,
+                                            name='search-history-writer', daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self):
+        """后台写入循环"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+# 全局搜索历史服务实例
+search_history_service = SearchHistoryService()
@@ -3,19 +3,39 @@
 Search Service
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_
+from typing import List, Optional, Dict, Any, Callable, Iterator
 import re
 import logging
 
 from models import WordEntry, Definition, Example
 from services.database_service import db_service
+from services.search_history_service import search_history_service
+from utils.text_normalizer import fold_text, normalize_search_key, normalize_phonetic_key
+from utils.phonetic import latin_sound_key, latin_sound_prefix, phonetic_sound_key, edit_distance
+from app.config import config
 
 
 class SearchService:
     """搜索服务类"""
     
+    # 基本字段 -> (原始列, 搜索键列, 规范化函数)
+    KEY_FIELDS = {
+        'word_id': ('word_id', 'word_id_key', normalize_search_key),
+        'latin_form': ('latin_form', 'latin_key', normalize_search_key),
+        'phonetic': ('phonetic', 'phonetic_key', normalize_phonetic_key),
+    }
+    
+    # 近音字段 -> (语音键列, 搜索键列, 语音键函数, 规范化函数)
+    SOUND_FIELDS = {
+        'latin_form': ('latin_sound_key', 'latin_key', latin_sound_key, normalize_search_key),
+        'phonetic': ('phonetic_sound_key', 'phonetic_key', phonetic_sound_key, normalize_phonetic_key),
+    }
+    
+    # 每轮候选数量上限（相对于结果上限的倍数）
+    SOUND_CANDIDATE_FACTOR = 20
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
@@ -30,31 +50,15 @@ class SearchService:
                 # 构建搜索条件
                 search_conditions = []
                 
-                if not case_sensitive:
-                    query = query.lower()
-                
-                if search_type in ['all', 'word_id']:
-                    if case_sensitive:
-                        search_conditions.append(WordEntry.word_id.contains(query))
-                    else:
-                        search_conditions.append(func.lower(WordEntry.word_id).contains(query))
-                
-                if search_type in ['all', 'latin_form']:
-                    if case_sensitive:
-                        search_conditions.append(WordEntry.latin_form.contains(query))
-                    else:
-                        search_conditions.append(func.lower(WordEntry.latin_form).contains(query))
-                
-                if search_type in ['all', 'phonetic']:
-                    if case_sensitive:
-                        search_conditions.append(WordEntry.phonetic.contains(query))
-                    else:
-                        search_conditions.append(func.lower(WordEntry.phonetic).contains(query))
+                for field in ['word_id', 'latin_form', 'phonetic']:
+                    if search_type in ['all', field]:
+                        search_conditions.append(self._field_condition(field, query, case_sensitive))
                 
                 if search_type in ['all', 'definitions']:
                     # 搜索释义
                     definition_query = session.query(WordEntry).join(Definition).filter(
-                        func.lower(Definition.definition_text).contains(query)
+                        self._text_condition(Definition.definition_text, Definition.definition_key,
+                                             query, case_sensitive)
                     )
                     if definition_query.count() > 0:
                         definition_results = definition_query.all()
@@ -64,8 +68,10 @@ class SearchService:
                     # 搜索例句
                     example_query = session.query(WordEntry).join(Example).filter(
                         or_(
-                            func.lower(Example.example_text).contains(query),
-                            func.lower(Example.translation).contains(query)
+                            self._text_condition(Example.example_text, Example.example_key,
+                                                 query, case_sensitive),
+                            self._text_condition(Example.translation, Example.translation_key,
+                                                 query, case_sensitive)
                         )
                     )
                     if example_query.count() > 0:
@@ -80,6 +86,8 @@ class SearchService:
                     
                     # 模糊搜索处理
                     if fuzzy and results:
+                        if not case_sensitive:
+                            query = normalize_search_key(query)
                         results = self._apply_fuzzy_search(results, query, case_sensitive)
                     
                     return results
@@ -100,8 +108,8 @@ class SearchService:
                 
                 # 计算匹配度分数
                 if not case_sensitive:
-                    word_id = word_entry.word_id.lower()
-                    latin_form = word_entry.latin_form.lower()
+                    word_id = word_entry.word_id_key or normalize_search_key(word_entry.word_id)
+                    latin_form = word_entry.latin_key or normalize_search_key(word_entry.latin_form)
                 else:
                     word_id = word_entry.word_id
                     latin_form = word_entry.latin_form
@@ -132,7 +140,8 @@ class SearchService:
             return results
     
     def search_by_pattern(self, pattern: str, search_fields: List[str] = None, 
-                         case_sensitive: bool = False, search_translation: bool = True) -> List[WordEntry]:
+                         case_sensitive: bool = False, search_translation: bool = True,
+                         is_cancelled: Callable[[], bool] = None) -> List[WordEntry]:
         """正则表达式搜索"""
         try:
             if not pattern.strip():
@@ -142,41 +151,28 @@ class SearchService:
             flags = 0 if case_sensitive else re.IGNORECASE
             regex = re.compile(pattern, flags)
             
+            # 检查指定字段
+            if search_fields is None:
+                search_fields = ['word_id', 'latin_form', 'phonetic']
+            basic_fields = [f for f in search_fields if f in self.KEY_FIELDS]
+            
             with db_service.get_session() as session:
-                all_words = session.query(WordEntry).all()
+                # 仅在需要时预加载释义和例句
+                query = session.query(WordEntry)
+                if 'definitions' in search_fields:
+                    query = query.options(selectinload(WordEntry.definitions))
+                if 'examples' in search_fields:
+                    query = query.options(selectinload(WordEntry.examples))
+                all_words = query.all()
                 matched_words = []
                 
                 for word_entry in all_words:
-                    match_found = False
-                    
-                    # 检查指定字段
-                    if search_fields is None:
-                        search_fields = ['word_id', 'latin_form', 'phonetic']
-                    
-                    for field in search_fields:
-                        value = getattr(word_entry, field, '')
-                        if value and regex.search(str(value)):
-                            match_found = True
-                            break
+                    # 已被新的搜索取代
+                    if is_cancelled and is_cancelled():
+                        return []
                     
-                    # 检查释义
-                    if not match_found and 'definitions' in (search_fields or []):
-                        for definition in word_entry.definitions:
-                            if regex.search(definition.definition_text):
-                                match_found = True
-                                break
-                    
-                    # 检查例句
-                    if not match_found and 'examples' in (search_fields or []):
-                        for example in word_entry.examples:
-                            if regex.search(example.example_text):
-                                match_found = True
-                                break
-                            if search_translation and example.translation and regex.search(example.translation):
-                                match_found = True
-                                break
-                    
-                    if match_found:
+                    if self._entry_matches_pattern(word_entry, regex, basic_fields, search_fields,
+                                                   search_translation, case_sensitive):
                         matched_words.append(word_entry)
                 
                 return matched_words
@@ -191,26 +187,30 @@ class SearchService:
             if not query.strip() or len(query) < 2:
                 return []
             
+            # 历史搜索优先
+            suggestions = [item['query'] for item in
+                           search_history_service.get_ranked(limit, prefix=query)]
+            
             with db_service.get_session() as session:
-                suggestions = set()
-                
                 # 从词条ID获取建议
                 word_id_suggestions = session.query(WordEntry.word_id).filter(
-                    func.lower(WordEntry.word_id).like(f"%{query.lower()}%")
+                    self._field_condition('word_id', query, False)
                 ).limit(limit).all()
                 
                 for suggestion in word_id_suggestions:
-                    suggestions.add(suggestion[0])
+                    if suggestion[0] not in suggestions:
+                        suggestions.append(suggestion[0])
                 
                 # 从拉丁写法获取建议
                 latin_suggestions = session.query(WordEntry.latin_form).filter(
-                    func.lower(WordEntry.latin_form).like(f"%{query.lower()}%")
+                    self._field_condition('latin_form', query, False)
                 ).limit(limit).all()
                 
                 for suggestion in latin_suggestions:
-                    suggestions.add(suggestion[0])
+                    if suggestion[0] not in suggestions:
+                        suggestions.append(suggestion[0])
                 
-                return list(suggestions)[:limit]
+                return suggestions[:limit]
                 
         except Exception as e:
             self.logger.error(f"获取搜索建议失败: {e}")
@@ -218,83 +218,180 @@ class SearchService:
     
     def get_recent_searches(self, limit: int = 10) -> List[str]:
         """获取最近搜索记录"""
-        # 这里可以从用户设置中获取最近搜索记录
-        # 暂时返回空列表，实际实现需要存储搜索历史
-        return []
+        return [item['query'] for item in search_history_service.get_recent(limit)]
     
-    def save_search_history(self, query: str):
-        """保存搜索历史"""
-        # 这里可以保存到用户设置中
-        # 实际实现需要存储搜索历史
-        pass
+    def get_search_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """获取按频率和时间排序的搜索历史（含搜索参数）"""
+        return search_history_service.get_ranked(limit)
     
-    def multi_field_search(self, query: str, search_fields: List[str], 
-                          case_sensitive: bool = False, fuzzy: bool = False,
-                          search_translation: bool = True) -> List[WordEntry]:
-        """多字段搜索"""
+    def save_search_history(self, query: str, params: Dict[str, Any] = None, result_count: int = 0):
+        """保存搜索历史（异步批量写入）"""
+        search_history_service.record(query, params, result_count)
+    
+    def clear_search_history(self) -> bool:
+        """清除搜索历史"""
+        return search_history_service.clear()
+    
+    def search_sound_alike(self, query: str, search_fields: List[str] = None,
+                           limit: int = None, max_distance: int = None,
+                           is_cancelled: Callable[[], bool] = None) -> List[WordEntry]:
+        """近音搜索（听过但不会拼写）
+
+        在语音键索引上按前缀取候选：先取语音键完全相同的词条，不足时逐步
+        缩短前缀扩大范围。候选按语音键编辑距离排序，距离相同时按规范化
+        文本的编辑距离排序。
+        """
         try:
             if not query.strip():
                 return []
             
+            # 未选择可比较读音的字段时，同时查找拉丁写法和音标
+            search_fields = [f for f in search_fields or [] if f in self.SOUND_FIELDS] \
+                or list(self.SOUND_FIELDS)
+            if limit is None:
+                limit = config.get_int('APP', 'max_search_results', 100)
+            if max_distance is None:
+                max_distance = config.get_int('SEARCH', 'phonetic_max_distance', 2)
+            
+            ranked = {}
             with db_service.get_session() as session:
-                all_words = session.query(WordEntry).all()
-                matched_words = []
-                
-                for word_entry in all_words:
-                    match_found = False
+                for field in search_fields:
+                    sound_name, key_name, encode, normalize = self.SOUND_FIELDS[field]
+                    sound_column = getattr(WordEntry, sound_name)
+                    key_column = getattr(WordEntry, key_name)
                     
-                    # 检查基本字段
-                    for field in search_fields:
-                        if field in ['word_id', 'latin_form', 'phonetic']:
-                            value = getattr(word_entry, field, '')
-                            if value and self._match_text(str(value), query, case_sensitive, fuzzy):
-                                match_found = True
-                                break
+                    # 拉丁写法语音键带有算法前缀，比较时去掉
+                    prefix = latin_sound_prefix() if field == 'latin_form' else ''
+                    query_sound = encode(query)[len(prefix):]
+                    query_text = normalize(query)
+                    if not query_sound:
+                        continue
                     
-                    # 检查释义
-                    if not match_found and 'definitions' in search_fields:
-                        for definition in word_entry.definitions:
-                            if self._match_text(definition.definition_text, query, case_sensitive, fuzzy):
-                                match_found = True
-                                break
-                    
-                    # 检查例句
-                    if not match_found and 'examples' in search_fields:
-                        for example in word_entry.examples:
-                            if self._match_text(example.example_text, query, case_sensitive, fuzzy):
-                                match_found = True
-                                break
-                            if search_translation and example.translation:
-                                if self._match_text(example.translation, query, case_sensitive, fuzzy):
-                                    match_found = True
-                                    break
-                    
-                    if match_found:
-                        matched_words.append(word_entry)
+                    for length in sorted({len(query_sound), min(2, len(query_sound)), 1}, reverse=True):
+                        if is_cancelled and is_cancelled():
+                            return []
+                        
+                        match = 'exact' if length == len(query_sound) else 'prefix'
+                        candidates = session.query(WordEntry.id, sound_column, key_column).filter(
+                            self._match_condition(sound_column, prefix + query_sound[:length], match)
+                        ).limit(limit * self.SOUND_CANDIDATE_FACTOR)
+                        
+                        for entry_id, sound, text in candidates:
+                            distance = edit_distance(query_sound, (sound or '')[len(prefix):])
+                            if distance > max_distance:
+                                continue
+                            score = (distance, edit_distance(query_text, text or ''))
+                            if entry_id not in ranked or score < ranked[entry_id]:
+                                ranked[entry_id] = score
+                        
+                        if len(ranked) >= limit:
+                            break
                 
-                return matched_words
+                ordered_ids = sorted(ranked, key=lambda entry_id: ranked[entry_id])[:limit]
+                if not ordered_ids:
+                    return []
+                
+                entries = session.query(WordEntry).options(
+                    selectinload(WordEntry.definitions),
+                    selectinload(WordEntry.images)
+                ).filter(WordEntry.id.in_(ordered_ids)).all()
+                entries_by_id = {entry.id: entry for entry in entries}
+                return [entries_by_id[entry_id] for entry_id in ordered_ids if entry_id in entries_by_id]
+                
+        except Exception as e:
+            self.logger.error(f"近音搜索失败: {e}")
+            return []
+    
+    def multi_field_search(self, query: str, search_fields: List[str], 
+                          case_sensitive: bool = False, fuzzy: bool = False,
+                          search_translation: bool = True,
+                          is_cancelled: Callable[[], bool] = None) -> List[WordEntry]:
+        """多字段搜索"""
+        try:
+            if not query.strip():
+                return []
+            
+            # 已被新的搜索取代
+            if is_cancelled and is_cancelled():
+                return []
+            
+            match = 'contains' if fuzzy else 'exact'
+            conditions = [
+                self._field_condition(field, query, case_sensitive, match)
+                for field in search_fields if field in self.KEY_FIELDS
+            ]
+            
+            # 检查释义和例句
+            conditions.extend(self._related_conditions(query, search_fields, case_sensitive,
+                                                       search_translation, match))
+            
+            if not conditions:
+                return []
+            
+            with db_service.get_session() as session:
+                return session.query(WordEntry).options(
+                    selectinload(WordEntry.definitions),
+                    selectinload(WordEntry.images)
+                ).filter(or_(*conditions)).order_by(WordEntry.id).all()
                 
         except Exception as e:
             self.logger.error(f"多字段搜索失败: {e}")
             return []
     
-    def _match_text(self, text: str, query: str, case_sensitive: bool, fuzzy: bool) -> bool:
-        """文本匹配"""
-        if not text or not query:
-            return False
-        
-        if not case_sensitive:
-            text = text.lower()
-            query = query.lower()
-        
-        if fuzzy:
-            # 简单的模糊匹配
-            return query in text
+    def _field_condition(self, field: str, query: str, case_sensitive: bool,
+                         match: str = 'contains'):
+        """构建基本字段的匹配条件
+
+        不区分大小写时比较预先计算并建立索引的搜索键，避免逐行调用lower()。
+        ``match`` 可为 exact、prefix、contains；prefix使用范围比较以命中索引。
+        """
+        raw_name, key_name, normalize = self.KEY_FIELDS[field]
+        if case_sensitive:
+            column, value = getattr(WordEntry, raw_name), query
         else:
-            # 精确匹配
-            return text == query
+            column, value = getattr(WordEntry, key_name), normalize(query)
+        return self._match_condition(column, value, match)
+    
+    def _text_condition(self, raw_column, key_column, query: str, case_sensitive: bool,
+                        match: str = 'contains'):
+        """构建释义、例句等长文本的匹配条件"""
+        if case_sensitive:
+            return self._match_condition(raw_column, query, match)
+        return self._match_condition(key_column, fold_text(query), match)
+    
+    def _related_conditions(self, query: str, search_fields: List[str], case_sensitive: bool,
+                            search_translation: bool, match: str = 'contains') -> List:
+        """构建释义和例句的匹配条件"""
+        conditions = []
+        if 'definitions' in search_fields:
+            conditions.append(WordEntry.definitions.any(
+                self._text_condition(Definition.definition_text, Definition.definition_key,
+                                     query, case_sensitive, match)
+            ))
+        
+        if 'examples' in search_fields:
+            example_conditions = [
+                self._text_condition(Example.example_text, Example.example_key,
+                                     query, case_sensitive, match)
+            ]
+            if search_translation:
+                example_conditions.append(
+                    self._text_condition(Example.translation, Example.translation_key,
+                                         query, case_sensitive, match)
+                )
+            conditions.append(WordEntry.examples.any(or_(*example_conditions)))
+        return conditions
+    
+    def _match_condition(self, column, value: str, match: str):
+        """按匹配方式生成SQL条件"""
+        if match == 'exact':
+            return column == value
+        if match == 'prefix':
+            return and_(column >= value, column < value + '\U0010ffff')
+        return column.contains(value, autoescape=True)
     
-    def advanced_search(self, search_params: dict) -> List[WordEntry]:
+    def advanced_search(self, search_params: dict,
+                        is_cancelled: Callable[[], bool] = None) -> List[WordEntry]:
         """高级搜索"""
         try:
             query = search_params.get('query', '')
@@ -308,8 +405,11 @@ class SearchService:
                     query, 
                     search_fields, 
                     case_sensitive, 
-                    search_translation
+                    search_translation,
+                    is_cancelled=is_cancelled
                 )
+            elif search_mode == 'sound':
+                return self.search_sound_alike(query, search_fields, is_cancelled=is_cancelled)
             else:
                 fuzzy = search_mode == 'fuzzy'
                 return self.multi_field_search(
@@ -317,13 +417,177 @@ class SearchService:
                     search_fields,
                     case_sensitive,
                     fuzzy,
-                    search_translation
+                    search_translation,
+                    is_cancelled=is_cancelled
                 )
                 
         except Exception as e:
             self.logger.error(f"高级搜索失败: {e}")
             return []
 
+    
+    def iter_advanced_search(self, search_params: dict, batch_size: int = 20,
+                             limit: int = None,
+                             is_cancelled: Callable[[], bool] = None) -> Iterator[List[WordEntry]]:
+        """流式高级搜索
+
+        按排名分层逐批产出结果：完全匹配、前缀匹配、包含匹配，
+        然后是释义和例句命中；正则模式按扫描顺序逐批产出。
+        达到 ``limit`` 条结果后提前终止。
+        """
+        query = search_params.get('query', '')
+        if not query.strip():
+            return
+        
+        if limit is None:
+            limit = config.get_int('APP', 'max_search_results', 100)
+        
+        search_mode = search_params.get('search_mode', 'fuzzy')
+        search_fields = search_params.get('search_fields', ['word_id', 'latin_form'])
+        case_sensitive = search_params.get('case_sensitive', False)
+        search_translation = search_params.get('search_translation', True)
+        
+        if search_mode == 'regex':
+            tiers = self._iter_pattern_tiers(query, search_fields, case_sensitive,
+                                             search_translation, batch_size)
+        elif search_mode == 'sound':
+            tiers = self._iter_sound_tiers(query, search_fields, limit, batch_size, is_cancelled)
+        else:
+            tiers = self._iter_ranked_tiers(query, search_mode, search_fields, case_sensitive,
+                                            search_translation, batch_size)
+        
+        seen_ids = set()
+        remaining = limit
+        try:
+            for batch in tiers:
+                if is_cancelled and is_cancelled():
+                    return
+                
+                # 跨层去重
+                fresh = []
+                for word_entry in batch:
+                    if word_entry.id not in seen_ids:
+                        seen_ids.add(word_entry.id)
+                        fresh.append(word_entry)
+                
+                if not fresh:
+                    continue
+                
+                fresh = fresh[:remaining]
+                remaining -= len(fresh)
+                yield fresh
+                
+                if remaining <= 0:
+                    return
+        finally:
+            tiers.close()
+    
+    def _iter_ranked_tiers(self, query: str, search_mode: str, search_fields: List[str],
+                           case_sensitive: bool, search_translation: bool,
+                           batch_size: int) -> Iterator[List[WordEntry]]:
+        """按排名分层执行SQL查询，每层逐批产出"""
+        basic_fields = [f for f in self.KEY_FIELDS if f in search_fields]
+        
+        def field_tier(match):
+            return or_(*[self._field_condition(f, query, case_sensitive, match) for f in basic_fields])
+        
+        match = 'exact' if search_mode == 'exact' else 'contains'
+        
+        tier_conditions = []
+        if basic_fields:
+            tier_conditions.append(field_tier('exact'))
+            if search_mode != 'exact':
+                tier_conditions.append(field_tier('prefix'))
+                tier_conditions.append(field_tier('contains'))
+        
+        tier_conditions.extend(self._related_conditions(query, search_fields, case_sensitive,
+                                                        search_translation, match))
+        
+        with db_service.get_session() as session:
+            for condition in tier_conditions:
+                results = session.query(WordEntry).options(
+                    selectinload(WordEntry.definitions),
+                    selectinload(WordEntry.images)
+                ).filter(condition).order_by(WordEntry.word_id).yield_per(batch_size)
+                
+                batch = []
+                for word_entry in results:
+                    batch.append(word_entry)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+    
+    def _iter_sound_tiers(self, query: str, search_fields: List[str], limit: int,
+                          batch_size: int, is_cancelled: Callable[[], bool] = None
+                          ) -> Iterator[List[WordEntry]]:
+        """近音搜索已在索引上完成排序，按批次切分产出"""
+        results = self.search_sound_alike(query, search_fields, limit=limit,
+                                          is_cancelled=is_cancelled)
+        for start in range(0, len(results), batch_size):
+            yield results[start:start + batch_size]
+    
+    def _iter_pattern_tiers(self, pattern: str, search_fields: List[str], case_sensitive: bool,
+                            search_translation: bool, batch_size: int) -> Iterator[List[WordEntry]]:
+        """流式正则扫描，按扫描顺序逐批产出"""
+        flags = 0 if case_sensitive else re.IGNORECASE
+        regex = re.compile(pattern, flags)
+        basic_fields = [f for f in search_fields if f in self.KEY_FIELDS]
+        
+        with db_service.get_session() as session:
+            rows = session.query(WordEntry).options(
+                selectinload(WordEntry.definitions),
+                selectinload(WordEntry.examples),
+                selectinload(WordEntry.images)
+            ).order_by(WordEntry.word_id).yield_per(batch_size)
+            
+            batch = []
+            scanned = 0
+            for word_entry in rows:
+                scanned += 1
+                if self._entry_matches_pattern(word_entry, regex, basic_fields, search_fields,
+                                               search_translation, case_sensitive):
+                    batch.append(word_entry)
+                
+                # 每扫描一批都让出一次，以便调用方检查取消状态
+                if len(batch) >= batch_size or (scanned % batch_size == 0):
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+    
+    def _entry_matches_pattern(self, word_entry: WordEntry, regex, basic_fields: List[str],
+                               search_fields: List[str], search_translation: bool,
+                               case_sensitive: bool = False) -> bool:
+        """判断词条是否匹配正则表达式
+
+        不区分大小写时同时匹配规范化后的搜索键，使无变音符号的模式也能命中。
+        """
+        def matches(*values):
+            return any(value and regex.search(str(value)) for value in values)
+        
+        fold = not case_sensitive
+        for field in basic_fields:
+            raw_name, key_name, _ = self.KEY_FIELDS[field]
+            if matches(getattr(word_entry, raw_name, ''),
+                       fold and getattr(word_entry, key_name, '')):
+                return True
+        
+        if 'definitions' in search_fields:
+            for definition in word_entry.definitions:
+                if matches(definition.definition_text, fold and definition.definition_key):
+                    return True
+        
+        if 'examples' in search_fields:
+            for example in word_entry.examples:
+                if matches(example.example_text, fold and example.example_key):
+                    return True
+                if search_translation and matches(example.translation,
+                                                  fold and example.translation_key):
+                    return True
+        
+        return False
 
 # 全局搜索服务实例
 search_service = SearchService()
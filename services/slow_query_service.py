@@ -0,0 +1,201 @@
+"""
+慢查询记录服务
+Slow Query Recorder
+
+在数据库引擎上计时每条SQL，超过阈值的语句连同参数、耗时和 ``EXPLAIN QUERY PLAN``
+结果保存在有界环形缓冲区中，并标记未使用索引的全表扫描。
+每条慢查询同时写入日志，缓冲区可导出到日志目录随日志一起提交。
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.config import config
+from services.registry import service_registry
+
+
+DEFAULT_THRESHOLD_MS = 200.0
+DEFAULT_BUFFER_SIZE = 100
+
+# 参数值的最大记录长度
+MAX_PARAMETER_LENGTH = 200
+
+# 可以解释执行计划的语句
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+
+# 执行计划中的全表扫描（SQLite 3.36 起省略了 TABLE）
+_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+
+_STARTED_KEY = 'slow_query_started'
+
+
+def find_full_scans(plan: List[str]) -> List[str]:
+    """执行计划中未使用索引扫描的表"""
+    tables = []
+    for detail in plan:
+        match = _FULL_SCAN.match(detail)
+        if match and 'USING' not in detail and 'VIRTUAL TABLE' not in detail \
+                and match.group(1) not in ('CONSTANT', 'SUBQUERY'):
+            tables.append(match.group(1))
+    return tables
+
+
+def _format_parameter(value: Any) -> Any:
+    """参数转换为可序列化、长度有限的值"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + '…'
+
+
+def _format_parameters(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _format_parameter(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_format_parameter(value) for value in parameters]
+    return _format_parameter(parameters)
+
+
+class SlowQueryService:
+    """慢查询记录服务类
+
+    耗时为游标执行语句的时间；SQLite在执行时即完成排序和聚合，
+    逐行读取的时间不计入。
+    """
+
+    def __init__(self, threshold_ms: float = None, buffer_size: int = None, explain: bool = None):
+        self.logger = logging.getLogger(__name__)
+        self.threshold_ms = threshold_ms if threshold_ms is not None else config.get_float(
+            'DEBUG', 'slow_query_ms', DEFAULT_THRESHOLD_MS)
+        self.explain = explain if explain is not None else config.get_boolean(
+            'DEBUG', 'slow_query_explain', True)
+        self._records = deque(maxlen=max(1, buffer_size or config.get_int(
+            'DEBUG', 'slow_query_buffer', DEFAULT_BUFFER_SIZE)))
+        self._lock = threading.Lock()
+        self.total_recorded = 0
+
+    def attach(self, engine):
+        """在引擎上注册计时监听"""
+        from sqlalchemy import event
+
+        if not event.contains(engine, 'after_cursor_execute', self._after_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def detach(self, engine):
+        """移除引擎上的监听"""
+        from sqlalchemy import event
+
+        if event.contains(engine, 'after_cursor_execute', self._after_cursor_execute):
+            event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def get_recent(self, limit: int = None) -> List[Dict[str, Any]]:
+        """最近的慢查询（新的在前）"""
+        with self._lock:
+            records = list(reversed(self._records))
+        return records[:limit] if limit else records
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._records.clear()
+
+    def dump_json(self, filepath: str = None) -> Optional[str]:
+        """导出为JSON（默认写入日志目录的 slow_queries.json）"""
+        try:
+            if filepath:
+                path = Path(filepath)
+            else:
+                from utils.logger import get_log_dir
+                path = get_log_dir() / "slow_queries.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'dumped_at': datetime.now().isoformat(),
+                'threshold_ms': self.threshold_ms,
+                'total_recorded': self.total_recorded,
+                'queries': self.get_recent(),
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"导出慢查询失败: {e}")
+            return None
+
+    def format_report(self, limit: int = 10) -> str:
+        """文本报告（调试面板使用）"""
+        records = self.get_recent(limit)
+        if not records:
+            return f"没有超过 {self.threshold_ms:.0f}ms 的查询"
+        lines = []
+        for record in records:
+            scans = f" 全表扫描: {', '.join(record['full_scans'])}" if record['full_scans'] else ''
+            lines.append(f"{record['duration_ms']:.0f}ms{scans}\n  {record['statement'][:160]}")
+        return '\n'.join(lines)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # 开始时间保存在本次执行的上下文中，执行出错时随上下文丢弃
+        if context is not None:
+            setattr(context, _STARTED_KEY, time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, _STARTED_KEY, None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        try:
+            if executemany and parameters:
+                parameters = parameters[0]
+            plan = self._explain(cursor, statement, parameters) if self.explain else []
+            self._record(statement, parameters, duration_ms, plan, executemany)
+        except Exception as e:
+            self.logger.debug(f"记录慢查询失败: {e}")
+
+    def _explain(self, cursor, statement: str, parameters) -> List[str]:
+        """获取执行计划（使用同一连接上的新游标，不影响原查询的结果）"""
+        if not _EXPLAINABLE.match(statement):
+            return []
+        try:
+            explain_cursor = cursor.connection.cursor()
+            try:
+                explain_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+                return [row[-1] for row in explain_cursor.fetchall()]
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            return [f"EXPLAIN失败: {e}"]
+
+    def _record(self, statement: str, parameters, duration_ms: float, plan: List[str], executemany: bool):
+        full_scans = find_full_scans(plan)
+        record = {
+            'recorded_at': datetime.now().isoformat(timespec='milliseconds'),
+            'duration_ms': round(duration_ms, 3),
+            'statement': statement,
+            'parameters': _format_parameters(parameters),
+            'executemany': executemany,
+            'plan': plan,
+            'full_scans': full_scans,
+            'thread': threading.current_thread().name,
+        }
+        with self._lock:
+            self._records.append(record)
+            self.total_recorded += 1
+
+        scans = f"，全表扫描 {', '.join(full_scans)}" if full_scans else ''
+        self.logger.warning(f"慢查询 {duration_ms:.1f}ms{scans}: {' '.join(statement.split())[:300]}")
+
+
+# 全局慢查询记录服务实例
+slow_query_service = service_registry.register('slow_query_service', SlowQueryService)
@@ -4,15 +4,26 @@ Utility Service
 """
 
 import re
-import requests
-from typing import List, Dict, Any, Optional
+import html
+import threading
+from typing import Callable, List, Dict, Any, Optional
 import logging
-from urllib.parse import urlparse
-from PIL import Image
+from urllib.parse import urlparse, urlsplit, urlunsplit
 import io
 
+from app.config import config
 from models import Bookmark, MemoWord
 from services.database_service import db_service
+from services.registry import service_registry
+from utils.ttl_cache import TTLCache
+from utils.ids_parser import IdsNode, IdsParseError, count_operators, iter_components, parse_ids, to_ids, tree_depth
+
+
+# 提取标题时最多读取的响应字节数
+TITLE_SCAN_BYTES = 16 * 1024
+
+_TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.IGNORECASE)
 
 
 class UtilityService:
@@ -20,6 +31,12 @@ class UtilityService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._http_session = None
+        self._http_lock = threading.Lock()
+        self._url_cache = TTLCache(
+            max_size=2048,
+            ttl=config.get_int('NETWORK', 'url_cache_ttl', 3600)
+        )
     
     def add_bookmark(self, title: str, url: str, description: str = "") -> bool:
         """添加书签"""
@@ -35,6 +52,10 @@ class UtilityService:
                     url=url,
                     description=description
                 )
+                bookmark.refresh_url_hash()
+                if session.query(Bookmark.id).filter(Bookmark.url_hash == bookmark.url_hash).first():
+                    self.logger.warning(f"书签已存在: {url}")
+                    return False
                 session.add(bookmark)
                 session.commit()
                 
@@ -111,52 +132,163 @@ class UtilityService:
             self.logger.error(f"删除备忘词条失败: {e}")
             return False
     
-    def validate_url(self, url: str) -> Dict[str, Any]:
-        """验证URL并获取页面信息"""
-        try:
-            if not self._is_valid_url(url):
-                return {'valid': False, 'error': '无效的URL格式'}
-            
-            # 发送HEAD请求检查URL
-            response = requests.head(url, timeout=10, allow_redirects=True)
-            
-            result = {
-                'valid': True,
-                'status_code': response.status_code,
-                'url': response.url,
-                'content_type': response.headers.get('content-type', ''),
-                'content_length': response.headers.get('content-length', ''),
-                'title': ''
+    def validate_url(self, url: str, use_cache: bool = True) -> Dict[str, Any]:
+        """验证URL并获取页面信息（结果按实际请求的网址缓存）"""
+        if not self._is_valid_url(url):
+            return {'valid': False, 'error': '无效的URL格式'}
+        
+        key = self._request_key(url)
+        if use_cache:
+            cached = self._url_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        
+        result = self._fetch_url_info(url)
+        # 网络错误只短暂缓存，便于稍后重试
+        ttl = None if result['valid'] else min(self._url_cache.ttl, 60)
+        self._url_cache.set(key, result, ttl)
+        return dict(result)
+    
+    def validate_urls(self, urls: List[str], max_workers: int = None,
+                      progress_callback: Callable[[int, int], None] = None,
+                      use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """并发验证多个URL，返回 {url: 验证结果}
+        
+        并发数受 ``max_workers`` 限制（默认读取配置），请求相同的网址（只差片段或大小写主机名）只请求一次。
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        groups: Dict[str, List[str]] = {}
+        for url in urls:
+            groups.setdefault(self._request_key(url) if self._is_valid_url(url) else url, []).append(url)
+        
+        results = {}
+        total = len(groups)
+        max_workers = max_workers or config.get_int('NETWORK', 'max_workers', 8)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1)),
+                                thread_name_prefix='url-validate') as executor:
+            futures = {
+                executor.submit(self.validate_url, group[0], use_cache): group
+                for group in groups.values()
             }
-            
-            # 如果是HTML页面，尝试获取标题
-            if 'text/html' in result['content_type']:
+            for done, future in enumerate(as_completed(futures), 1):
+                group = futures[future]
                 try:
-                    html_response = requests.get(url, timeout=10)
-                    title_match = re.search(r'<title>(.*?)</title>', html_response.text, re.IGNORECASE)
-                    if title_match:
-                        result['title'] = title_match.group(1).strip()
-                except:
-                    pass
-            
-            return result
+                    result = future.result()
+                except Exception as e:
+                    result = {'valid': False, 'error': f'验证失败: {str(e)}'}
+                for url in group:
+                    results[url] = result
+                if progress_callback:
+                    progress_callback(done, total)
+        return results
+    
+    def clear_url_cache(self):
+        """清空URL验证缓存"""
+        self._url_cache.clear()
+    
+    @staticmethod
+    def _request_key(url: str) -> str:
+        """验证结果的缓存键：实际发出的请求
+        
+        只去掉不发送给服务器的片段；协议和主机（含www）保留，http与https、有无www可能返回不同结果。
+        """
+        parts = urlsplit(url.strip())
+        userinfo, at, host = parts.netloc.rpartition('@')
+        return urlunsplit((parts.scheme.lower(), userinfo + at + host.lower(), parts.path or '/', parts.query, ''))
+    
+    def _get_http_session(self):
+        """获取共享的HTTP会话（连接池大小与最大并发数一致）"""
+        if self._http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
             
+            with self._http_lock:
+                if self._http_session is None:
+                    pool_size = config.get_int('NETWORK', 'max_workers', 8)
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    session.headers['User-Agent'] = 'GHLanDictionary/1.0 (+url-validator)'
+                    self._http_session = session
+        return self._http_session
+    
+    def _fetch_url_info(self, url: str) -> Dict[str, Any]:
+        """请求URL，只读取响应开头的部分内容来提取标题"""
+        import requests
+        
+        timeout = config.get_int('NETWORK', 'timeout', 10)
+        try:
+            with self._get_http_session().get(url, timeout=timeout, stream=True,
+                                              allow_redirects=True) as response:
+                result = {
+                    'valid': True,
+                    'status_code': response.status_code,
+                    'url': response.url,
+                    'content_type': response.headers.get('content-type', ''),
+                    'content_length': response.headers.get('content-length', ''),
+                    'title': ''
+                }
+                if 'text/html' in result['content_type']:
+                    result['title'] = self._read_title(response)
+                return result
         except requests.exceptions.RequestException as e:
             return {'valid': False, 'error': f'网络错误: {str(e)}'}
         except Exception as e:
             return {'valid': False, 'error': f'验证失败: {str(e)}'}
     
+    def _read_title(self, response) -> str:
+        """从流式响应中读取 <title>，最多读取 TITLE_SCAN_BYTES 字节"""
+        head = b''
+        for chunk in response.iter_content(chunk_size=2048):
+            head += chunk
+            if b'</title>' in head.lower() or len(head) >= TITLE_SCAN_BYTES:
+                break
+        head = head[:TITLE_SCAN_BYTES]
+        
+        encoding = None
+        if 'charset=' in response.headers.get('content-type', '').lower():
+            encoding = response.encoding
+        if not encoding:
+            meta_match = _META_CHARSET.search(head)
+            encoding = meta_match.group(1).decode('ascii') if meta_match else 'utf-8'
+        try:
+            text = head.decode(encoding, errors='replace')
+        except LookupError:
+            text = head.decode('utf-8', errors='replace')
+        
+        title_match = _TITLE.search(text)
+        if not title_match:
+            return ''
+        return ' '.join(html.unescape(title_match.group(1)).split())
+    
     def process_ids_symbol(self, ids_text: str) -> Dict[str, Any]:
         """处理IDS描述符号"""
         try:
-            # 解析IDS符号
-            components = self._parse_ids_components(ids_text)
+            tree = parse_ids(ids_text)
+        except IdsParseError as e:
+            return {'original': ids_text, 'components': [], 'structure': {}, 'is_valid': False, 'error': str(e)}
+        
+        try:
+            components = [
+                {'type': 'component', 'value': component, 'position': position, 'operator': operator}
+                for component, position, operator in iter_components(tree)
+            ]
+            depth = tree_depth(tree)
             
             result = {
                 'original': ids_text,
+                'normalized': to_ids(tree),
                 'components': components,
-                'structure': self._analyze_ids_structure(ids_text),
-                'is_valid': self._validate_ids_format(ids_text)
+                'structure': {
+                    'operator': tree.operator if isinstance(tree, IdsNode) else '',
+                    'operator_count': count_operators(tree),
+                    'component_count': len(components),
+                    'depth': depth,
+                    'complexity': 'high' if depth > 2 else 'medium' if depth > 1 else 'low'
+                },
+                'is_valid': True
             }
             
             return result
@@ -168,6 +300,8 @@ class UtilityService:
     def resize_image(self, image_data: bytes, max_size: tuple = (800, 600), 
                     quality: int = 85) -> bytes:
         """调整图片大小"""
+        from PIL import Image
+        
         try:
             # 打开图片
             image = Image.open(io.BytesIO(image_data))
@@ -199,52 +333,7 @@ class UtilityService:
             return all([result.scheme, result.netloc])
         except:
             return False
-    
-    def _parse_ids_components(self, ids_text: str) -> List[Dict[str, str]]:
-        """解析IDS组件"""
-        components = []
-        
-        # 简单的IDS解析（实际实现需要更复杂的解析逻辑）
-        # 这里只是示例实现
-        bracket_pattern = r'\[([^\]]+)\]'
-        matches = re.findall(bracket_pattern, ids_text)
-        
-        for match in matches:
-            components.append({
-                'type': 'component',
-                'value': match,
-                'position': ids_text.find(f'[{match}]')
-            })
-        
-        return components
-    
-    def _analyze_ids_structure(self, ids_text: str) -> Dict[str, Any]:
-        """分析IDS结构"""
-        return {
-            'length': len(ids_text),
-            'has_brackets': '[' in ids_text and ']' in ids_text,
-            'bracket_count': ids_text.count('['),
-            'complexity': 'high' if ids_text.count('[') > 3 else 'medium' if ids_text.count('[') > 1 else 'low'
-        }
-    
-    def _validate_ids_format(self, ids_text: str) -> bool:
-        """验证IDS格式"""
-        # 基本的IDS格式验证
-        if not ids_text:
-            return False
-        
-        # 检查括号匹配
-        bracket_count = 0
-        for char in ids_text:
-            if char == '[':
-                bracket_count += 1
-            elif char == ']':
-                bracket_count -= 1
-                if bracket_count < 0:
-                    return False
-        
-        return bracket_count == 0
 
 
 # 全局工具服务实例
-utility_service = UtilityService()
+utility_service = service_registry.register('utility_service', UtilityService)
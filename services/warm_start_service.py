@@ -0,0 +1,203 @@
+"""
+启动快照服务
+Warm Start Snapshot Service
+
+将首页统计、词条列表第一页和最近搜索保存为JSON快照，
+下次启动时在打开数据库之前即可显示，数据库就绪后再在后台校正。
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from app.config import config
+
+
+class WarmStartService:
+    """启动快照服务类"""
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, path: str = None, page_size: int = 20, recent_limit: int = 5):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else Path(config.data_dir) / "warm_start.json"
+        self.page_size = page_size
+        self.recent_limit = recent_limit
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+        """当前快照（首次访问时从文件读取）"""
+        if self._snapshot is None:
+            self._snapshot = self.load()
+        return self._snapshot
+
+    def load(self) -> Dict[str, Any]:
+        """读取快照文件，不存在或版本不符时返回空快照"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != self.SNAPSHOT_VERSION:
+                return {}
+            return snapshot
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"读取启动快照失败: {e}")
+            return {}
+
+    def capture(self) -> Dict[str, Any]:
+        """从数据库生成快照"""
+        from sqlalchemy import func
+        from sqlalchemy.orm import selectinload
+        from models import WordEntry
+        from models.stats import WORD_TOTAL, WORD_FAVORITES
+        from services.database_service import db_service
+        from services.search_history_service import search_history_service
+
+        counts = db_service.get_stats(WORD_TOTAL, WORD_FAVORITES)
+        total, favorites = counts[WORD_TOTAL], counts[WORD_FAVORITES]
+
+        with db_service.get_session() as session:
+            recent_count = session.query(func.count(WordEntry.id)).filter(
+                WordEntry.created_at >= datetime.now() - timedelta(days=7)
+            ).scalar()
+
+            recent_words = session.query(WordEntry).options(
+                selectinload(WordEntry.definitions)
+            ).order_by(WordEntry.created_at.desc()).limit(self.recent_limit).all()
+
+            first_page = session.query(WordEntry).options(
+                selectinload(WordEntry.definitions)
+            ).order_by(WordEntry.word_id.asc()).limit(self.page_size).all()
+
+            snapshot = {
+                'version': self.SNAPSHOT_VERSION,
+                'saved_at': datetime.now().isoformat(),
+                'home': {
+                    'total_entries': total,
+                    'favorite_entries': favorites,
+                    'recent_entries': recent_count,
+                    'recent_words': [self._entry_to_item(entry) for entry in recent_words]
+                },
+                'word_list': {
+                    'sort_by': 'word_id',
+                    'order': 'asc',
+                    'total': total,
+                    'entries': [self._entry_to_item(entry) for entry in first_page]
+                }
+            }
+
+        snapshot['recent_searches'] = [
+            {
+                'query': item['query'],
+                'params': item['params'],
+                'last_used_at': item['last_used_at'].isoformat() if item['last_used_at'] else None
+            }
+            for item in search_history_service.get_recent(10)
+        ]
+        return snapshot
+
+    def save(self, snapshot: Dict[str, Any] = None) -> bool:
+        """生成（或使用给定的）快照并原子写入文件"""
+        try:
+            if snapshot is None:
+                snapshot = self.capture()
+            with self._lock:
+                temp_path = self.path.with_suffix('.tmp')
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+                self._snapshot = snapshot
+            return True
+        except Exception as e:
+            self.logger.error(f"保存启动快照失败: {e}")
+            return False
+
+    def reconcile(self, callback: Callable[[Dict[str, Any]], None] = None):
+        """在后台线程用数据库中的实际数据校正快照
+
+        快照内容有变化时写回文件，并在主线程以新快照调用 ``callback``。
+        """
+        def worker():
+            try:
+                fresh = self.capture()
+            except Exception as e:
+                self.logger.error(f"校正启动快照失败: {e}")
+                return
+            if self._content(fresh) == self._content(self.snapshot):
+                return
+            self.save(fresh)
+            if callback:
+                from kivy.clock import Clock
+                Clock.schedule_once(lambda dt: callback(fresh), 0)
+
+        thread = threading.Thread(target=worker, name='warm-start-reconcile', daemon=True)
+        thread.start()
+        return thread
+
+    def get_home_stats(self) -> Dict[str, Any]:
+        """首页统计数据"""
+        return self.snapshot.get('home', {})
+
+    def get_recent_searches(self) -> List[Dict[str, Any]]:
+        """最近搜索（与 ``SearchService.get_search_history`` 格式相同）"""
+        return [
+            dict(item, last_used_at=datetime.fromisoformat(item['last_used_at'])
+                 if item.get('last_used_at') else None)
+            for item in self.snapshot.get('recent_searches', [])
+        ]
+
+    def get_first_page(self, sort_by: str = 'word_id', order: str = 'asc') -> Optional[List[Any]]:
+        """词条列表第一页（未缓存该排序时返回None）
+
+        返回未绑定会话的 ``WordEntry`` 对象，仅用于显示。
+        """
+        page = self.snapshot.get('word_list')
+        if not page or page.get('sort_by') != sort_by or page.get('order') != order:
+            return None
+        return [self._item_to_entry(item) for item in page.get('entries', [])]
+
+    def get_list_total(self) -> int:
+        """快照中的词条总数"""
+        return self.snapshot.get('word_list', {}).get('total', 0)
+
+    def _content(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """去除时间戳后的快照内容，用于比较"""
+        return {key: value for key, value in snapshot.items() if key != 'saved_at'}
+
+    def _entry_to_item(self, entry) -> Dict[str, Any]:
+        """词条转换为快照条目"""
+        return {
+            'word_id': entry.word_id,
+            'latin_form': entry.latin_form,
+            'phonetic': entry.phonetic,
+            'word_type': entry.word_type,
+            'is_favorite': bool(entry.is_favorite),
+            'definition': entry.get_primary_definition(),
+            'created_at': entry.created_at.isoformat() if entry.created_at else None
+        }
+
+    def _item_to_entry(self, item: Dict[str, Any]):
+        """快照条目转换为临时词条对象"""
+        from models import WordEntry, Definition
+        entry = WordEntry(
+            word_id=item.get('word_id'),
+            latin_form=item.get('latin_form'),
+            phonetic=item.get('phonetic'),
+            word_type=item.get('word_type'),
+            is_favorite=item.get('is_favorite', False),
+            created_at=datetime.fromisoformat(item['created_at']) if item.get('created_at') else None
+        )
+        if item.get('definition'):
+            entry.definitions = [Definition(definition_text=item['definition'])]
+        return entry
+
+
+# 全局启动快照服务实例
+warm_start_service = WarmStartService()
@@ -0,0 +1,63 @@
+"""
+pytest配置
+pytest Configuration
+
+``--detect-n-plus-one=warn|raise`` 在每个测试中启用N+1查询检测（``warn`` 发出警告并在结束时汇总，
+``raise`` 使测试失败）；单个测试也可以直接使用 ``n_plus_one`` fixture。
+"""
+
+import warnings
+
+import pytest
+
+from utils.query_detector import DEFAULT_THRESHOLD, NPlusOneDetector, NPlusOneWarning
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('n_plus_one', 'N+1查询检测')
+    group.addoption('--detect-n-plus-one', action='store', default=None,
+                    choices=('warn', 'raise'), help="在每个测试中检测N+1查询")
+    group.addoption('--n-plus-one-threshold', action='store', type=int, default=DEFAULT_THRESHOLD,
+                    help=f"同一形状查询允许执行的次数（默认 {DEFAULT_THRESHOLD}）")
+
+
+def pytest_configure(config):
+    config._n_plus_one_reports = []
+
+
+@pytest.fixture
+def n_plus_one(request):
+    """raise模式的检测器：测试结束时同一形状的查询超过阈值则失败"""
+    with NPlusOneDetector(threshold=request.config.getoption('--n-plus-one-threshold')) as detector:
+        yield detector
+
+
+@pytest.fixture(autouse=True)
+def _detect_n_plus_one(request):
+    mode = request.config.getoption('--detect-n-plus-one')
+    if mode is None:
+        yield
+        return
+    detector = NPlusOneDetector(threshold=request.config.getoption('--n-plus-one-threshold'),
+                                mode='record', per_call=True)
+    detector.start()
+    try:
+        yield
+    finally:
+        detector.stop()
+    flagged = detector.violations()
+    if flagged:
+        request.config._n_plus_one_reports.append((request.node.nodeid, detector.format_report(flagged)))
+        if mode == 'raise':
+            pytest.fail(detector.format_report(flagged), pytrace=False)
+        warnings.warn(detector.format_report(flagged), NPlusOneWarning)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    reports = getattr(config, '_n_plus_one_reports', None)
+    if not reports:
+        return
+    terminalreporter.section(f"N+1查询 ({len(reports)} 个测试)")
+    for nodeid, report in reports:
+        terminalreporter.write_line(nodeid)
+        terminalreporter.write_line(report)
@@ -1,256 +1,248 @@
 """
 性能测试
 Performance Tests
+
+在临时数据库中的合成词典上检查主要操作的正确性和大致耗时上限；
+详细的耗时统计和版本对比使用 ``python -m benchmarks``。
 """
 
 import unittest
+import tempfile
+import shutil
 import time
 import psutil
 import os
-from unittest.mock import Mock, patch
+from pathlib import Path
 
-from tests.test_base import PerformanceTestCase, BaseTestCase
+from tests.test_base import PerformanceTestCase
+from benchmarks.generator import DictionaryGenerator
+from benchmarks.harness import BenchmarkCase, BenchmarkRunner, percentile, summarize
+from benchmarks import compare
+from benchmarks.history import BenchmarkHistory
+from services.database_service import db_service
 from services.dictionary_service import dictionary_service
 from services.search_service import search_service
 from services.import_service import import_service
 from services.export_service import export_service
 
 
-class TestDatabasePerformance(PerformanceTestCase):
+class SyntheticDictionaryTestCase(PerformanceTestCase):
+    """在临时数据库中生成合成词典的性能测试基础类"""
+
+    DATASET_SIZE = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.generator = DictionaryGenerator(seed=7)
+        cls.previous_database_path = db_service.database_path
+        db_service.database_path = cls.temp_dir / "performance.db"
+        cls.generator.populate(db_service, cls.DATASET_SIZE)
+
+    @classmethod
+    def tearDownClass(cls):
+        db_service.database_path = cls.previous_database_path
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def new_entries(self, prefix, count):
+        """生成不在数据集中的新词条"""
+        for data in self.generator.entries(self.DATASET_SIZE, count):
+            yield dict(data, word_id=prefix + data['word_id'])
+
+    def assertFound(self, results, index):
+        """结果中包含数据集的第 index 条词条"""
+        self.assertIn(self.generator.word_id(index), [entry.word_id for entry in results])
+
+
+class TestDatabasePerformance(SyntheticDictionaryTestCase):
     """数据库性能测试"""
-    
+
     def test_bulk_insert_performance(self):
         """测试批量插入性能"""
-        # 测试大量数据插入
         start_time = time.time()
-        
-        for i in range(1000):
-            word_data = {
-                'word_id': f'perf{i:04d}',
-                'latin_form': f'performance test {i}',
-                'phonetic': f'phonetic {i}',
-                'word_type': 'noun',
-                'definitions': [f'definition {i}'],
-                'examples': [{'text': f'example {i}', 'translation': f'translation {i}'}],
-                'notes': f'notes {i}'
-            }
-            dictionary_service.add_word_entry(word_data)
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        # 1000条记录应该在5秒内完成
+        added = [dictionary_service.add_word_entry(data) for data in self.new_entries('bulk', 300)]
+        execution_time = time.time() - start_time
+
+        self.assertTrue(all(added))
+        self.assertEqual(dictionary_service.get_word_count(), self.DATASET_SIZE + 300)
+        # 300条记录应该在5秒内完成
         self.assertLess(execution_time, 5.0)
-        print(f"Bulk insert 1000 records: {execution_time:.4f} seconds")
-    
+        print(f"Bulk insert 300 records: {execution_time:.4f} seconds")
+
     def test_search_performance(self):
         """测试搜索性能"""
-        # 创建测试数据
-        for i in range(500):
-            word_data = {
-                'word_id': f'search{i:04d}',
-                'latin_form': f'search test {i}',
-                'definitions': [f'search definition {i}']
-            }
-            dictionary_service.add_word_entry(word_data)
-        
+        entry = self.generator.entry(250)
+
         # 测试精确搜索性能
         start_time = time.time()
-        results = search_service.search_by_latin_form('search test 250')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_words(entry['latin_form'], 'latin_form')
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.1)  # 精确搜索应该在100ms内完成
-        self.assertEqual(len(results), 1)
+        self.assertFound(results, 250)
         print(f"Exact search time: {search_time:.4f} seconds")
-        
+
         # 测试模糊搜索性能
         start_time = time.time()
-        results = search_service.fuzzy_search('search')
-        end_time = time.time()
-        
-        fuzzy_time = end_time - start_time
+        results = search_service.search_words(entry['latin_form'][:3], 'latin_form', fuzzy=True)
+        fuzzy_time = time.time() - start_time
+
         self.assertLess(fuzzy_time, 0.5)  # 模糊搜索应该在500ms内完成
-        self.assertGreater(len(results), 0)
+        self.assertFound(results, 250)
         print(f"Fuzzy search time: {fuzzy_time:.4f} seconds")
-    
+
     def test_memory_usage(self):
         """测试内存使用"""
         process = psutil.Process(os.getpid())
         initial_memory = process.memory_info().rss
-        
-        # 创建大量数据
-        for i in range(1000):
-            word_data = {
-                'word_id': f'mem{i:04d}',
-                'latin_form': f'memory test {i}',
-                'definitions': [f'definition {i}']
-            }
-            dictionary_service.add_word_entry(word_data)
-        
+
+        for data in self.new_entries('mem', 300):
+            dictionary_service.add_word_entry(data)
+
         final_memory = process.memory_info().rss
         memory_increase = final_memory - initial_memory
-        
+
         # 内存增长应该在合理范围内（小于100MB）
         self.assertLess(memory_increase, 100 * 1024 * 1024)
         print(f"Memory increase: {memory_increase / 1024 / 1024:.2f} MB")
 
 
-class TestSearchPerformance(PerformanceTestCase):
+class TestSearchPerformance(SyntheticDictionaryTestCase):
     """搜索性能测试"""
-    
+
     def setUp(self):
         super().setUp()
-        # 创建测试数据
-        self.test_words = []
-        for i in range(1000):
-            word_data = {
-                'word_id': f'search{i:04d}',
-                'latin_form': f'search word {i}',
-                'phonetic': f'phonetic {i}',
-                'word_type': 'noun',
-                'definitions': [f'definition {i}', f'meaning {i}'],
-                'examples': [{'text': f'example {i}', 'translation': f'translation {i}'}],
-                'notes': f'notes {i}'
-            }
-            word_entry = dictionary_service.add_word_entry(word_data)
-            self.test_words.append(word_entry)
-    
+        self.entry = self.generator.entry(500)
+
     def test_latin_form_search_performance(self):
         """测试拉丁形式搜索性能"""
-        # 测试精确搜索
         start_time = time.time()
-        results = search_service.search_by_latin_form('search word 500')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_words(self.entry['latin_form'], 'latin_form')
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.1)
-        self.assertEqual(len(results), 1)
+        self.assertFound(results, 500)
         print(f"Latin form search time: {search_time:.4f} seconds")
-    
+
     def test_phonetic_search_performance(self):
         """测试音标搜索性能"""
         start_time = time.time()
-        results = search_service.search_by_phonetic('phonetic 500')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_words(self.entry['phonetic'], 'phonetic')
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.1)
-        self.assertEqual(len(results), 1)
+        self.assertFound(results, 500)
         print(f"Phonetic search time: {search_time:.4f} seconds")
-    
+
     def test_definition_search_performance(self):
         """测试释义搜索性能"""
         start_time = time.time()
-        results = search_service.search_by_definition('definition 500')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_words(self.entry['definitions'][0], 'definitions')
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.2)
-        self.assertEqual(len(results), 1)
+        self.assertFound(results, 500)
         print(f"Definition search time: {search_time:.4f} seconds")
-    
+
     def test_fuzzy_search_performance(self):
         """测试模糊搜索性能"""
         start_time = time.time()
-        results = search_service.fuzzy_search('search')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_words(self.entry['latin_form'][:3], 'all', fuzzy=True)
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.5)
         self.assertGreater(len(results), 0)
         print(f"Fuzzy search time: {search_time:.4f} seconds")
-    
+
     def test_regex_search_performance(self):
         """测试正则搜索性能"""
         start_time = time.time()
-        results = search_service.search_by_pattern(r'search word \d+')
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        results = search_service.search_by_pattern(r'^W00005\d\d$', ['word_id'])
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.3)
-        self.assertGreater(len(results), 0)
+        self.assertEqual(len(results), 100)
         print(f"Regex search time: {search_time:.4f} seconds")
-    
+
     def test_multi_field_search_performance(self):
         """测试多字段搜索性能"""
         start_time = time.time()
         results = search_service.multi_field_search(
-            'search', 
+            self.entry['latin_form'],
             ['latin_form', 'definitions']
         )
-        end_time = time.time()
-        
-        search_time = end_time - start_time
+        search_time = time.time() - start_time
+
         self.assertLess(search_time, 0.4)
-        self.assertGreater(len(results), 0)
+        self.assertFound(results, 500)
         print(f"Multi-field search time: {search_time:.4f} seconds")
 
 
-class TestImportExportPerformance(PerformanceTestCase):
+class TestImportExportPerformance(SyntheticDictionaryTestCase):
     """导入导出性能测试"""
-    
+
+    def setUp(self):
+        super().setUp()
+        self.previous_export_dir = export_service.export_dir
+        export_service.export_dir = self.temp_dir / "exports"
+        export_service.export_dir.mkdir(exist_ok=True)
+
+    def tearDown(self):
+        export_service.export_dir = self.previous_export_dir
+        super().tearDown()
+
     def test_export_performance(self):
         """测试导出性能"""
-        # 创建测试数据
-        for i in range(500):
-            word_data = {
-                'word_id': f'export{i:04d}',
-                'latin_form': f'export test {i}',
-                'phonetic': f'phonetic {i}',
-                'word_type': 'noun',
-                'definitions': [f'definition {i}'],
-                'examples': [{'text': f'example {i}', 'translation': f'translation {i}'}],
-                'notes': f'notes {i}'
-            }
-            dictionary_service.add_word_entry(word_data)
-        
-        # 测试Excel导出性能
-        start_time = time.time()
-        with patch.object(export_service, 'export_to_excel') as mock_export:
-            mock_export.return_value = {'success': True, 'file_path': 'test.xlsx'}
-            result = export_service.export_to_excel()
-        end_time = time.time()
-        
-        export_time = end_time - start_time
-        self.assertLess(export_time, 2.0)  # 导出应该在2秒内完成
-        print(f"Excel export time: {export_time:.4f} seconds")
-        
-        # 测试PDF导出性能
-        start_time = time.time()
-        with patch.object(export_service, 'export_to_pdf') as mock_export:
-            mock_export.return_value = 'test.pdf'
-            result = export_service.export_to_pdf()
-        end_time = time.time()
-        
-        export_time = end_time - start_time
-        self.assertLess(export_time, 3.0)  # PDF导出应该在3秒内完成
-        print(f"PDF export time: {export_time:.4f} seconds")
-    
+        with db_service.get_session() as session:
+            from sqlalchemy.orm import selectinload
+            from models import WordEntry
+
+            entries = session.query(WordEntry).options(
+                selectinload(WordEntry.definitions),
+                selectinload(WordEntry.examples)
+            ).order_by(WordEntry.word_id).limit(500).all()
+
+            # 测试Excel导出性能
+            start_time = time.time()
+            filepath = export_service.export_to_excel(entries, "performance.xlsx")
+            export_time = time.time() - start_time
+
+            self.assertTrue(Path(filepath).exists())
+            self.assertLess(export_time, 2.0)  # 导出应该在2秒内完成
+            print(f"Excel export time: {export_time:.4f} seconds")
+
+            # 测试字典格式导出性能
+            start_time = time.time()
+            filepath = export_service.export_to_dict_format(entries, "performance.txt")
+            export_time = time.time() - start_time
+
+            self.assertTrue(Path(filepath).exists())
+            self.assertLess(export_time, 1.0)
+            print(f"Dict format export time: {export_time:.4f} seconds")
+
     def test_import_performance(self):
         """测试导入性能"""
-        # 模拟大量数据导入
+        csv_path = self.generator.write_csv(self.temp_dir / "import.csv", 0, 200, prefix='imp')
+
         start_time = time.time()
-        with patch.object(import_service, 'import_from_excel') as mock_import:
-            mock_import.return_value = {'success': 1000, 'failed': 0}
-            result = import_service.import_from_excel('test.xlsx')
-        end_time = time.time()
-        
-        import_time = end_time - start_time
+        result = import_service.import_from_csv(str(csv_path))
+        import_time = time.time() - start_time
+
         self.assertLess(import_time, 5.0)  # 导入应该在5秒内完成
-        self.assertEqual(result['success'], 1000)
-        print(f"Excel import time: {import_time:.4f} seconds")
+        self.assertEqual(result['success'], 200)
+        self.assertEqual(result['failed'], 0)
+        print(f"CSV import time: {import_time:.4f} seconds")
 
 
 class TestUIComponentPerformance(PerformanceTestCase):
     """UI组件性能测试"""
-    
+
     def test_component_creation_performance(self):
         """测试组件创建性能"""
         from views.components.ink_card import InkCard
         from views.components.ink_button import InkButton
         from views.components.ink_input import InkTextField
-        
+
         # 测试卡片创建性能
         start_time = time.time()
         for i in range(100):
@@ -259,151 +251,221 @@ class TestUIComponentPerformance(PerformanceTestCase):
                 content=f"Test content {i}"
             )
         end_time = time.time()
-        
+
         creation_time = end_time - start_time
         self.assertLess(creation_time, 1.0)  # 100个卡片应该在1秒内创建
         print(f"Card creation time (100 cards): {creation_time:.4f} seconds")
-        
+
         # 测试按钮创建性能
         start_time = time.time()
         for i in range(100):
             button = InkButton(text=f"Button {i}")
         end_time = time.time()
-        
+
         creation_time = end_time - start_time
         self.assertLess(creation_time, 0.5)  # 100个按钮应该在0.5秒内创建
         print(f"Button creation time (100 buttons): {creation_time:.4f} seconds")
-        
+
         # 测试输入框创建性能
         start_time = time.time()
         for i in range(100):
             text_field = InkTextField(hint_text=f"Input {i}")
         end_time = time.time()
-        
+
         creation_time = end_time - start_time
         self.assertLess(creation_time, 0.5)  # 100个输入框应该在0.5秒内创建
         print(f"Input creation time (100 inputs): {creation_time:.4f} seconds")
-    
+
     def test_theme_application_performance(self):
         """测试主题应用性能"""
         from utils.ink_theme import ink_theme
-        
+
         # 测试颜色获取性能
         start_time = time.time()
         for i in range(1000):
             color = ink_theme.get_color('ink_black')
         end_time = time.time()
-        
+
         color_time = end_time - start_time
         self.assertLess(color_time, 0.1)  # 1000次颜色获取应该在100ms内完成
         print(f"Color retrieval time (1000 times): {color_time:.4f} seconds")
-        
+
         # 测试样式获取性能
         start_time = time.time()
         for i in range(1000):
             style = ink_theme.get_ink_style()
         end_time = time.time()
-        
+
         style_time = end_time - start_time
         self.assertLess(style_time, 0.2)  # 1000次样式获取应该在200ms内完成
         print(f"Style retrieval time (1000 times): {style_time:.4f} seconds")
 
 
-class TestConcurrentPerformance(PerformanceTestCase):
+class TestConcurrentPerformance(SyntheticDictionaryTestCase):
     """并发性能测试"""
-    
+
     def test_concurrent_search(self):
         """测试并发搜索"""
         import threading
         import queue
-        
-        # 创建测试数据
-        for i in range(1000):
-            word_data = {
-                'word_id': f'concurrent{i:04d}',
-                'latin_form': f'concurrent test {i}',
-                'definitions': [f'definition {i}']
-            }
-            dictionary_service.add_word_entry(word_data)
-        
+
         results_queue = queue.Queue()
-        
-        def search_worker(search_term):
-            results = search_service.search_by_latin_form(search_term)
-            results_queue.put(len(results))
-        
+
+        def search_worker(index):
+            results = search_service.search_words(self.generator.entry(index)['latin_form'], 'latin_form')
+            results_queue.put(self.generator.word_id(index) in [entry.word_id for entry in results])
+
         # 启动多个搜索线程
         threads = []
         start_time = time.time()
-        
+
         for i in range(10):
-            thread = threading.Thread(
-                target=search_worker, 
-                args=(f'concurrent test {i * 100}',)
-            )
+            thread = threading.Thread(target=search_worker, args=(i * 100,))
             threads.append(thread)
             thread.start()
-        
+
         # 等待所有线程完成
         for thread in threads:
             thread.join()
-        
-        end_time = time.time()
-        concurrent_time = end_time - start_time
-        
-        # 验证所有搜索都完成了
-        total_results = 0
-        while not results_queue.empty():
-            total_results += results_queue.get()
-        
-        self.assertEqual(total_results, 10)  # 应该有10个搜索结果
+
+        concurrent_time = time.time() - start_time
+
+        # 验证所有搜索都找到了目标词条
+        found = [results_queue.get() for _ in range(results_queue.qsize())]
+        self.assertEqual(found, [True] * 10)
         self.assertLess(concurrent_time, 2.0)  # 并发搜索应该在2秒内完成
         print(f"Concurrent search time (10 threads): {concurrent_time:.4f} seconds")
 
 
-class TestMemoryLeakPerformance(PerformanceTestCase):
+class TestMemoryLeakPerformance(SyntheticDictionaryTestCase):
     """内存泄漏性能测试"""
-    
+
     def test_memory_leak_detection(self):
         """测试内存泄漏检测"""
         import gc
-        
+
         process = psutil.Process(os.getpid())
         initial_memory = process.memory_info().rss
-        
-        # 创建和销毁大量对象
+
+        # 反复创建和删除词条
         for cycle in range(10):
-            # 创建大量词条
-            for i in range(100):
-                word_data = {
-                    'word_id': f'leak{cycle}{i:04d}',
-                    'latin_form': f'leak test {cycle} {i}',
-                    'definitions': [f'definition {i}']
-                }
-                word_entry = dictionary_service.add_word_entry(word_data)
-            
-            # 删除所有词条
-            all_entries = dictionary_service.get_all_word_entries()
-            for entry in all_entries:
-                dictionary_service.delete_word_entry(entry.id)
-            
+            word_ids = []
+            for data in self.new_entries(f'leak{cycle}', 50):
+                dictionary_service.add_word_entry(data)
+                word_ids.append(data['word_id'])
+
+            for word_id in word_ids:
+                self.assertTrue(dictionary_service.delete_word_entry(word_id))
+
             # 强制垃圾回收
             gc.collect()
-        
+
         final_memory = process.memory_info().rss
         memory_increase = final_memory - initial_memory
-        
+
+        self.assertEqual(dictionary_service.get_word_count(), self.DATASET_SIZE)
         # 内存增长应该很小（小于10MB）
         self.assertLess(memory_increase, 10 * 1024 * 1024)
         print(f"Memory leak test - increase: {memory_increase / 1024 / 1024:.2f} MB")
 
 
-if __name__ == '__main__':
-    unittest.main()
+class TestBenchmarkHarness(unittest.TestCase):
+    """基准工具测试"""
+
+    def test_generator_is_deterministic(self):
+        """测试相同种子生成相同词条"""
+        first, second = DictionaryGenerator(seed=3), DictionaryGenerator(seed=3)
+        self.assertEqual(list(first.entries(10, 20)), list(second.entries(10, 20)))
+        self.assertEqual(first.entry(15), second.entry(15))
+        self.assertNotEqual(first.entry(15), DictionaryGenerator(seed=4).entry(15))
 
+        entry = first.entry(15)
+        self.assertTrue(entry['phonetic'].startswith('/'))
+        self.assertGreaterEqual(len(entry['definitions']), 1)
 
+    def test_summary_statistics(self):
+        """测试百分位数和统计摘要"""
+        samples = [float(value) for value in range(1, 101)]
+        self.assertAlmostEqual(percentile(samples, 50), 50.5)
+        self.assertAlmostEqual(percentile(samples, 99), 99.01)
 
+        stats = summarize(samples)
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['min'], 1.0)
+        self.assertEqual(stats['max'], 100.0)
+        self.assertAlmostEqual(stats['median'], 50.5)
 
+    def test_runner_respects_time_budget(self):
+        """测试运行器在超出时间预算后停止"""
+        calls = []
+        case = BenchmarkCase(run=lambda arg: (calls.append(arg), time.sleep(0.01)),
+                             prepare=lambda iteration: iteration)
+        result = BenchmarkRunner(repeat=100, warmup=1, min_samples=3, time_budget=0.0).run_case(case)
 
+        self.assertEqual(result['stats']['count'], 3)
+        self.assertEqual(calls, [0, 1, 2, 3, 4])  # 预热 + 3次计时 + 内存统计
+        self.assertIsNotNone(result['peak_memory_kb'])
 
 
+
+class TestBenchmarkComparison(unittest.TestCase):
+    """基准比较和历史测试"""
+
+    @staticmethod
+    def make_document(samples, created_at='2026-01-01T00:00:00', size=1000):
+        import random
+
+        rng = random.Random(len(samples))
+        results = {}
+        for name, center in samples.items():
+            values = [center * (1 + rng.uniform(-0.03, 0.03)) for _ in range(20)]
+            results[name] = {'samples': values, 'stats': summarize(values), 'peak_memory_kb': 1.0}
+        return {
+            'schema': 1,
+            'meta': {'created_at': created_at, 'git_commit': 'abc1234', 'app_version': '1.0.0',
+                     'dataset': {'size': size, 'seed': 42, 'images': False, 'generator_version': 1}},
+            'results': results,
+        }
+
+    def test_detects_regression(self):
+        """测试识别显著变慢、变快和无变化"""
+        baseline = self.make_document({'search.all': 10.0, 'listing.first_page': 2.0, 'backup.copy': 5.0})
+        current = self.make_document({'search.all': 13.0, 'listing.first_page': 1.0, 'backup.copy': 5.0})
+
+        statuses = {item['name']: item['status'] for item in compare.compare_results(baseline, current)}
+        self.assertEqual(statuses['search.all'], compare.REGRESSION)
+        self.assertEqual(statuses['listing.first_page'], compare.IMPROVEMENT)
+        self.assertEqual(statuses['backup.copy'], compare.UNCHANGED)
+        self.assertTrue(compare.has_regression(compare.compare_results(baseline, current)))
+
+        ratio, low, high = compare.bootstrap_median_ratio([10.0] * 5, [13.0] * 5)
+        self.assertAlmostEqual(ratio, 1.3)
+        self.assertLessEqual(low, ratio)
+        self.assertGreaterEqual(high, ratio)
+
+    def test_dataset_mismatch(self):
+        """测试数据集不同的结果不可比较"""
+        baseline = self.make_document({'search.all': 10.0}, size=1000)
+        current = self.make_document({'search.all': 10.0}, size=10000)
+        self.assertEqual(len(compare.dataset_mismatch(baseline, current)), 1)
+
+    def test_history_series(self):
+        """测试历史记录按时间返回"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            with BenchmarkHistory(temp_dir / "history.db") as history:
+                self.assertIsNotNone(history.add(self.make_document({'search.all': 10.0}, '2026-01-01T00:00:00')))
+                self.assertIsNotNone(history.add(self.make_document({'search.all': 12.0}, '2026-01-02T00:00:00')))
+                # 同一次运行不重复记录
+                self.assertIsNone(history.add(self.make_document({'search.all': 12.0}, '2026-01-02T00:00:00')))
+
+                series = history.series('search.all', size=1000)
+                self.assertEqual([row['created_at'][:10] for row in series], ['2026-01-01', '2026-01-02'])
+                self.assertLess(series[0]['median'], series[1]['median'])
+                self.assertEqual(history.benchmarks(), ['search.all'])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,80 @@ Service Tests
 """
 
 import unittest
+import logging
+from unittest.mock import patch
 import tempfile
 import os
+import shutil
+import time
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from services.dictionary_service import DictionaryService
+from kivy.clock import Clock
+
+from services.dictionary_service import DictionaryService, dictionary_service
 from services.search_service import SearchService
+from services.search_executor import SearchExecutor
+from services.search_history_service import SearchHistoryService
 from utils.validators import Validators
+from utils.text_normalizer import fold_text, normalize_search_key, normalize_phonetic_key
+from utils.phonetic import soundex, metaphone, ipa_feature_key, edit_distance
+from services.registry import ServiceRegistry
+from services.warm_start_service import WarmStartService
+from services.database_service import DatabaseService, db_service
+from services.memo_service import memo_service
+from services.bookmark_service import bookmark_service
+from utils.url_normalizer import normalize_url
+from utils.ttl_cache import TTLCache
+from utils.stroke_codec import simplify_stroke, pack_symbols, unpack_symbols, PACKED_PREFIX
+from services.ids_render_service import IdsRenderService, render_symbols
+from services.ids_service import ids_service
+from app import config as config_module
+from app.config import Config
+from utils.logger import RateLimitFilter, SizedTimedRotatingFileHandler, parse_size
+from utils.metrics import RollingHistogram
+from services.instrumentation_service import InstrumentationService
+from services.slow_query_service import SlowQueryService, find_full_scans
+from utils.query_detector import NPlusOneDetector, NPlusOneError, normalize_statement
+from services.profiler_service import ProfilerService
+from services.frame_monitor_service import FrameMonitorService
+from services.import_service import ImportService
+from utils.ids_parser import IdsParseError, parse_ids, to_ids, iter_components
+from models import Bookmark, MemoWord, IdsSymbol, IdsComponent, WordEntry, Definition
+
+
+# 通过模块级 ``db_service`` 访问数据库的服务模块
+DB_SERVICE_MODULES = (
+    'services.database_service', 'services.dictionary_service', 'services.search_service',
+    'services.search_history_service', 'services.bookmark_service', 'services.memo_service',
+    'services.ids_service', 'services.export_service', 'services.utility_service',
+)
+
+
+def use_temp_database(testcase: unittest.TestCase, temp_dir: str) -> DatabaseService:
+    """在临时目录中创建数据库，测试期间各服务模块的 ``db_service`` 指向它"""
+    db = DatabaseService(os.path.join(temp_dir, 'test.db'))
+    testcase.addCleanup(db.close)
+    for module in DB_SERVICE_MODULES:
+        patcher = patch(f'{module}.db_service', db)
+        patcher.start()
+        testcase.addCleanup(patcher.stop)
+    return db
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """使用临时数据库的测试基类
+    
+    各服务模块的 ``db_service`` 在测试期间指向 ``self.db``，测试不读写用户的词典数据。
+    """
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.db = use_temp_database(self, self.temp_dir)
 
 
 class TestDictionaryService(unittest.TestCase):
@@ -61,6 +128,1240 @@ class TestSearchService(unittest.TestCase):
         pass
 
 
+class TestStreamingSearch(TempDatabaseTestCase):
+    """流式搜索测试"""
+    
+    WORDS = [
+        ('STRM001', 'zorvak', []),
+        ('STRM002', 'zorvakus', []),
+        ('STRM003', 'prezorvak', []),
+        ('STRM004', 'qelith', ['zorvak meaning']),
+    ]
+    
+    def setUp(self):
+        """创建测试词条"""
+        super().setUp()
+        for word_id, latin_form, definitions in self.WORDS:
+            dictionary_service.add_word_entry({
+                'word_id': word_id,
+                'latin_form': latin_form,
+                'definitions': definitions
+            })
+    
+    def _search(self, **params):
+        search_params = {
+            'query': 'zorvak',
+            'search_mode': 'fuzzy',
+            'search_fields': ['word_id', 'latin_form', 'definitions']
+        }
+        limit = params.pop('limit', 100)
+        search_params.update(params)
+        return list(SearchService().iter_advanced_search(search_params, limit=limit))
+    
+    def test_ranked_batches(self):
+        """测试按排名分批产出"""
+        batches = self._search()
+        word_ids = [[entry.word_id for entry in batch] for batch in batches]
+        self.assertEqual(word_ids, [['STRM001'], ['STRM002'], ['STRM003'], ['STRM004']])
+    
+    def test_limit_terminates_early(self):
+        """测试结果数量上限"""
+        batches = self._search(limit=2)
+        self.assertEqual(sum(len(batch) for batch in batches), 2)
+    
+    def test_regex_stream(self):
+        """测试正则流式搜索"""
+        batches = self._search(query='^zorvak', search_mode='regex')
+        word_ids = {entry.word_id for batch in batches for entry in batch}
+        self.assertEqual(word_ids, {'STRM001', 'STRM002', 'STRM004'})
+
+
+class TestNormalizedSearch(TempDatabaseTestCase):
+    """规范化搜索键测试"""
+    
+    def setUp(self):
+        """创建测试词条"""
+        super().setUp()
+        dictionary_service.add_word_entry({
+            'word_id': 'NORM001',
+            'latin_form': 'Ñórdvíkø',
+            'phonetic': "[ˈnɔːrdvɪkə]",
+            'definitions': ['Crème brûlée']
+        })
+    
+    def test_normalize_keys(self):
+        """测试搜索键生成"""
+        self.assertEqual(fold_text('  Crème   Brûlée '), 'creme brulee')
+        self.assertEqual(normalize_search_key('Ñórdvíkø'), 'nordviko')
+        self.assertEqual(normalize_phonetic_key("[ˈnɔːrdvɪkə]"), 'nordvike')
+        self.assertEqual(fold_text(None), '')
+    
+    def test_accent_insensitive_search(self):
+        """测试不区分变音符号的搜索"""
+        service = SearchService()
+        results = service.search_words('nordvik', search_type='latin_form')
+        self.assertIn('NORM001', [entry.word_id for entry in results])
+        
+        results = service.search_words('nordvike', search_type='phonetic')
+        self.assertIn('NORM001', [entry.word_id for entry in results])
+        
+        results = service.multi_field_search('creme brulee', ['definitions'])
+        self.assertIn('NORM001', [entry.word_id for entry in results])
+    
+    def test_case_sensitive_uses_raw_text(self):
+        """测试区分大小写时使用原始文本"""
+        service = SearchService()
+        results = service.multi_field_search('Ñórdvíkø', ['latin_form'], case_sensitive=True)
+        self.assertEqual([entry.word_id for entry in results], ['NORM001'])
+        results = service.multi_field_search('nordviko', ['latin_form'], case_sensitive=True)
+        self.assertEqual(results, [])
+
+
+class TestSoundAlikeSearch(TempDatabaseTestCase):
+    """近音搜索测试"""
+    
+    def setUp(self):
+        """创建测试词条"""
+        super().setUp()
+        for word_id, latin_form, phonetic in [
+            ('SND001', 'Thorvaldine', '/ˈθɔːrvaldiːn/'),
+            ('SND002', 'Torvaldyne', '/ˈtɔrvaldɪn/'),
+            ('SND003', 'Quimbrelox', '/ˈkwɪmbrəlɒks/'),
+        ]:
+            dictionary_service.add_word_entry({
+                'word_id': word_id,
+                'latin_form': latin_form,
+                'phonetic': phonetic,
+                'definitions': ['近音测试']
+            })
+    
+    def test_phonetic_keys(self):
+        """测试语音键生成"""
+        self.assertEqual(soundex('Robert'), soundex('Rupert'))
+        self.assertEqual(soundex('Robert'), 'R163')
+        self.assertEqual(metaphone('knight'), metaphone('nite'))
+        self.assertEqual(ipa_feature_key('/ʃip/'), ipa_feature_key('ship'))
+        self.assertEqual(edit_distance('kitten', 'sitting'), 3)
+    
+    def test_sound_alike_latin(self):
+        """测试按拉丁写法的近音搜索"""
+        service = SearchService()
+        results = service.search_sound_alike('torvaldeen', ['latin_form'])
+        word_ids = [entry.word_id for entry in results]
+        self.assertIn('SND001', word_ids)
+        self.assertIn('SND002', word_ids)
+        self.assertNotIn('SND003', word_ids)
+    
+    def test_sound_alike_phonetic_ranking(self):
+        """测试按音标的近音搜索排序"""
+        service = SearchService()
+        results = service.search_sound_alike('tɔrvaldin', ['phonetic'])
+        self.assertEqual(results[0].word_id, 'SND002')
+        
+        results = service.advanced_search({'query': 'kwimbrelocks', 'search_mode': 'sound'})
+        self.assertEqual(results[0].word_id, 'SND003')
+
+
+class TestServiceRegistry(unittest.TestCase):
+    """服务注册表测试"""
+    
+    def test_lazy_construction(self):
+        """测试首次使用时才构造服务"""
+        created = []
+        
+        class DummyService:
+            def __init__(self):
+                created.append(self)
+                self.value = 1
+            
+            def ping(self):
+                return 'pong'
+        
+        registry = ServiceRegistry()
+        service = registry.register('dummy', DummyService)
+        self.assertFalse(service.is_loaded)
+        self.assertEqual(created, [])
+        
+        self.assertEqual(service.ping(), 'pong')
+        self.assertTrue(registry.is_loaded('dummy'))
+        self.assertEqual(registry.loaded_services(), ['dummy'])
+        
+        service.value = 2
+        self.assertIs(registry.get('dummy'), created[0])
+        self.assertEqual(created[0].value, 2)
+        self.assertEqual(len(created), 1)
+    
+    def test_patch_object(self):
+        """测试代理支持 patch.object"""
+        registry = ServiceRegistry()
+        service = registry.register('dummy', lambda: type('Dummy', (), {'ping': lambda self: 'pong'})())
+        with patch.object(service, 'ping', return_value='mocked'):
+            self.assertEqual(service.ping(), 'mocked')
+        self.assertEqual(service.ping(), 'pong')
+
+
+class TestWarmStartService(TempDatabaseTestCase):
+    """启动快照服务测试"""
+    
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.temp_dir, 'warm_start.json')
+    
+    def test_save_and_load(self):
+        """测试快照保存后可在不访问数据库的情况下读取"""
+        for i in range(7):
+            dictionary_service.add_word_entry({'word_id': f'WARM10{i}', 'latin_form': f'warmus{i}'})
+        service = WarmStartService(self.path, page_size=5)
+        self.assertEqual(service.get_home_stats(), {})
+        self.assertIsNone(service.get_first_page())
+        self.assertTrue(service.save())
+        
+        reloaded = WarmStartService(self.path, page_size=5)
+        home = reloaded.get_home_stats()
+        self.assertEqual(home['total_entries'], dictionary_service.get_word_count())
+        
+        page = reloaded.get_first_page('word_id', 'asc')
+        self.assertEqual(len(page), 5)
+        expected = [entry.word_id for entry in dictionary_service.get_all_word_entries(limit=5)]
+        self.assertEqual([entry.word_id for entry in page], expected)
+        self.assertIsNone(reloaded.get_first_page('latin_form', 'asc'))
+    
+    def test_reconcile(self):
+        """测试后台校正会更新过期快照"""
+        service = WarmStartService(self.path)
+        service.save()
+        total = service.get_home_stats()['total_entries']
+        
+        dictionary_service.add_word_entry({
+            'word_id': 'WARM001',
+            'latin_form': 'warmus',
+            'definitions': ['快照测试']
+        })
+        service.reconcile().join(timeout=10)
+        
+        reloaded = WarmStartService(self.path)
+        self.assertEqual(reloaded.get_home_stats()['total_entries'], total + 1)
+
+
+class TestStatsTriggers(TempDatabaseTestCase):
+    """统计触发器测试"""
+    
+    def assertStatsMatchRebuild(self):
+        """触发器维护的统计应与重新计算的结果一致"""
+        maintained = dict(self.db.execute_raw_sql("SELECT key, value FROM stats WHERE value <> 0"))
+        self.db.rebuild_stats()
+        rebuilt = dict(self.db.execute_raw_sql("SELECT key, value FROM stats WHERE value <> 0"))
+        self.assertEqual(maintained, rebuilt)
+    
+    def test_word_counts(self):
+        """测试词条增删和收藏更新统计"""
+        total = dictionary_service.get_word_count()
+        favorites = self.db.get_stat('word_entries.favorites')
+        
+        dictionary_service.add_word_entry({'word_id': 'STAT001', 'latin_form': 'statum'})
+        self.assertEqual(dictionary_service.get_word_count(), total + 1)
+        dictionary_service.toggle_favorite('STAT001')
+        self.assertEqual(self.db.get_stat('word_entries.favorites'), favorites + 1)
+        self.assertStatsMatchRebuild()
+        
+        dictionary_service.delete_word_entry('STAT001')
+        self.assertEqual(dictionary_service.get_word_count(), total)
+        self.assertEqual(self.db.get_stat('word_entries.favorites'), favorites)
+    
+    def test_grouped_counts(self):
+        """测试书签分类和备忘状态、优先级统计"""
+        with self.db.get_session() as session:
+            bookmark = Bookmark(title='STAT_BOOKMARK', url='http://example.com', category='统计测试')
+            memo = MemoWord(content='STAT_MEMO', priority=5, is_completed=False)
+            session.add_all([bookmark, memo])
+            session.commit()
+            
+            self.assertEqual(self.db.get_stat_group('bookmarks.category:').get('统计测试'), 1)
+            pending = self.db.get_stat('memo_words.pending')
+            
+            bookmark.category = '统计测试2'
+            memo.is_completed = True
+            memo.priority = 1
+            session.commit()
+            self.assertStatsMatchRebuild()
+            
+            categories = self.db.get_stat_group('bookmarks.category:')
+            self.assertNotIn('统计测试', categories)
+            self.assertEqual(categories.get('统计测试2'), 1)
+            self.assertEqual(self.db.get_stat('memo_words.pending'), pending - 1)
+
+
+class TestMemoQueries(unittest.TestCase):
+    """备忘查询测试（使用临时数据库，清理操作不影响用户数据）"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseService(os.path.join(self.temp_dir, 'memo.db'))
+        patcher = patch('services.memo_service.db_service', self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        old = datetime.now() - timedelta(days=60)
+        with self.db.get_session() as session:
+            session.add_all([
+                MemoWord(content='MEMOQ 复习 Latin declension', priority=5, is_completed=False),
+                MemoWord(content='MEMOQ 背诵例句', priority=1, is_completed=False),
+                MemoWord(content='MEMOQ finished long ago', priority=3, is_completed=True, completed_at=old),
+                MemoWord(content='MEMOQ finished today', priority=2, is_completed=True,
+                         completed_at=datetime.now()),
+            ])
+            session.commit()
+    
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_search_and_filter(self):
+        """测试全文搜索、短查询和状态筛选"""
+        self.assertEqual(len(memo_service.search_memo_words('latin DECLENSION')), 1)
+        self.assertEqual(len(memo_service.search_memo_words('例句')), 1)
+        
+        pending = memo_service.query_memo_words(is_completed=False, query='MEMOQ')
+        self.assertEqual([memo.priority for memo in pending], [5, 1])
+        self.assertEqual(len(memo_service.query_memo_words(is_completed=True, query='MEMOQ')), 2)
+    
+    def test_cleanup_old_memos(self):
+        """测试批量清理旧的已完成备忘"""
+        self.assertEqual(memo_service.cleanup_old_memos(days=30), 1)
+        completed = memo_service.query_memo_words(is_completed=True, query='MEMOQ')
+        self.assertEqual([memo.content for memo in completed], ['MEMOQ finished today'])
+        self.assertEqual(memo_service.get_memo_stats()['completed_count'], 1)
+
+
+class TestDatabaseRepository(unittest.TestCase):
+    """通用数据访问方法测试"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseService(os.path.join(self.temp_dir, 'repo.db'))
+    
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_crud(self):
+        """测试单个对象的增删改查"""
+        bookmark = self.db.add_object(Bookmark(title='Repo', url='http://a.example', category='A'))
+        self.assertIsNotNone(bookmark.id)
+        
+        bookmark.title = 'Repo 2'
+        self.db.update_object(bookmark)
+        self.assertEqual(self.db.get_object_by_id(Bookmark, bookmark.id).title, 'Repo 2')
+        
+        self.assertTrue(self.db.delete_object(bookmark))
+        self.assertIsNone(self.db.get_object_by_id(Bookmark, bookmark.id))
+        self.assertEqual(self.db.get_stat('bookmarks.total'), 0)
+    
+    def test_bulk_operations(self):
+        """测试批量添加、过滤、批量更新和删除"""
+        self.db.add_objects([
+            Bookmark(title=f'B{i}', url=f'http://{i}.example', category='AB'[i % 2])
+            for i in range(10)
+        ])
+        self.assertEqual(len(self.db.get_all_objects(Bookmark)), 10)
+        self.assertEqual(len(self.db.get_objects_by_filter(Bookmark, {'category__in': ['A']})), 5)
+        self.assertEqual(
+            [b.title for b in self.db.get_objects_by_filter(Bookmark, {'title__startswith': 'B1'})],
+            ['B1']
+        )
+        
+        self.assertEqual(self.db.bulk_update(Bookmark, {'category': 'A'}, {'category': 'C'}), 5)
+        self.assertEqual(self.db.get_stat_group('bookmarks.category:'), {'B': 5, 'C': 5})
+        self.assertEqual(sum(1 for _ in self.db.iter_objects(Bookmark, chunk_size=3)), 10)
+        
+        self.assertEqual(self.db.delete_where(Bookmark, {'id__lte': 3}), 3)
+        self.assertEqual(self.db.count_objects(Bookmark), 7)
+        
+        self.db.clear_all_data()
+        self.assertEqual(self.db.get_stat('bookmarks.total'), 0)
+        with self.assertRaises(ValueError):
+            self.db.get_objects_by_filter(Bookmark, {'title__regex': 'x'})
+
+    def test_restore_legacy_backup(self):
+        """测试恢复旧版本（无搜索键列和统计表）的备份"""
+        import sqlite3
+        backup_path = os.path.join(self.temp_dir, 'legacy.db')
+        connection = sqlite3.connect(backup_path)
+        connection.executescript("""
+            CREATE TABLE word_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at DATETIME NOT NULL,
+                updated_at DATETIME NOT NULL,
+                word_id VARCHAR(50) NOT NULL UNIQUE,
+                latin_form VARCHAR(200) NOT NULL,
+                phonetic VARCHAR(200),
+                word_type VARCHAR(50),
+                is_favorite BOOLEAN,
+                sort_order INTEGER,
+                notes TEXT
+            );
+            INSERT INTO word_entries (created_at, updated_at, word_id, latin_form)
+            VALUES ('2024-01-01 00:00:00', '2024-01-01 00:00:00', 'Legacy-1', 'legacy');
+        """)
+        connection.commit()
+        connection.close()
+
+        self.assertTrue(self.db.restore_database(backup_path))
+        entries = self.db.get_objects_by_filter(WordEntry, {'word_id_key': normalize_search_key('Legacy-1')})
+        self.assertEqual([entry.latin_form for entry in entries], ['legacy'])
+        self.assertEqual(self.db.get_stat('word_entries.total'), 1)
+
+
+class TestBookmarkIndex(unittest.TestCase):
+    """书签索引测试（使用临时数据库）"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseService(os.path.join(self.temp_dir, 'bookmarks.db'))
+        patcher = patch('services.bookmark_service.db_service', self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_normalize_url(self):
+        """测试网址规范化"""
+        self.assertEqual(
+            normalize_url('HTTPS://www.Example.com:443/a/?utm_source=x&b=2&a=1#top'),
+            normalize_url('example.com/a?a=1&b=2')
+        )
+        self.assertNotEqual(normalize_url('example.com/a'), normalize_url('example.com/b'))
+        self.assertNotEqual(normalize_url('example.com:8080/'), normalize_url('example.com/'))
+    
+    def test_duplicate_detection(self):
+        """测试重复网址检测"""
+        first = bookmark_service.add_bookmark({'title': 'BMK one', 'url': 'https://bmk.example.org/page/'})
+        self.assertIsNotNone(first)
+        self.assertIsNone(bookmark_service.add_bookmark({'title': 'BMK two', 'url': 'http://www.bmk.example.org/page'}))
+        self.assertEqual(bookmark_service.find_duplicate('bmk.example.org/page#x').id, first.id)
+    
+    def test_search_and_facets(self):
+        """测试全文搜索和分类计数"""
+        bookmark_service.add_bookmark({'title': 'BMK Latin grammar', 'url': 'https://bmk1.example',
+                                       'category': 'BMK语言', 'description': '拉丁语语法'})
+        bookmark_service.add_bookmark({'title': 'BMK news', 'url': 'https://bmk2.example', 'category': 'BMK新闻'})
+        
+        self.assertEqual([b.title for b in bookmark_service.search_bookmarks('GRAMMAR')], ['BMK Latin grammar'])
+        self.assertEqual(len(bookmark_service.search_bookmarks('拉丁')), 1)
+        self.assertEqual(len(bookmark_service.query_bookmarks(category='BMK新闻')), 1)
+        
+        counts = bookmark_service.get_category_counts()
+        self.assertEqual((counts['BMK语言'], counts['BMK新闻']), (1, 1))
+        self.assertEqual(bookmark_service.get_category_counts('bmk2'), {'BMK新闻': 1})
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """本地测试页面"""
+    
+    requests_seen = []
+    
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        if self.path.startswith('/slow'):
+            time.sleep(0.2)
+        if self.path == '/gbk':
+            body = '<html><head><meta charset="gbk"><title>拉丁 词典</title></head></html>'.encode('gbk')
+            content_type = 'text/html'
+        elif self.path == '/text':
+            body = b'plain'
+            content_type = 'text/plain'
+        else:
+            body = (b'<html><head><!--' + b'x' * 3000 + b'--><title>Page &amp; '
+                    + self.path.encode() + b'</title></head><body>' + b'y' * 200000 + b'</body></html>')
+            content_type = 'text/html; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestUrlValidation(unittest.TestCase):
+    """URL批量验证测试（本地HTTP服务器）"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        from services.utility_service import UtilityService
+        self.service = UtilityService()
+        _PageHandler.requests_seen.clear()
+    
+    def test_title_and_cache(self):
+        """测试标题提取、编码识别和缓存"""
+        result = self.service.validate_url(f'{self.base}/page')
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['title'], 'Page & /page')
+        self.assertEqual(self.service.validate_url(f'{self.base}/gbk')['title'], '拉丁 词典')
+        self.assertEqual(self.service.validate_url(f'{self.base}/text')['title'], '')
+        
+        self.service.validate_url(f'{self.base}/page#top')
+        self.assertEqual(_PageHandler.requests_seen.count('/page'), 1)
+        self.assertFalse(self.service.validate_url('not a url')['valid'])
+    
+    def test_cache_keeps_scheme_and_host(self):
+        """测试协议或主机写法不同的网址分别验证"""
+        port = self.server.server_address[1]
+        http_url = f'{self.base}/page'
+        https_url = f'https://127.0.0.1:{port}/page'
+        localhost_url = f'http://localhost:{port}/page'
+        results = self.service.validate_urls([http_url, https_url, localhost_url, http_url + '#top'])
+        
+        self.assertTrue(results[http_url]['valid'])
+        self.assertFalse(results[https_url]['valid'])
+        self.assertTrue(results[localhost_url]['valid'])
+        self.assertIs(results[http_url + '#top'], results[http_url])
+        self.assertEqual(_PageHandler.requests_seen.count('/page'), 2)
+        self.assertFalse(self.service.validate_url(https_url)['valid'])
+    
+    def test_batch_validation(self):
+        """测试并发批量验证"""
+        urls = [f'{self.base}/slow{i}' for i in range(20)] + [f'{self.base}/slow0#top']
+        progress = []
+        start = time.perf_counter()
+        results = self.service.validate_urls(urls, max_workers=10,
+                                             progress_callback=lambda done, total: progress.append(done))
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(len(results), 21)
+        self.assertTrue(all(result['valid'] for result in results.values()))
+        self.assertEqual(results[f'{self.base}/slow0#top']['title'], 'Page & /slow0')
+        self.assertEqual(progress[-1], 20)
+        # 20个0.2秒的请求串行需要4秒
+        self.assertLess(elapsed, 2.0)
+    
+    def test_ttl_cache(self):
+        """测试缓存过期"""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=0)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertNotIn('b', cache)
+        cache.set('c', 3)
+        cache.set('d', 4)
+        self.assertNotIn('a', cache)
+
+
+class TestStrokeCodec(unittest.TestCase):
+    """笔画简化与打包测试"""
+    
+    def test_simplify_stroke(self):
+        """测试RDP简化保留拐点"""
+        points = [float(i) for x in range(11) for i in (x, 0)] + [10.0, 5.0, 10.0, 10.0]
+        self.assertEqual(list(simplify_stroke(points, 0.5)), [0, 0, 10, 0, 10, 10])
+        self.assertEqual(len(simplify_stroke(points, 0)), len(points))
+    
+    def test_pack_round_trip(self):
+        """测试二进制打包与旧JSON格式兼容"""
+        symbols = [
+            {'type': 'line', 'points': [0.5, 1.5, 2.5, 3.5]},
+            {'type': 'rectangle', 'pos': [50, 50], 'size': [100, 80]},
+            {'type': 'circle', 'pos': [1, 2], 'size': [3, 4]},
+        ]
+        packed = pack_symbols(symbols)
+        self.assertTrue(packed.startswith(PACKED_PREFIX))
+        unpacked = unpack_symbols(packed)
+        self.assertEqual(list(unpacked[0]['points']), [0.5, 1.5, 2.5, 3.5])
+        self.assertEqual(unpacked[1], symbols[1])
+        
+        legacy = unpack_symbols(json.dumps(symbols))
+        self.assertEqual(list(legacy[0]['points']), [0.5, 1.5, 2.5, 3.5])
+        self.assertEqual(unpack_symbols(pack_symbols([{'type': 'text', 'value': 'x'}])),
+                         [{'type': 'text', 'value': 'x'}])
+
+
+class TestIdsRender(unittest.TestCase):
+    """IDS符号渲染测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = IdsRenderService(cache_dir=os.path.join(self.temp_dir, 'cache'), supersample=4)
+        self.symbols = []
+        for index in range(3):
+            symbol = IdsSymbol(name=f'render{index}', canvas_size='[400, 400]')
+            symbol.id = index + 1
+            symbol.updated_at = datetime(2024, 1, 1)
+            symbol.set_symbols([
+                {'type': 'line', 'points': [0, 0, 400, 400]},
+                {'type': 'rectangle', 'pos': [50, 50], 'size': [100 + index, 100]},
+            ])
+            self.symbols.append(symbol)
+    
+    def tearDown(self):
+        """清理临时文件"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_render_antialiased(self):
+        """测试按尺寸渲染并抗锯齿"""
+        image = render_symbols(self.symbols[0].get_symbols(), (400, 400), 'thumbnail')
+        self.assertEqual(image.size, (64, 64))
+        colors = {value for _, value in image.convert('L').getcolors(64 * 64)}
+        self.assertIn(255, colors)
+        self.assertTrue(any(0 < value < 255 for value in colors))
+        
+        # Kivy坐标原点在左下角，(0, 0) 画到图片左下角
+        image = render_symbols([{'type': 'line', 'points': [0, 20, 40, 20]}], (400, 400), 64, supersample=1)
+        self.assertLess(min(image.getpixel((2, y))[0] for y in range(56, 64)), 128)
+        self.assertEqual(min(image.getpixel((2, y))[0] for y in range(0, 8)), 255)
+    
+    def test_render_cache(self):
+        """测试缓存按更新时间失效"""
+        symbol = self.symbols[0]
+        first = self.service.render_png(symbol, 'thumbnail')
+        self.assertIs(self.service.render_png(symbol, 'thumbnail'), first)
+        self.assertEqual(len(list(self.service.cache_dir.glob('*.png'))), 1)
+        
+        symbol.updated_at = datetime(2024, 1, 2)
+        self.service.render_png(symbol, 'thumbnail')
+        self.assertEqual(len(list(self.service.cache_dir.glob('*.png'))), 1)
+        self.assertEqual(self.service.render(symbol, 'detail').size, (256, 256))
+    
+    def test_export_library(self):
+        """测试批量导出到目录和拼图"""
+        output_dir = os.path.join(self.temp_dir, 'export')
+        result = self.service.export_library(self.symbols, output_dir, size=32, max_workers=2)
+        self.assertEqual(len(result['files']), 3)
+        self.assertEqual(result['failed'], [])
+        
+        result = self.service.export_library(self.symbols, output_dir, size=32, sprite_sheet=True, columns=2)
+        with open(os.path.join(output_dir, 'ids_sprites.json'), encoding='utf-8') as f:
+            frames = json.load(f)['frames']
+        self.assertEqual(frames['3'], {'name': 'render2', 'x': 0, 'y': 32, 'width': 32, 'height': 32})
+        from PIL import Image
+        with Image.open(os.path.join(output_dir, 'ids_sprites.png')) as sheet:
+            self.assertEqual(sheet.size, (64, 64))
+
+
+class TestIdsParser(unittest.TestCase):
+    """IDS解析测试"""
+    
+    def test_parse_and_normalize(self):
+        """测试解析与规范化"""
+        tree = parse_ids('⿰氵⿱木 目')
+        self.assertEqual(tree.operator, '⿰')
+        self.assertEqual(list(iter_components(tree)), [
+            ('氵', 'left', '⿰'), ('木', 'right/top', '⿱'), ('目', 'right/bottom', '⿱')
+        ])
+        self.assertEqual(to_ids(parse_ids('⿰⿰亻[foo]木')), '⿲亻[foo]木')
+        self.assertEqual(to_ids(parse_ids('⿰亻⿰&CDP-8B3A;木')), '⿲亻&CDP-8B3A;木')
+        self.assertEqual(parse_ids('好'), '好')
+    
+    def test_invalid(self):
+        """测试格式错误"""
+        for ids_text in ['', '⿰氵', '⿰氵木目', '⿱[foo']:
+            with self.assertRaises(IdsParseError):
+                parse_ids(ids_text)
+
+
+class TestIdsComponentIndex(TempDatabaseTestCase):
+    """IDS部件索引测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        super().setUp()
+        self.symbols = {}
+        for name, ids_string in [('IDSTEST-a', '⿰[it-1]⿱[it-2][it-3]'),
+                                 ('IDSTEST-b', '⿰[it-2][it-1]'),
+                                 ('IDSTEST-c', '⿱[it-1][it-3]'),
+                                 ('IDSTEST-bad', '⿰[it-1]')]:
+            self.symbols[name] = ids_service.save_symbol({
+                'name': name, 'symbols': [], 'canvas_size': [400, 400], 'ids_string': ids_string
+            })
+    
+    def _names(self, criteria):
+        return [symbol.name for symbol in ids_service.find_by_components(criteria)]
+    
+    def test_find_by_components(self):
+        """测试按部件和位置检索"""
+        self.assertEqual(self._names(['[it-1]']), ['IDSTEST-a', 'IDSTEST-b', 'IDSTEST-c'])
+        self.assertEqual(self._names([('[it-1]', 'left')]), ['IDSTEST-a'])
+        self.assertEqual(self._names([('[it-2]', 'right')]), ['IDSTEST-a'])
+        self.assertEqual(self._names([('[it-2]', 'right/top')]), ['IDSTEST-a'])
+        self.assertEqual(self._names(['[it-1]', '[it-3]']), ['IDSTEST-a', 'IDSTEST-c'])
+        self.assertEqual(self._names([('[it-1]', 'top'), '[it-3]']), ['IDSTEST-c'])
+        self.assertEqual(self._names(['[it-9]']), [])
+    
+    def test_incremental_update(self):
+        """测试修改和删除后索引同步"""
+        symbol = self.symbols['IDSTEST-b']
+        symbol.ids_string = '⿱[it-2][it-4]'
+        ids_service.update_symbol(symbol)
+        self.assertEqual(self._names([('[it-1]', 'right')]), [])
+        self.assertEqual(self._names(['[it-4]']), ['IDSTEST-b'])
+        self.assertEqual(ids_service.get_symbol_components(symbol.id), [
+            {'component': '[it-4]', 'position': 'bottom', 'operator': '⿱'},
+            {'component': '[it-2]', 'position': 'top', 'operator': '⿱'},
+        ])
+        
+        ids_service.delete_symbol(symbol.id)
+        self.assertEqual(self.db.count_objects(IdsComponent, {'symbol_id': symbol.id}), 0)
+        
+        bad = self.db.get_object_by_id(IdsSymbol, self.symbols['IDSTEST-bad'].id)
+        self.assertEqual(bad.ids_normalized, '')
+
+
+class TestConfigPersistence(unittest.TestCase):
+    """配置延迟写盘测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config(self.temp_dir)
+        self.writes = 0
+        original = self.config.save_config
+        
+        def counting_save():
+            self.writes += 1
+            original()
+        self.config.save_config = counting_save
+    
+    def tearDown(self):
+        """清理临时文件"""
+        self.config.save()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _read_file(self):
+        from configparser import ConfigParser
+        parser = ConfigParser()
+        parser.read(self.config.config_file, encoding='utf-8')
+        return parser
+    
+    def test_batched_save(self):
+        """测试多次修改合并为一次写入"""
+        for size in range(10, 20):
+            self.config.set('FONT', 'size', size)
+        self.assertEqual(self.writes, 0)
+        self.assertTrue(self.config.has_pending_changes)
+        self.assertEqual(self._read_file().get('FONT', 'size'), '16')
+        
+        self.config.save()
+        self.config.save()
+        self.assertEqual(self.writes, 1)
+        self.assertEqual(self._read_file().get('FONT', 'size'), '19')
+        self.assertFalse(os.path.exists(str(self.config.config_file) + '.tmp'))
+    
+    def test_debounced_save(self):
+        """测试停止修改后自动写入"""
+        with patch.object(config_module, 'SAVE_DELAY', 0.05):
+            self.config.set('SEARCH', 'debounce_ms', 100)
+            self.config.set('SEARCH', 'debounce_ms', 120)
+            time.sleep(0.3)
+        self.assertEqual(self.writes, 1)
+        self.assertEqual(self._read_file().get('SEARCH', 'debounce_ms'), '120')
+    
+    def test_typed_cache(self):
+        """测试类型转换缓存随修改失效"""
+        self.assertEqual(self.config.get_int('FONT', 'size', 0), 16)
+        self.config.set('FONT', 'size', 18)
+        self.assertEqual(self.config.get_int('FONT', 'size', 0), 18)
+        self.assertEqual(self.config.get_float('IDS', 'missing', 1.5), 1.5)
+        self.assertTrue(self.config.get_boolean('SEARCH', 'live_search'))
+        
+        with patch.object(self.config.config, 'getint') as getint:
+            self.config.get_int('FONT', 'size', 0)
+            getint.assert_not_called()
+
+
+class TestLogging(unittest.TestCase):
+    """日志限速与轮转测试"""
+    
+    def _record(self, name, created, level=logging.INFO):
+        record = logging.LogRecord(name, level, __file__, 0, 'row %s', ('x',), None)
+        record.created = created
+        return record
+    
+    def test_rate_limit(self):
+        """测试按子系统限速并汇总被抑制的条数"""
+        limiter = RateLimitFilter(rate=10, burst=5)
+        passed = [limiter.filter(self._record('services.import_service', 100.0)) for _ in range(20)]
+        self.assertEqual(passed.count(True), 5)
+        self.assertTrue(limiter.filter(self._record('services.search_service', 100.0)))
+        self.assertTrue(limiter.filter(self._record('services.import_service', 100.0, logging.CRITICAL)))
+        
+        record = self._record('services.import_service', 101.0)
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.getMessage(), 'row x (此前已抑制 15 条日志)')
+    
+    def test_rotation(self):
+        """测试按大小和日期轮转并限制文件数"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            log_file = Path(temp_dir) / 'app.log'
+            handler = SizedTimedRotatingFileHandler(log_file, max_bytes=200, backup_count=2)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            for _ in range(200):
+                handler.emit(self._record('app', time.time()))
+            self.assertEqual(sorted(p.name for p in Path(temp_dir).iterdir()), ['app.log', 'app.log.1', 'app.log.2'])
+            
+            handler.emit(self._record('app', handler.rollover_at + 1))
+            self.assertGreater(handler.rollover_at, time.time())
+            self.assertEqual(log_file.read_text(encoding='utf-8'), 'row x\n')
+            handler.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_parse_size(self):
+        """测试大小配置解析"""
+        self.assertEqual(parse_size('10MB'), 10 * 1024 * 1024)
+        self.assertEqual(parse_size('512kb'), 512 * 1024)
+        self.assertEqual(parse_size('4096'), 4096)
+        self.assertEqual(parse_size('abc', 7), 7)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """性能统计测试"""
+    
+    def setUp(self):
+        self.instrumentation = InstrumentationService(histogram_size=64)
+        self.original_method = DictionaryService.get_word_entry
+    
+    def tearDown(self):
+        self.instrumentation.disable()
+    
+    def test_rolling_histogram(self):
+        """测试滚动直方图只保留最近的样本"""
+        histogram = RollingHistogram(size=100)
+        for value in range(1, 201):
+            histogram.add(float(value))
+        stats = histogram.snapshot()
+        self.assertEqual(stats['count'], 200)
+        self.assertEqual(stats['max'], 200.0)
+        self.assertAlmostEqual(stats['p50'], 150.0, delta=1)
+        self.assertAlmostEqual(stats['p99'], 199.0, delta=1)
+    
+    def test_operation_timing_and_queries(self):
+        """测试方法计时和SQL语句统计"""
+        self.assertTrue(self.instrumentation.enable())
+        self.assertIsNot(DictionaryService.get_word_entry, self.original_method)
+        
+        with self.instrumentation.operation('test.lookup'):
+            dictionary_service.get_word_entry('INSTR-NONE')
+            dictionary_service.get_all_word_entries(limit=5)
+        
+        stats = self.instrumentation.get_stats()
+        self.assertEqual(stats['DictionaryService.get_word_entry']['count'], 1)
+        self.assertGreaterEqual(stats['DictionaryService.get_word_entry']['statements'], 1)
+        # 外层操作包含内部方法执行的全部语句
+        self.assertGreaterEqual(stats['test.lookup']['statements'],
+                                stats['DictionaryService.get_word_entry']['statements']
+                                + stats['DictionaryService.get_all_word_entries']['statements'])
+        self.assertNotIn('DatabaseService.get_session', stats)
+    
+    def test_disable_restores_methods(self):
+        """测试关闭后恢复原方法并保留数据"""
+        self.instrumentation.enable()
+        dictionary_service.get_word_entry('INSTR-NONE')
+        self.instrumentation.disable()
+        
+        self.assertIs(DictionaryService.get_word_entry, self.original_method)
+        dictionary_service.get_word_entry('INSTR-NONE')
+        self.assertEqual(self.instrumentation.get_stats()['DictionaryService.get_word_entry']['count'], 1)
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = self.instrumentation.dump_json(os.path.join(temp_dir, 'stats.json'))
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertIn('DictionaryService.get_word_entry', data['operations'])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestSlowQueryRecorder(unittest.TestCase):
+    """慢查询记录测试"""
+    
+    def setUp(self):
+        from sqlalchemy import create_engine, text
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.temp_dir, 'slow.db')}")
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, note TEXT)"))
+            conn.execute(text("CREATE INDEX ix_t_name ON t (name)"))
+        self.recorder = SlowQueryService(threshold_ms=0, buffer_size=3, explain=True)
+        self.recorder.attach(self.engine)
+    
+    def tearDown(self):
+        self.recorder.detach(self.engine)
+        self.engine.dispose()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _execute(self, sql, **params):
+        from sqlalchemy import text
+        with self.engine.connect() as conn:
+            return conn.execute(text(sql), params).fetchall()
+    
+    def test_full_scan_flagged(self):
+        """测试未使用索引的查询标记为全表扫描"""
+        self._execute("SELECT id FROM t WHERE note LIKE :pattern", pattern='%abc%')
+        record = self.recorder.get_recent(1)[0]
+        self.assertEqual(record['full_scans'], ['t'])
+        self.assertEqual(record['parameters'], ['%abc%'])
+        self.assertTrue(record['plan'])
+        
+        self._execute("SELECT id FROM t WHERE name = :name", name='abc')
+        self.assertEqual(self.recorder.get_recent(1)[0]['full_scans'], [])
+    
+    def test_ring_buffer_bounded(self):
+        """测试缓冲区只保留最近的记录"""
+        for index in range(5):
+            self._execute(f"SELECT {index}")
+        records = self.recorder.get_recent()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]['statement'], "SELECT 4")
+        self.assertEqual(self.recorder.total_recorded, 5)
+        
+        path = self.recorder.dump_json(os.path.join(self.temp_dir, 'slow_queries.json'))
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['queries']), 3)
+    
+    def test_find_full_scans(self):
+        """测试执行计划解析"""
+        plan = ['SCAN word_entries', 'SEARCH definitions USING INDEX ix_word (word_id=?)',
+                'SCAN TABLE examples', 'SCAN words_fts VIRTUAL TABLE INDEX 0:M1',
+                'SCAN definitions USING COVERING INDEX ix_definitions']
+        self.assertEqual(find_full_scans(plan), ['word_entries', 'examples'])
+
+
+class TestNPlusOneDetector(unittest.TestCase):
+    """N+1查询检测测试"""
+    
+    def setUp(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from models.base import Base
+        
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        with self.Session() as session:
+            for index in range(8):
+                entry = WordEntry(word_id=f"NP{index}", latin_form=f"np{index}")
+                entry.definitions.append(Definition(definition_text=f"def {index}", definition_order=1))
+                session.add(entry)
+            session.commit()
+    
+    def tearDown(self):
+        self.engine.dispose()
+    
+    def _load_definitions(self, eager=False):
+        from sqlalchemy.orm import selectinload
+        
+        with self.Session() as session:
+            query = session.query(WordEntry)
+            if eager:
+                query = query.options(selectinload(WordEntry.definitions))
+            return [entry.get_all_definitions() for entry in query.all()]
+    
+    def test_normalize_statement(self):
+        """测试语句形状归一化"""
+        self.assertEqual(normalize_statement("SELECT * FROM t WHERE id = 5 AND name = 'a''b'"),
+                         "SELECT * FROM t WHERE id = ? AND name = ?")
+        self.assertEqual(normalize_statement("SELECT * FROM t\n WHERE id IN (?, ?,  ?)"),
+                         "SELECT * FROM t WHERE id IN (?...)")
+    
+    def test_lazy_loads_in_loop(self):
+        """测试循环中的延迟加载被检测并报告调用位置"""
+        with self.assertRaises(NPlusOneError) as context:
+            with NPlusOneDetector(threshold=5, engine=self.engine):
+                self._load_definitions()
+        self.assertIn('FROM definitions', str(context.exception))
+        self.assertIn('models/word_entry.py', str(context.exception))
+        self.assertIn('tests/test_services.py', str(context.exception))
+        
+        with NPlusOneDetector(threshold=5, engine=self.engine) as detector:
+            self._load_definitions(eager=True)
+        self.assertEqual(detector.violations(), [])
+    
+    def test_per_call_grouping(self):
+        """测试按调用计数时调用方循环不算N+1"""
+        with NPlusOneDetector(threshold=2, mode='record', per_call=True) as detector:
+            for _ in range(5):
+                dictionary_service.get_word_entry('NP-NONE')
+        self.assertEqual(detector.total_statements, 5)
+        self.assertEqual(detector.violations(), [])
+        
+        detector.per_call = False
+        self.assertEqual(len(detector.violations()), 1)
+    
+    def test_batched_import(self):
+        """测试导入按批写入：已存在和批内重复的词条计为失败"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        db = use_temp_database(self, temp_dir)
+        
+        dictionary_service.add_word_entry({'word_id': 'NPIMP001', 'latin_form': 'existing'})
+        path = os.path.join(temp_dir, 'import.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'word_id': 'NPIMP001', 'latin_form': 'duplicate'},
+                {'word_id': 'NPIMP002', 'latin_form': 'novum', 'definitions': ['new'],
+                 'examples': [{'text': 'novum est', 'translation': 'it is new'}]},
+                {'word_id': 'NPIMP002', 'latin_form': 'again'},
+            ], f)
+        
+        with NPlusOneDetector(threshold=0) as detector:
+            result = ImportService().import_from_json(path)
+        self.assertEqual((result['success'], result['failed']), (1, 2))
+        # 查重只执行一条批量查询，没有逐条查询
+        self.assertEqual(detector.total_statements, 0)
+        
+        with db.get_session() as session:
+            entry = session.query(WordEntry).filter(WordEntry.word_id == 'NPIMP002').one()
+            self.assertEqual(entry.get_all_definitions(), ['new'])
+            self.assertEqual(entry.get_all_examples(), [('novum est', 'it is new')])
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """采样分析测试"""
+    
+    @staticmethod
+    def _busy(seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            sum(i * i for i in range(500))
+    
+    def test_samples_worker_threads(self):
+        """测试采样工作线程并输出折叠栈"""
+        idle_event = threading.Event()
+        idle_thread = threading.Thread(target=idle_event.wait, name='profiler-idle-test', daemon=True)
+        idle_thread.start()
+        profiler = ProfilerService(rate_hz=200)
+        try:
+            profiler.start()
+            worker = threading.Thread(target=self._busy, args=(0.3,), name='profiler-busy-test')
+            worker.start()
+            worker.join()
+            self.assertIsNone(profiler.stop(write=False))
+        finally:
+            idle_event.set()
+        
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.samples, 10)
+        lines = profiler.collapsed_lines()
+        busy_lines = [line for line in lines if line.startswith('profiler-busy-test;')]
+        self.assertTrue(busy_lines)
+        self.assertTrue(any('_busy (tests/test_services.py:' in line for line in busy_lines))
+        # 阻塞等待的线程不记录
+        self.assertFalse(any(line.startswith('profiler-idle-test;') for line in lines))
+        
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = profiler.write_collapsed(os.path.join(temp_dir, 'profile.folded'))
+            with open(path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), lines)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestFrameMonitor(unittest.TestCase):
+    """帧时间监测测试（无窗口，手动驱动Clock）"""
+    
+    def setUp(self):
+        self.screen = 'word_list'
+        self.monitor = FrameMonitorService(jank_ms=40, histogram_size=64,
+                                           screen_provider=lambda: self.screen)
+    
+    def tearDown(self):
+        self.monitor.stop()
+    
+    def _update_display(self, dt):
+        self._build_cards()
+    
+    def _build_cards(self):
+        time.sleep(0.12)
+    
+    def test_long_frame_attribution(self):
+        """测试长帧归因到当前屏幕、正在执行的回调及其中的热点"""
+        self.assertTrue(self.monitor.start())
+        for _ in range(3):
+            Clock.tick()
+        Clock.schedule_once(self._update_display, 0)
+        for _ in range(2):
+            Clock.tick()
+        self.screen = 'ids_editor'
+        for _ in range(3):
+            Clock.tick()
+        self.monitor.stop()
+        
+        stats = self.monitor.get_stats()
+        self.assertEqual(stats['word_list']['long_frames'], 1)
+        self.assertGreaterEqual(stats['word_list']['max'], 100)
+        self.assertEqual(stats['ids_editor']['long_frames'], 0)
+        
+        long_frame = self.monitor.get_long_frames()[0]
+        self.assertEqual(long_frame['screen'], 'word_list')
+        # 回调是被调度的函数，热点是其中实际耗时的辅助函数
+        self.assertIn('TestFrameMonitor._update_display (tests/test_services.py:', long_frame['callback'])
+        self.assertIn('TestFrameMonitor._build_cards (tests/test_services.py:', long_frame['hotspot'])
+        self.assertEqual(self.monitor.top_callbacks(1)[0][0], long_frame['callback'])
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = self.monitor.dump_json(os.path.join(temp_dir, 'frames.json'))
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(set(data['screens']), {'word_list', 'ids_editor'})
+            self.assertEqual(len(data['long_frames']), 1)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestSearchHistoryService(unittest.TestCase):
+    """搜索历史服务测试"""
+    
+    def setUp(self):
+        """测试前准备（使用临时数据库）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseService(os.path.join(self.temp_dir, 'history.db'))
+        self.history = SearchHistoryService(database=self.db)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.history.flush()
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_normalize_query(self):
+        """测试查询规范化"""
+        self.assertEqual(SearchHistoryService.normalize_query('  Foo   BAR '), 'foo bar')
+    
+    def test_record_and_rank(self):
+        """测试记录与排序"""
+        self.history.record('histtest alpha', {'search_mode': 'fuzzy'}, 3)
+        self.history.record('HistTest Alpha', {'search_mode': 'fuzzy'}, 4)
+        self.history.record('histtest beta')
+        self.history.flush()
+        
+        items = self.history.get_ranked(limit=5, prefix='histtest')
+        self.assertEqual([item['query'] for item in items], ['HistTest Alpha', 'histtest beta'])
+        self.assertEqual(items[0]['hit_count'], 2)
+        self.assertEqual(items[0]['result_count'], 4)
+        self.assertEqual(items[0]['params'], {'search_mode': 'fuzzy'})
+        
+        # 再次落库时累加次数
+        self.history.record('histtest beta')
+        self.history.record('histtest beta')
+        self.history.flush()
+        items = self.history.get_ranked(limit=5, prefix='histtest')
+        self.assertEqual(items[0]['query'], 'histtest beta')
+        self.assertEqual(items[0]['hit_count'], 3)
+
+    def test_read_merges_pending_without_writing(self):
+        """测试读取合并未落库的条目且不写库"""
+        from models.search_history import SearchHistory
+        self.history.record('histtest gamma')
+        self.history.flush()
+        self.history.record('histtest gamma', {'search_mode': 'exact'}, 7)
+        self.history.record('histtest delta')
+
+        ranked = self.history.get_ranked(limit=5, prefix='histtest')
+        self.assertEqual([(item['query'], item['hit_count']) for item in ranked],
+                         [('histtest gamma', 2), ('histtest delta', 1)])
+        self.assertEqual(ranked[0]['params'], {'search_mode': 'exact'})
+        recent = [item['query'] for item in self.history.get_recent(10)]
+        self.assertEqual(recent[:2], ['histtest delta', 'histtest gamma'])
+
+        with self.db.get_session() as session:
+            rows = session.query(SearchHistory).filter(
+                SearchHistory.normalized_query.like('histtest%')
+            ).all()
+            self.assertEqual([(row.normalized_query, row.hit_count) for row in rows], [('histtest gamma', 1)])
+
+
+class TestSearchExecutor(unittest.TestCase):
+    """异步搜索执行器测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.executor = SearchExecutor(delay=0)
+        self.results = []
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.executor.shutdown(wait=True)
+    
+    def _pump(self, timeout=2.0):
+        """驱动Kivy时钟直到收到结果"""
+        deadline = time.time() + timeout
+        while not self.results and time.time() < deadline:
+            Clock.tick()
+            time.sleep(0.01)
+    
+    def test_result_delivered_on_clock(self):
+        """测试结果通过时钟回调返回"""
+        self.executor.submit(lambda q: q.upper(), args=('abc',), callback=self.results.append)
+        self._pump()
+        self.assertEqual(self.results, ['ABC'])
+    
+    def test_superseded_result_discarded(self):
+        """测试过期搜索结果被丢弃"""
+        def slow_search(q):
+            time.sleep(0.1)
+            return q
+        
+        self.executor.submit(slow_search, args=('old',), callback=self.results.append)
+        self.executor.submit(slow_search, args=('new',), callback=self.results.append)
+        self._pump()
+        time.sleep(0.2)
+        Clock.tick()
+        self.assertEqual(self.results, ['new'])
+    
+    def test_stream_batches_delivered(self):
+        """测试流式批次投递"""
+        batches = []
+        
+        def stream():
+            yield [1, 2]
+            yield [3]
+        
+        self.executor.submit_stream(stream, batch_callback=batches.append,
+                                    complete_callback=self.results.append)
+        self._pump()
+        self.assertEqual(batches, [[1, 2], [3]])
+        self.assertEqual(self.results, [3])
+    
+    def test_cancellable_search(self):
+        """测试可取消搜索"""
+        seen = []
+        
+        def search(q, is_cancelled=None):
+            seen.append(is_cancelled())
+            return q
+        
+        token = self.executor.submit(search, args=('q',), callback=self.results.append,
+                                     cancellable=True)
+        self._pump()
+        self.assertEqual(seen, [False])
+        self.executor.cancel()
+        self.assertFalse(self.executor.is_current(token))
+
+
 class TestValidators(unittest.TestCase):
     """验证器测试"""
     
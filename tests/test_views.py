@@ -17,6 +17,8 @@ from views.tools_screen import ToolsScreen
 from views.url_bookmark_screen import UrlBookmarkScreen
 from views.memo_words_screen import MemoWordsScreen
 from views.import_export_screen import ImportExportScreen
+from views.screen_cache import ScreenCache
+from views.ids_editor_screen import IdsCanvas
 
 
 class TestMainScreen(BaseTestCase):
@@ -331,6 +333,94 @@ class TestUIComponents(MockTestCase):
         self.assertIsNotNone(text_field)
 
 
+class TestScreenCache(unittest.TestCase):
+    """屏幕缓存测试"""
+    
+    def setUp(self):
+        from kivy.uix.screenmanager import ScreenManager, Screen
+        self.manager = ScreenManager()
+        self.manager.add_widget(Screen(name="home"))
+        self.created = []
+        
+        def factory(name):
+            screen = Screen(name=name)
+            screen.refresh_count = 0
+            
+            def refresh_data():
+                screen.refresh_count += 1
+            screen.refresh_data = refresh_data
+            self.created.append(name)
+            return screen
+        
+        self.cache = ScreenCache(self.manager, max_size=2)
+        for name in ("a", "b", "c"):
+            self.cache.register(name, factory)
+    
+    def test_construct_on_first_show(self):
+        """测试首次导航时才构造，再次导航只刷新"""
+        self.assertEqual(self.created, [])
+        screen = self.cache.show("a")
+        self.assertEqual(self.created, ["a"])
+        self.assertEqual(self.manager.current, "a")
+        self.assertEqual(screen.refresh_count, 0)
+        
+        self.assertIs(self.cache.show("a"), screen)
+        self.assertEqual(self.created, ["a"])
+        self.assertEqual(screen.refresh_count, 1)
+    
+    def test_bounded_cache(self):
+        """测试超出上限时移除最久未用的屏幕"""
+        self.cache.show("a")
+        self.cache.show("b")
+        self.cache.show("c")
+        self.assertEqual(self.cache.cached_names, ["b", "c"])
+        self.assertFalse(self.manager.has_screen("a"))
+        self.assertTrue(self.manager.has_screen("home"))
+    
+    def test_prewarm(self):
+        """测试空闲帧逐个预构造"""
+        scheduled = []
+        with patch('views.screen_cache.Clock') as mock_clock:
+            mock_clock.schedule_once.side_effect = lambda callback, delay: scheduled.append(callback)
+            self.cache.prewarm(["a", "b"])
+            self.assertEqual(self.created, [])
+            
+            scheduled.pop(0)(0)
+            self.assertEqual(self.created, ["a"])
+            scheduled.pop(0)(0)
+            self.assertEqual(self.created, ["a", "b"])
+            self.assertEqual(scheduled, [])
+        self.assertEqual(self.manager.current, "home")
+
+
+class TestIdsCanvas(unittest.TestCase):
+    """IDS画布测试"""
+    
+    def setUp(self):
+        self.canvas = IdsCanvas(size=(400, 400))
+        self.canvas.stroke_tolerance = 0.5
+    
+    def test_stroke_updates_single_group(self):
+        """测试绘制时只更新当前笔画，抬笔后简化"""
+        self.canvas.add_rectangle((10, 10), (50, 50))
+        rectangle_group = self.canvas._groups[0]
+        
+        touch = Mock(x=0, y=0, pos=(0, 0))
+        self.canvas.on_touch_down(touch)
+        for i in range(1, 100):
+            touch.x, touch.y = i, 0
+            self.canvas.on_touch_move(touch)
+            self.assertIs(self.canvas._groups[0], rectangle_group)
+        self.canvas.on_touch_up(touch)
+        
+        stroke = self.canvas.symbols[-1]
+        self.assertEqual(list(stroke['points']), [0, 0, 99, 0])
+        self.assertEqual(len(self.canvas._groups), 2)
+        
+        self.canvas.clear_canvas()
+        self.assertEqual(self.canvas._groups, [])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -3,14 +3,20 @@
 Utility Modules
 
 包含各种辅助工具和实用函数
+
+子模块按需导入，避免导入 ``utils.xxx`` 时连带加载Kivy、SQLAlchemy等依赖。
 """
 
-from .logger import setup_logger, get_logger
-from .database import DatabaseManager
-from .file_manager import FileManager
-from .theme_manager import ThemeManager
-from .validators import Validators
-from .helpers import *
+import importlib
+
+_LAZY_IMPORTS = {
+    'setup_logger': '.logger',
+    'get_logger': '.logger',
+    'DatabaseManager': '.database',
+    'FileManager': '.file_manager',
+    'ThemeManager': '.theme_manager',
+    'Validators': '.validators',
+}
 
 __all__ = [
     'setup_logger',
@@ -20,3 +26,14 @@ __all__ = [
     'ThemeManager',
     'Validators'
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    # 兼容原先 ``from .helpers import *`` 导出的辅助函数
+    helpers = importlib.import_module('.helpers', __name__)
+    if not name.startswith('_') and hasattr(helpers, name):
+        return getattr(helpers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
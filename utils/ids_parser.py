@@ -0,0 +1,192 @@
+"""
+表意文字描述序列解析
+Ideographic Description Sequence Parser
+
+将IDS（如 ``⿰氵⿱木目``）解析为结构树，并做规范化：
+- 忽略空白和异体字选择符
+- 部件可以是单个字符、``[自定义部件名]`` 或 ``&实体名;``
+- 连续的左右/上下结构合并为三分结构：``⿰⿰abc``、``⿰a⿰bc`` 都规范为 ``⿲abc``
+"""
+
+from typing import Iterator, NamedTuple, Tuple, Union
+
+
+# 描述符 -> 各子部件的位置名称（子部件数量即描述符的元数）
+IDS_OPERATORS = {
+    '⿰': ('left', 'right'),
+    '⿱': ('top', 'bottom'),
+    '⿲': ('left', 'middle', 'right'),
+    '⿳': ('top', 'middle', 'bottom'),
+    '⿴': ('outer', 'inner'),
+    '⿵': ('outer', 'inner'),
+    '⿶': ('outer', 'inner'),
+    '⿷': ('outer', 'inner'),
+    '⿸': ('outer', 'inner'),
+    '⿹': ('outer', 'inner'),
+    '⿺': ('outer', 'inner'),
+    '⿻': ('first', 'second'),
+    '⿼': ('outer', 'inner'),
+    '⿽': ('outer', 'inner'),
+    '⿾': ('reflected',),
+    '⿿': ('rotated',),
+    '㇯': ('whole', 'removed'),
+}
+
+# 二分结构嵌套同向二分结构时合并为的三分结构
+_MERGED_OPERATORS = {'⿰': '⿲', '⿱': '⿳'}
+
+POSITION_SEPARATOR = '/'
+
+# 多字符部件的起止符号：[自定义部件名]、&实体名;
+_NAME_DELIMITERS = {'[': ']', '&': ';'}
+
+
+class IdsParseError(ValueError):
+    """IDS格式错误"""
+
+
+class IdsNode(NamedTuple):
+    """IDS结构节点：描述符及其子部件（子部件为节点或部件字符串）"""
+    operator: str
+    children: Tuple['IdsTree', ...]
+
+
+IdsTree = Union[IdsNode, str]
+
+
+def _is_ignorable(char: str) -> bool:
+    """空白和异体字选择符不影响结构"""
+    code = ord(char)
+    return char.isspace() or 0xFE00 <= code <= 0xFE0F or 0xE0100 <= code <= 0xE01EF
+
+
+def _tokenize(text: str) -> Iterator[str]:
+    """切分为描述符和部件"""
+    index, length = 0, len(text)
+    while index < length:
+        char = text[index]
+        if _is_ignorable(char):
+            index += 1
+            continue
+        closing = _NAME_DELIMITERS.get(char)
+        if closing:
+            end = text.find(closing, index + 1)
+            if end <= index + 1:
+                raise IdsParseError(f"部件名未闭合: {text[index:]}")
+            yield text[index:end + 1]
+            index = end + 1
+        else:
+            yield char
+            index += 1
+
+
+def _make_node(operator: str, children: list) -> IdsNode:
+    """构造节点，合并同向的二分结构"""
+    merged = _MERGED_OPERATORS.get(operator)
+    if merged:
+        first, second = children
+        if isinstance(first, IdsNode) and first.operator == operator:
+            return IdsNode(merged, first.children + (second,))
+        if isinstance(second, IdsNode) and second.operator == operator:
+            return IdsNode(merged, (first,) + second.children)
+    return IdsNode(operator, tuple(children))
+
+
+def parse_ids(text: str) -> IdsTree:
+    """解析IDS为规范化的结构树；单个部件返回部件本身"""
+    # 非递归解析，深层嵌套也不会超出递归限制
+    stack = []
+    root = None
+    for token in _tokenize(text or ''):
+        if root is not None:
+            raise IdsParseError(f"IDS结尾有多余部件: {token}")
+        if token in IDS_OPERATORS:
+            stack.append((token, []))
+            continue
+
+        node = token
+        while stack:
+            operator, children = stack[-1]
+            children.append(node)
+            if len(children) < len(IDS_OPERATORS[operator]):
+                break
+            stack.pop()
+            node = _make_node(operator, children)
+        else:
+            root = node
+
+    if root is None:
+        raise IdsParseError("IDS不完整" if stack else "IDS为空")
+    return root
+
+
+def is_valid_ids(text: str) -> bool:
+    """是否为合法的IDS"""
+    try:
+        parse_ids(text)
+        return True
+    except IdsParseError:
+        return False
+
+
+def to_ids(tree: IdsTree) -> str:
+    """将结构树序列化为IDS字符串"""
+    if isinstance(tree, str):
+        return tree
+    parts = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+        else:
+            parts.append(node.operator)
+            stack.extend(reversed(node.children))
+    return ''.join(parts)
+
+
+def normalize_ids(text: str) -> str:
+    """IDS的规范形式"""
+    return to_ids(parse_ids(text))
+
+
+def iter_components(tree: IdsTree) -> Iterator[Tuple[str, str, str]]:
+    """遍历所有部件，生成 (部件, 位置路径, 直接所在结构的描述符)
+
+    位置路径由根开始的各级位置组成，如 ``⿰氵⿱木目`` 中 ``目`` 为 ``right/bottom``；
+    单部件IDS的位置路径和描述符为空字符串。
+    """
+    stack = [(tree, '', '')]
+    while stack:
+        node, path, operator = stack.pop()
+        if isinstance(node, str):
+            yield node, path, operator
+            continue
+        positions = IDS_OPERATORS[node.operator]
+        for child, position in zip(reversed(node.children), reversed(positions)):
+            child_path = f"{path}{POSITION_SEPARATOR}{position}" if path else position
+            stack.append((child, child_path, node.operator))
+
+
+def tree_depth(tree: IdsTree) -> int:
+    """结构树的嵌套层数（单部件为0）"""
+    depth = 0
+    stack = [(tree, 0)]
+    while stack:
+        node, level = stack.pop()
+        if isinstance(node, IdsNode):
+            depth = max(depth, level + 1)
+            stack.extend((child, level + 1) for child in node.children)
+    return depth
+
+
+def count_operators(tree: IdsTree) -> int:
+    """结构树中描述符的数量"""
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, IdsNode):
+            count += 1
+            stack.extend(node.children)
+    return count
@@ -1,53 +1,241 @@
 """
 日志工具
 Logger Utility
+
+日志记录只放入内存队列，由后台线程写入文件，调用方不做磁盘I/O：
+- 日志文件按大小和日期轮转，保留有限数量的历史文件
+- 每个子系统（logger名称）单独限速，批量操作中的大量日志会被抑制并汇总
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+
+
+# 应用各包的logger；服务使用 logging.getLogger(__name__)，需要一并接入
+APP_LOGGERS = ('app', 'models', 'services', 'utils', 'views')
+
+DEFAULT_LOG_DIR = Path.home() / ".offline_dictionary" / "logs"
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'B': 1}
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_RETENTION_DAYS = 14
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_BURST = 100
+
+_listener = None
+_log_dir = None
+_listener_lock = threading.Lock()
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """文件超过大小或跨天时轮转的日志处理器
+
+    轮转后的文件为 ``<名称>.log.1`` ~ ``<名称>.log.<backup_count>``，编号越大越旧。
+    """
+
+    def __init__(self, filename, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT, encoding: str = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.rollover_at = self._next_rollover(self._opened_at())
+
+    def _opened_at(self) -> float:
+        """当前日志文件的开始时间（已有文件取修改时间）"""
+        try:
+            return os.path.getmtime(self.baseFilename)
+        except OSError:
+            return time.time()
+
+    @staticmethod
+    def _next_rollover(timestamp: float) -> float:
+        """下一个午夜"""
+        day = datetime.fromtimestamp(timestamp).date() + timedelta(days=1)
+        return datetime.combine(day, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record) -> bool:
+        if record.created >= self.rollover_at:
+            if self.stream is not None or os.path.exists(self.baseFilename):
+                return True
+            self.rollover_at = self._next_rollover(record.created)
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_rollover(time.time())
+
+
+class RateLimitFilter(logging.Filter):
+    """按logger名称限速（令牌桶）
+
+    每个子系统每秒最多 ``rate`` 条、可短时突发 ``burst`` 条，超出的日志被丢弃；
+    恢复输出时在下一条日志后注明期间抑制的条数。CRITICAL 级别不限速。
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_RATE_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.CRITICAL:
+            return True
+
+        with self._lock:
+            now = record.created
+            tokens, updated_at, suppressed = self._buckets.get(record.name, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[record.name] = (tokens - 1, now, 0)
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (此前已抑制 {suppressed} 条日志)"
+            record.args = None
+        return True
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """进程内队列处理器：只固定消息文本，完整格式化留给后台线程"""
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_size(value, fallback: int = DEFAULT_MAX_BYTES) -> int:
+    """解析 ``10MB``、``512KB`` 或字节数形式的大小"""
+    text = str(value or '').strip().upper()
+    try:
+        for unit, factor in SIZE_UNITS.items():
+            if text.endswith(unit):
+                return int(float(text[:-len(unit)]) * factor)
+        return int(text)
+    except ValueError:
+        return fallback
 
 
-def setup_logger(name: str = "offline_dictionary", level: int = logging.INFO):
-    """设置日志系统"""
-    
-    # 创建日志目录
-    log_dir = Path.home() / ".offline_dictionary" / "logs"
+def cleanup_logs(log_dir: Path, retention_days: int = DEFAULT_RETENTION_DAYS):
+    """删除超过保留天数的日志文件（包括旧版按日期命名的文件）"""
+    cutoff = time.time() - retention_days * 86400
+    for path in Path(log_dir).glob('*.log*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def setup_logger(name: str = "offline_dictionary", level: int = None, log_dir=None,
+                 max_bytes: int = None, backup_count: int = None, retention_days: int = None,
+                 rate_limit: float = None, rate_burst: int = None):
+    """设置日志系统（未指定的参数读取配置 [LOGGING] 节）"""
+    global _listener, _log_dir
+    from app.config import config
+
+    if level is None:
+        level = logging.getLevelName(config.get('LOGGING', 'level', 'INFO').upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    max_bytes = max_bytes or parse_size(config.get('LOGGING', 'max_file_size', None))
+    backup_count = backup_count or config.get_int('LOGGING', 'backup_count', DEFAULT_BACKUP_COUNT)
+    retention_days = retention_days or config.get_int('LOGGING', 'retention_days', DEFAULT_RETENTION_DAYS)
+    if rate_limit is None:
+        rate_limit = config.get_float('LOGGING', 'rate_limit', DEFAULT_RATE_LIMIT)
+    rate_burst = rate_burst or config.get_int('LOGGING', 'rate_burst', DEFAULT_RATE_BURST)
+
+    # 创建日志目录，清理过期日志
+    log_dir = Path(log_dir) if log_dir else DEFAULT_LOG_DIR
     log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 日志文件名（按日期）
-    log_file = log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    # 创建logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
-    # 清除已有的处理器
-    logger.handlers.clear()
-    
+    _log_dir = log_dir
+    cleanup_logs(log_dir, retention_days)
+
+    # 日志文件名（轮转时追加编号）
+    log_file = log_dir / f"{name}.log"
+
     # 创建格式器
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
-    # 文件处理器
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
+    # 文件处理器（在后台线程中执行）
+    handlers = []
+    if config.get_boolean('LOGGING', 'file_enabled', True):
+        file_handler = SizedTimedRotatingFileHandler(log_file, max_bytes=max_bytes, backup_count=backup_count)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
     # 控制台处理器（开发环境）
-    if os.getenv('DEBUG', 'false').lower() == 'true':
+    if os.getenv('DEBUG', 'false').lower() == 'true' or config.get_boolean('LOGGING', 'console_enabled', False):
         console_handler = logging.StreamHandler()
         console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-    
+        handlers.append(console_handler)
+
+    # 调用方只把日志放入队列
+    log_queue = queue.SimpleQueue()
+    queue_handler = _LocalQueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    queue_handler.addFilter(RateLimitFilter(rate_limit, rate_burst))
+
+    with _listener_lock:
+        _stop_listener()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+    # 创建logger
+    logger = logging.getLogger(name)
+    for logger_name in (name,) + APP_LOGGERS:
+        app_logger = logging.getLogger(logger_name)
+        app_logger.setLevel(level)
+
+        # 清除已有的处理器
+        for handler in app_logger.handlers[:]:
+            app_logger.removeHandler(handler)
+            handler.close()
+        app_logger.addHandler(queue_handler)
+        app_logger.propagate = False
+
     return logger
 
 
+def shutdown_logger():
+    """写出队列中剩余的日志并停止后台线程"""
+    with _listener_lock:
+        _stop_listener()
+
+
+def _stop_listener():
+    """停止当前的后台写入线程"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logger)
+
+
+def get_log_dir() -> Path:
+    """当前日志目录（其他诊断文件也写在这里，便于随日志一起导出）"""
+    return _log_dir or DEFAULT_LOG_DIR
+
+
 def get_logger(name: str = None):
     """获取logger实例"""
     if name:
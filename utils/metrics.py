@@ -0,0 +1,63 @@
+"""
+运行时统计工具
+Runtime Metrics
+
+保存最近若干个样本的滚动直方图，用于在进程内查看耗时分布（p50/p95/p99）。
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List
+
+
+class RollingHistogram:
+    """滚动直方图：保留最近 ``size`` 个样本，另外累计全部样本的数量和总和"""
+
+    def __init__(self, size: int = 1024):
+        self._samples = deque(maxlen=max(1, size))
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float):
+        """记录一个样本"""
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+            self.total += value
+            if value > self.maximum:
+                self.maximum = value
+
+    def values(self) -> List[float]:
+        """当前窗口内的样本"""
+        with self._lock:
+            return list(self._samples)
+
+    def percentiles(self, *percents: float) -> List[float]:
+        """窗口内样本的百分位数（最近秩法）"""
+        ordered = sorted(self.values())
+        if not ordered:
+            return [0.0 for _ in percents]
+        last = len(ordered) - 1
+        return [ordered[min(last, max(0, round(percent / 100 * last)))] for percent in percents]
+
+    def snapshot(self) -> Dict[str, float]:
+        """统计摘要：累计数量、均值、最大值和窗口内的百分位数"""
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.maximum,
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
+        }
+
+    def reset(self):
+        """清空样本"""
+        with self._lock:
+            self._samples.clear()
+            self.count = 0
+            self.total = 0.0
+            self.maximum = 0.0
@@ -0,0 +1,232 @@
+"""
+语音相似度工具
+Phonetic Similarity Utilities
+
+生成用于"同音/近音"查找的语音键：
+- 拉丁写法：Soundex 或 Metaphone 风格的编码
+- 音标：按IPA发音特征（部位、方式、元音舌位）分桶
+"""
+
+from utils.text_normalizer import fold_text, normalize_search_key, PHONETIC_MARKS
+
+
+# 拉丁写法支持的编码算法及其存储前缀
+LATIN_ALGORITHMS = {
+    'soundex': 'S',
+    'metaphone': 'M',
+}
+DEFAULT_LATIN_ALGORITHM = 'metaphone'
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('BFPV', '1'),
+    **dict.fromkeys('CGJKQSXZ', '2'),
+    **dict.fromkeys('DT', '3'),
+    'L': '4',
+    **dict.fromkeys('MN', '5'),
+    'R': '6',
+}
+
+_VOWELS = set('AEIOU')
+_FRONT_VOWELS = set('EIY')
+
+# IPA发音特征分桶：同一桶内的音视为近音
+IPA_FEATURE_BUCKETS = {
+    # 元音：按舌位高低前后
+    **dict.fromkeys('iyɪʏj', 'I'),
+    **dict.fromkeys('eøɛœəɘɜɞɚɝ', 'E'),
+    **dict.fromkeys('aæɐɑɒʌ', 'A'),
+    **dict.fromkeys('oɔɤɵ', 'O'),
+    **dict.fromkeys('uʊɯʉɨwʍ', 'U'),
+    # 辅音：按发音部位和方式
+    **dict.fromkeys('pbɓ', 'P'),
+    **dict.fromkeys('fvɸβʋ', 'F'),
+    **dict.fromkeys('mɱnɲŋɳɴ', 'N'),
+    **dict.fromkeys('tdʈɖɗθð', 'T'),
+    **dict.fromkeys('szʃʒʂʐɕʑ', 'S'),
+    **dict.fromkeys('ʧʤ', 'C'),
+    **dict.fromkeys('kgɡqɢcɟɠ', 'K'),
+    **dict.fromkeys('xɣχhɦħ', 'H'),
+    **dict.fromkeys('lɫɬɮɭʎ', 'L'),
+    **dict.fromkeys('rɹɾɽʀʁɻ', 'R'),
+}
+
+# 拼写式输入（未使用IPA）时常见的二合字母
+_DIGRAPHS = {
+    'sh': 'ʃ', 'ch': 'ʧ', 'th': 'θ', 'ng': 'ŋ', 'ph': 'f', 'zh': 'ʒ', 'kh': 'x',
+}
+
+
+def soundex(text: str) -> str:
+    """American Soundex编码（首字母 + 三位数字）"""
+    word = ''.join(char for char in normalize_search_key(text).upper() if 'A' <= char <= 'Z')
+    if not word:
+        return ''
+
+    code = word[0]
+    previous = _SOUNDEX_CODES.get(word[0], '')
+    for char in word[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H、W 不会打断相同编码，元音会
+        if char not in 'HW':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def metaphone(text: str, max_length: int = 8) -> str:
+    """Metaphone编码（按英语拼读规则归并辅音，仅保留首元音）"""
+    word = ''.join(char for char in normalize_search_key(text).upper() if 'A' <= char <= 'Z')
+    if not word:
+        return ''
+
+    # 词首例外
+    if word[:2] in ('AE', 'GN', 'KN', 'PN', 'WR'):
+        word = word[1:]
+    elif word[0] == 'X':
+        word = 'S' + word[1:]
+    elif word[:2] == 'WH':
+        word = 'W' + word[2:]
+
+    length = len(word)
+
+    def at(index):
+        return word[index] if 0 <= index < length else ''
+
+    key = []
+    for i, char in enumerate(word):
+        if len(key) >= max_length:
+            break
+        prev, nxt, after = at(i - 1), at(i + 1), at(i + 2)
+        if char == prev and char != 'C':
+            continue
+
+        code = ''
+        if char in _VOWELS:
+            code = char if i == 0 else ''
+        elif char == 'B':
+            code = '' if prev == 'M' and i == length - 1 else 'B'
+        elif char == 'C':
+            if nxt == 'I' and after == 'A' or nxt == 'H' and prev != 'S':
+                code = 'X'
+            elif nxt in _FRONT_VOWELS:
+                code = '' if prev == 'S' else 'S'
+            else:
+                code = 'K'
+        elif char == 'D':
+            code = 'J' if nxt == 'G' and after in _FRONT_VOWELS else 'T'
+        elif char == 'G':
+            if nxt == 'H' and after and after not in _VOWELS:
+                code = ''
+            elif nxt == 'N' and (i + 2 == length or word[i + 2:] == 'ED'):
+                code = ''
+            elif prev == 'D' and nxt in _FRONT_VOWELS:
+                code = ''
+            elif nxt in _FRONT_VOWELS and prev != 'G':
+                code = 'J'
+            else:
+                code = 'K'
+        elif char == 'H':
+            if prev in 'CSPTG' or (prev in _VOWELS and nxt not in _VOWELS):
+                code = ''
+            else:
+                code = 'H'
+        elif char == 'K':
+            code = '' if prev == 'C' else 'K'
+        elif char == 'P':
+            code = 'F' if nxt == 'H' else 'P'
+        elif char == 'Q':
+            code = 'K'
+        elif char == 'S':
+            code = 'X' if nxt == 'H' or (nxt == 'I' and after in ('O', 'A')) else 'S'
+        elif char == 'T':
+            if nxt == 'I' and after in ('O', 'A'):
+                code = 'X'
+            elif nxt == 'H':
+                # θ 与 t 合并（原算法记为 0），拼写不确定时两者常混淆
+                code = 'T'
+            elif nxt == 'C' and after == 'H':
+                code = ''
+            else:
+                code = 'T'
+        elif char == 'V':
+            code = 'F'
+        elif char in 'WY':
+            code = char if nxt in _VOWELS else ''
+        elif char == 'X':
+            code = 'KS'
+        elif char == 'Z':
+            code = 'S'
+        else:
+            code = char
+        # 相邻的相同编码合并（如 DT -> T）
+        if code and (not key or key[-1] != code):
+            key.append(code)
+
+    return ''.join(key)[:max_length]
+
+
+def ipa_feature_key(text: str) -> str:
+    """按IPA发音特征分桶生成音标语音键
+
+    去除重音、长度和分隔标记后，每个音映射到特征桶，
+    相邻的相同桶合并，未知符号忽略。也接受拼写式输入。
+    """
+    folded = ''.join(char for char in fold_text(text) if char not in PHONETIC_MARKS)
+    for digraph, phone in _DIGRAPHS.items():
+        folded = folded.replace(digraph, phone)
+
+    key = []
+    for char in folded:
+        bucket = IPA_FEATURE_BUCKETS.get(char)
+        if bucket and (not key or key[-1] != bucket):
+            key.append(bucket)
+    return ''.join(key)
+
+
+def get_latin_algorithm() -> str:
+    """获取配置的拉丁写法语音算法"""
+    from app.config import config
+    algorithm = config.get('SEARCH', 'phonetic_algorithm', DEFAULT_LATIN_ALGORITHM).strip().lower()
+    return algorithm if algorithm in LATIN_ALGORITHMS else DEFAULT_LATIN_ALGORITHM
+
+
+def latin_sound_prefix(algorithm: str = None) -> str:
+    """拉丁写法语音键的存储前缀，用于识别生成时使用的算法"""
+    return LATIN_ALGORITHMS[algorithm or get_latin_algorithm()] + ':'
+
+
+def latin_sound_key(text: str, algorithm: str = None) -> str:
+    """生成拉丁写法的语音键（带算法前缀）"""
+    algorithm = algorithm or get_latin_algorithm()
+    encode = soundex if algorithm == 'soundex' else metaphone
+    return latin_sound_prefix(algorithm) + encode(text or '')
+
+
+def phonetic_sound_key(text: str) -> str:
+    """生成音标的语音键"""
+    return ipa_feature_key(text or '')
+
+
+def edit_distance(source: str, target: str) -> int:
+    """Levenshtein编辑距离"""
+    if source == target:
+        return 0
+    if len(source) < len(target):
+        source, target = target, source
+    if not target:
+        return len(source)
+
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source_char != target_char)
+            ))
+        previous = current
+    return previous[-1]
@@ -0,0 +1,248 @@
+"""
+N+1查询检测
+N+1 Query Detector
+
+在一个作用域（上下文管理器或pytest fixture）内记录执行的SQL，按语句形状
+（字面量和参数占位符归一化后的文本）分组；同一形状的查询执行超过阈值次数时
+警告或抛出异常，并报告触发查询的Python调用位置。
+
+典型的N+1来自循环中访问延迟加载的关系（如 ``word_entry.definitions``），
+每次访问都执行一条形状相同、参数不同的SELECT。
+"""
+
+import functools
+import re
+import sys
+import threading
+import warnings
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 默认阈值：同一形状的查询最多执行的次数
+DEFAULT_THRESHOLD = 5
+
+# 报告中每个形状显示的调用位置数
+MAX_CALL_SITES = 3
+
+# 调用链中记录的项目代码帧数
+CALL_CHAIN_DEPTH = 3
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_BATCHED = re.compile(r"\bIN \(\?\.\.\.\)", re.IGNORECASE)
+
+
+class NPlusOneWarning(UserWarning):
+    """同一形状的查询执行次数超过阈值"""
+
+
+class NPlusOneError(AssertionError):
+    """同一形状的查询执行次数超过阈值（raise模式）"""
+
+
+def normalize_statement(statement: str) -> str:
+    """语句形状：字面量替换为 ?，IN列表和多行VALUES折叠，空白合并"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _WHITESPACE.sub(' ', shape).strip()
+    shape = _PLACEHOLDER_LIST.sub('(?...)', shape)
+    return _VALUES_LIST.sub(r'\1', shape)
+
+
+@functools.lru_cache(maxsize=None)
+def _project_path(filename: str) -> Optional[str]:
+    """项目内文件的相对路径（项目外的文件和 ``<frozen ...>`` 等伪文件名返回None）"""
+    if filename.startswith('<'):
+        return None
+    try:
+        return Path(filename).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+def _project_frames(frame) -> List[tuple]:
+    """调用栈中项目代码的帧（由内向外）：(相对路径, 帧)"""
+    frames = []
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        relative = _project_path(filename) if filename != __file__ else None
+        if relative is not None:
+            frames.append((relative, frame))
+        frame = frame.f_back
+    return frames
+
+
+def _format_call_site(frames: List[tuple], depth: int = CALL_CHAIN_DEPTH) -> str:
+    sites = [f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}" for relative, frame in frames[:depth]]
+    return ' <- '.join(sites) or '<unknown>'
+
+
+def find_call_site(depth: int = CALL_CHAIN_DEPTH) -> str:
+    """触发查询的项目代码位置（由内向外，跳过SQLAlchemy等第三方代码和本模块）"""
+    return _format_call_site(_project_frames(sys._getframe(1)), depth)
+
+
+class QueryShape:
+    """一个语句形状的执行记录"""
+
+    def __init__(self, shape: str, statement: str):
+        self.shape = shape
+        self.example = statement
+        self.count = 0
+        self.max_per_call = 0
+        self.call_sites = Counter()
+
+    def to_dict(self) -> Dict:
+        return {
+            'shape': self.shape,
+            'count': self.count,
+            'max_per_call': self.max_per_call,
+            'call_sites': dict(self.call_sites.most_common(MAX_CALL_SITES)),
+        }
+
+
+class NPlusOneDetector:
+    """N+1查询检测器
+
+    作为上下文管理器使用，退出时检查；``mode`` 为 ``'raise'`` 时抛出 ``NPlusOneError``，
+    为 ``'warn'`` 时发出 ``NPlusOneWarning``，为 ``'record'`` 时只记录（通过 ``violations()`` 查看）。
+    默认只统计进入作用域的线程执行的读语句；写语句逐条执行通常是有意的，
+    需要时用 ``include_writes=True`` 一并统计。IN列表含多个参数的语句（如 ``selectinload``
+    按批加载关系）本身就是批量查询，不计入阈值检查。
+
+    ``per_call=True`` 时按调用计数：调用栈中最外层的、不在 ``caller_paths`` 下的项目代码帧
+    视为一次操作，只有单次操作内重复执行的形状才算N+1。用于整个测试，
+    使测试代码循环调用服务不被误报。
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, mode: str = 'raise', engine=None,
+                 include_writes: bool = False, ignore: List[str] = None,
+                 per_call: bool = False, caller_paths=('tests/',)):
+        if mode not in ('raise', 'warn', 'record'):
+            raise ValueError(f"未知的检测模式: {mode}")
+        self.threshold = threshold
+        self.mode = mode
+        self.engine = engine
+        self.include_writes = include_writes
+        self.ignore = [re.compile(pattern, re.IGNORECASE) for pattern in ignore or ()]
+        self.per_call = per_call
+        self.caller_paths = tuple(caller_paths)
+        self.shapes: Dict[str, QueryShape] = OrderedDict()
+        self.total_statements = 0
+        self._thread_id = None
+        self._active = False
+        # 当前操作的入口帧（保持引用，避免帧对象的id被复用）及其中各形状的次数
+        self._call_frame = None
+        self._call_counts = Counter()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        # 作用域内已有异常时不再掩盖它
+        if exc_type is None:
+            self.check()
+        return False
+
+    def start(self):
+        """开始记录"""
+        from sqlalchemy import event
+
+        if self._active:
+            return
+        self._thread_id = threading.get_ident()
+        event.listen(self._target(), 'before_cursor_execute', self._before_cursor_execute)
+        self._active = True
+
+    def stop(self):
+        """停止记录（已记录的数据保留）"""
+        from sqlalchemy import event
+
+        if not self._active:
+            return
+        event.remove(self._target(), 'before_cursor_execute', self._before_cursor_execute)
+        self._active = False
+
+    def reset(self):
+        """清空记录"""
+        self.shapes = OrderedDict()
+        self.total_statements = 0
+        self._call_frame = None
+        self._call_counts = Counter()
+
+    def violations(self) -> List[QueryShape]:
+        """执行次数超过阈值的形状（次数降序）"""
+        flagged = [shape for shape in self.shapes.values() if self._count(shape) > self.threshold]
+        return sorted(flagged, key=self._count, reverse=True)
+
+    def check(self) -> List[QueryShape]:
+        """按模式报告超过阈值的形状"""
+        flagged = self.violations()
+        if flagged and self.mode != 'record':
+            report = self.format_report(flagged)
+            if self.mode == 'raise':
+                raise NPlusOneError(report)
+            warnings.warn(report, NPlusOneWarning, stacklevel=3)
+        return flagged
+
+    def format_report(self, flagged: List[QueryShape] = None) -> str:
+        """文本报告"""
+        flagged = self.violations() if flagged is None else flagged
+        scope = "单次操作中" if self.per_call else ""
+        lines = [f"检测到 {len(flagged)} 个{scope}重复执行超过 {self.threshold} 次的查询:"]
+        for shape in flagged:
+            lines.append(f"  {self._count(shape)}次: {shape.shape[:200]}")
+            for site, count in shape.call_sites.most_common(MAX_CALL_SITES):
+                lines.append(f"    {count}x {site}")
+        return '\n'.join(lines)
+
+    def _count(self, shape: QueryShape) -> int:
+        return shape.max_per_call if self.per_call else shape.count
+
+    def _target(self):
+        if self.engine is not None:
+            return self.engine
+        from sqlalchemy.engine import Engine
+        return Engine
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != self._thread_id:
+            return
+        if not self.include_writes and not _READ_STATEMENT.match(statement):
+            return
+        if any(pattern.search(statement) for pattern in self.ignore):
+            return
+        shape_text = normalize_statement(statement)
+        if _BATCHED.search(shape_text):
+            return
+        shape = self.shapes.get(shape_text)
+        if shape is None:
+            shape = self.shapes[shape_text] = QueryShape(shape_text, statement)
+        frames = _project_frames(sys._getframe(1))
+        shape.count += 1
+        shape.call_sites[_format_call_site(frames)] += 1
+        self.total_statements += 1
+
+        if self.per_call:
+            entry = self._entry_frame(frames)
+            if entry is not self._call_frame:
+                self._call_frame = entry
+                self._call_counts = Counter()
+            self._call_counts[shape_text] += 1
+            shape.max_per_call = max(shape.max_per_call, self._call_counts[shape_text])
+
+    def _entry_frame(self, frames: List[tuple]):
+        """最外层的非调用方项目代码帧（直接由调用方代码执行的语句返回None）"""
+        for relative, frame in reversed(frames):
+            if not relative.startswith(self.caller_paths):
+                return frame
+        return None
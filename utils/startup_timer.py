@@ -0,0 +1,59 @@
+"""
+启动阶段计时
+Startup Phase Timer
+
+记录冷启动各阶段耗时，启动完成后写入日志
+"""
+
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+import logging
+
+
+class StartupTimer:
+    """启动计时器类"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.started_at = time.perf_counter()
+        self._last_mark = self.started_at
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, phase: str) -> float:
+        """记录从上一个标记到现在的阶段耗时（毫秒）"""
+        now = time.perf_counter()
+        elapsed = (now - self._last_mark) * 1000
+        self._last_mark = now
+        self.phases.append((phase, elapsed))
+        return elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        """计时一个代码块"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases.append((name, (now - start) * 1000))
+            self._last_mark = now
+
+    @property
+    def total_ms(self) -> float:
+        """从进程导入本模块到最后一个标记的总耗时"""
+        return (self._last_mark - self.started_at) * 1000
+
+    def report(self):
+        """输出各阶段耗时（仅一次）"""
+        if self.reported:
+            return
+        self.reported = True
+        for name, elapsed in self.phases:
+            self.logger.info(f"启动阶段 {name}: {elapsed:.1f}ms")
+        self.logger.info(f"启动总耗时: {self.total_ms:.1f}ms")
+
+
+# 全局启动计时器
+startup_timer = StartupTimer()
@@ -0,0 +1,138 @@
+"""
+笔画简化与打包
+Stroke Simplification and Packing
+
+- Ramer–Douglas–Peucker 算法简化手绘笔画
+- 符号列表与紧凑二进制格式（base64文本，可存入 ``IdsSymbol.symbols_data``）互转，
+  兼容旧的JSON格式
+"""
+
+import base64
+import json
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Sequence
+
+
+# 二进制格式标记；不带标记的数据按旧JSON格式解析
+PACKED_PREFIX = 'IDSB1:'
+
+# 符号类型编码
+_TYPE_CODES = {'line': 1, 'rectangle': 2, 'circle': 3}
+_CODE_TYPES = {code: name for name, code in _TYPE_CODES.items()}
+
+_HEADER = struct.Struct('<BI')
+_BOX = struct.Struct('<4f')
+
+
+def to_points(points: Sequence[float]) -> array:
+    """转换为 float32 坐标数组 [x0, y0, x1, y1, ...]"""
+    if isinstance(points, array) and points.typecode == 'f':
+        return points
+    return array('f', points)
+
+
+def simplify_stroke(points: Sequence[float], tolerance: float) -> array:
+    """Ramer–Douglas–Peucker 简化：去掉与保留折线距离不超过 ``tolerance`` 的点"""
+    points = to_points(points)
+    count = len(points) // 2
+    if tolerance <= 0 or count < 3:
+        return array('f', points)
+
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[first * 2], points[first * 2 + 1]
+        x2, y2 = points[last * 2], points[last * 2 + 1]
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+
+        max_distance, index = -1.0, -1
+        for i in range(first + 1, last):
+            px, py = points[i * 2] - x1, points[i * 2 + 1] - y1
+            if length_sq:
+                # 点到线段所在直线的距离平方
+                cross = dx * py - dy * px
+                distance = cross * cross / length_sq
+            else:
+                distance = px * px + py * py
+            if distance > max_distance:
+                max_distance, index = distance, i
+
+        if max_distance > tolerance_sq:
+            keep[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
+
+    simplified = array('f')
+    for i in range(count):
+        if keep[i]:
+            simplified.append(points[i * 2])
+            simplified.append(points[i * 2 + 1])
+    return simplified
+
+
+def _float_bytes(values: array) -> bytes:
+    """float32数组转换为小端字节"""
+    if sys.byteorder == 'big':
+        values = array('f', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def pack_symbols(symbols: List[Dict[str, Any]]) -> str:
+    """将符号列表打包为紧凑的二进制文本；含未知类型时保存为JSON"""
+    if any(symbol.get('type') not in _TYPE_CODES for symbol in symbols):
+        return json.dumps([_jsonable(symbol) for symbol in symbols])
+
+    buffer = bytearray()
+    for symbol in symbols:
+        code = _TYPE_CODES[symbol['type']]
+        if symbol['type'] == 'line':
+            points = to_points(symbol['points'])
+            buffer += _HEADER.pack(code, len(points))
+            buffer += _float_bytes(points)
+        else:
+            buffer += _HEADER.pack(code, 4)
+            buffer += _BOX.pack(*symbol['pos'], *symbol['size'])
+    return PACKED_PREFIX + base64.b64encode(bytes(buffer)).decode('ascii')
+
+
+def unpack_symbols(data: str) -> List[Dict[str, Any]]:
+    """解析 ``pack_symbols`` 的结果或旧的JSON数据，线条坐标为 float32 数组"""
+    if not data:
+        return []
+    if not data.startswith(PACKED_PREFIX):
+        symbols = json.loads(data)
+        for symbol in symbols:
+            if symbol.get('type') == 'line':
+                symbol['points'] = to_points(symbol.get('points', []))
+        return symbols
+
+    raw = base64.b64decode(data[len(PACKED_PREFIX):])
+    symbols = []
+    offset = 0
+    while offset < len(raw):
+        code, count = _HEADER.unpack_from(raw, offset)
+        offset += _HEADER.size
+        values = array('f')
+        values.frombytes(raw[offset:offset + count * 4])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        offset += count * 4
+
+        symbol_type = _CODE_TYPES[code]
+        if symbol_type == 'line':
+            symbols.append({'type': 'line', 'points': values})
+        else:
+            symbols.append({'type': symbol_type, 'pos': list(values[:2]), 'size': list(values[2:4])})
+    return symbols
+
+
+def _jsonable(symbol: Dict[str, Any]) -> Dict[str, Any]:
+    """坐标数组转换为列表以便JSON序列化"""
+    return {key: value.tolist() if isinstance(value, array) else value for key, value in symbol.items()}
@@ -0,0 +1,56 @@
+"""
+文本规范化工具
+Text Normalization Utilities
+
+生成用于搜索的规范化键：NFKD分解、去除变音符号、大小写折叠、IPA简化
+"""
+
+import re
+import unicodedata
+
+
+# IPA及特殊拉丁字母到ASCII近似的映射
+IPA_SIMPLIFICATIONS = {
+    'æ': 'ae', 'ɐ': 'a', 'ɑ': 'a', 'ɒ': 'o', 'ʌ': 'u',
+    'ɛ': 'e', 'ə': 'e', 'ɜ': 'e', 'ɘ': 'e', 'ɚ': 'er', 'ɝ': 'er',
+    'ɪ': 'i', 'ɨ': 'i', 'ʏ': 'y', 'ɔ': 'o', 'ɵ': 'o', 'ø': 'o', 'œ': 'oe',
+    'ʊ': 'u', 'ʉ': 'u', 'ɯ': 'u', 'ɤ': 'o',
+    'β': 'b', 'ɓ': 'b', 'ç': 'c', 'ɕ': 'sh', 'ð': 'th', 'θ': 'th', 'ɗ': 'd', 'ɖ': 'd',
+    'ɸ': 'f', 'ɡ': 'g', 'ɣ': 'g', 'ɢ': 'g', 'ɠ': 'g', 'ɦ': 'h', 'ħ': 'h', 'ɥ': 'y',
+    'ʝ': 'j', 'ɟ': 'j', 'ʤ': 'j', 'ʧ': 'ch', 'ɫ': 'l', 'ɬ': 'l', 'ɭ': 'l', 'ɮ': 'l', 'ʎ': 'ly',
+    'ɱ': 'm', 'ɲ': 'ny', 'ŋ': 'ng', 'ɳ': 'n', 'ɴ': 'n',
+    'ɹ': 'r', 'ɾ': 'r', 'ɽ': 'r', 'ʀ': 'r', 'ʁ': 'r', 'ɻ': 'r',
+    'ʃ': 'sh', 'ʂ': 'sh', 'ʒ': 'zh', 'ʐ': 'zh', 'ʑ': 'zh', 'ʈ': 't',
+    'ʋ': 'v', 'ʍ': 'w', 'χ': 'x', 'ʎ': 'ly', 'ʔ': '', 'ʕ': '',
+    'ß': 'ss', 'đ': 'd', 'ł': 'l', 'ı': 'i', 'ŧ': 't',
+}
+
+# 音标中的分隔符、重音与长度标记
+PHONETIC_MARKS = set("[]/\\|()'ˈˌːˑ.‿‖")
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fold_text(text: str) -> str:
+    """NFKD分解、去除变音符号并大小写折叠"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE.sub(' ', stripped.casefold()).strip()
+
+
+def simplify_ipa(text: str) -> str:
+    """将IPA字符替换为ASCII近似"""
+    return ''.join(IPA_SIMPLIFICATIONS.get(char, char) for char in text)
+
+
+def normalize_search_key(text: str) -> str:
+    """生成字序号、拉丁写法等字段的搜索键"""
+    return simplify_ipa(fold_text(text))
+
+
+def normalize_phonetic_key(text: str) -> str:
+    """生成音标字段的搜索键（额外去除分隔符和重音标记）"""
+    folded = ''.join(char for char in fold_text(text) if char not in PHONETIC_MARKS)
+    return simplify_ipa(folded).strip()
@@ -0,0 +1,63 @@
+"""
+带过期时间的缓存
+TTL Cache
+
+线程安全，条目超过存活时间后视为不存在，超出容量时淘汰最久未用的条目
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """带过期时间的LRU缓存类"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取未过期的值"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """写入值（可单独指定存活时间）"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """移除并返回值"""
+        with self._lock:
+            item = self._items.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._items.clear()
+
+
+_MISSING = object()
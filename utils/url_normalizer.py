@@ -0,0 +1,62 @@
+"""
+网址规范化工具
+URL Normalization Utilities
+
+将写法不同但指向同一页面的网址归一，用于书签去重：
+忽略协议（http/https）、大小写主机名、www前缀、默认端口、片段、
+末尾斜杠、跟踪参数和查询参数顺序。
+"""
+
+import hashlib
+from urllib.parse import urlsplit, parse_qsl, urlencode, unquote, quote
+
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', 'ref', 'spm'}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'80', '443'}
+
+
+def _is_tracking_param(name: str) -> bool:
+    """是否为跟踪参数"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """生成网址的规范形式（不含协议），用于判断两个网址是否相同"""
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'http://' + url
+
+    parts = urlsplit(url)
+    host = (parts.hostname or '').rstrip('.').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and str(port) not in DEFAULT_PORTS:
+        host = f"{host}:{port}"
+
+    # 统一百分号编码，去掉末尾斜杠
+    path = quote(unquote(parts.path), safe="/:@!$&'()*+,;=-._~")
+    path = path.rstrip('/')
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    normalized = host + path
+    if query:
+        normalized += '?' + urlencode(query)
+    return normalized
+
+
+def url_hash(url: str) -> str:
+    """规范化网址的SHA-1摘要（40位十六进制）"""
+    return hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
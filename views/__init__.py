@@ -3,20 +3,26 @@
 Views Layer
 
 包含所有用户界面组件和屏幕
+
+屏幕类按需导入，导入主界面时不会连带加载其他屏幕模块。
 """
 
-from .base_screen import BaseScreen
-from .main_screen import MainScreen
-from .word_list_screen import WordListScreen
-from .word_detail_screen import WordDetailScreen
-from .word_edit_screen import WordEditScreen
-from .advanced_search_screen import AdvancedSearchScreen
-from .settings_screen import SettingsScreen
-from .import_export_screen import ImportExportScreen
-from .tools_screen import ToolsScreen
-from .url_bookmark_screen import UrlBookmarkScreen
-from .memo_words_screen import MemoWordsScreen
-from .ids_editor_screen import IdsEditorScreen
+import importlib
+
+_SCREEN_MODULES = {
+    'BaseScreen': '.base_screen',
+    'MainScreen': '.main_screen',
+    'WordListScreen': '.word_list_screen',
+    'WordDetailScreen': '.word_detail_screen',
+    'WordEditScreen': '.word_edit_screen',
+    'AdvancedSearchScreen': '.advanced_search_screen',
+    'SettingsScreen': '.settings_screen',
+    'ImportExportScreen': '.import_export_screen',
+    'ToolsScreen': '.tools_screen',
+    'UrlBookmarkScreen': '.url_bookmark_screen',
+    'MemoWordsScreen': '.memo_words_screen',
+    'IdsEditorScreen': '.ids_editor_screen',
+}
 
 __all__ = [
     'BaseScreen',
@@ -32,3 +38,10 @@ __all__ = [
     'MemoWordsScreen',
     'IdsEditorScreen'
 ]
+
+
+def __getattr__(name):
+    if name in _SCREEN_MODULES:
+        module = importlib.import_module(_SCREEN_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,13 +15,18 @@ from kivymd.uix.chip import MDChip
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.list import MDList, OneLineListItem
 from kivy.metrics import dp
+from datetime import datetime
 
 from .base_screen import BaseScreen
 from .components.search_bar import SearchBar
 from .components.word_card import WordCard
 from utils.logger import get_logger
+from utils.helpers import format_datetime
 from services.search_service import search_service
+from services.search_executor import search_executor
 from services.dictionary_service import dictionary_service
+from services.database_service import db_service
+from services.warm_start_service import warm_start_service
 
 
 class AdvancedSearchScreen(BaseScreen):
@@ -35,6 +40,7 @@ class AdvancedSearchScreen(BaseScreen):
         self.search_history = []
         
         self._setup_ui()
+        self._load_history()
     
     def get_screen_title(self) -> str:
         return "高级搜索"
@@ -191,7 +197,7 @@ class AdvancedSearchScreen(BaseScreen):
         mode_layout.add_widget(mode_title)
         
         # 搜索模式选择
-        self.search_mode = 'fuzzy'  # fuzzy, regex, exact
+        self.search_mode = 'fuzzy'  # fuzzy, regex, exact, sound
         
         mode_buttons_layout = MDBoxLayout(
             orientation='horizontal',
@@ -200,25 +206,32 @@ class AdvancedSearchScreen(BaseScreen):
         
         self.fuzzy_btn = MDRaisedButton(
             text="模糊搜索",
-            size_hint_x=0.33,
+            size_hint_x=0.25,
             on_release=lambda x: self._set_search_mode('fuzzy')
         )
         mode_buttons_layout.add_widget(self.fuzzy_btn)
         
         self.regex_btn = MDRaisedButton(
             text="正则表达式",
-            size_hint_x=0.33,
+            size_hint_x=0.25,
             on_release=lambda x: self._set_search_mode('regex')
         )
         mode_buttons_layout.add_widget(self.regex_btn)
         
         self.exact_btn = MDRaisedButton(
             text="精确匹配",
-            size_hint_x=0.33,
+            size_hint_x=0.25,
             on_release=lambda x: self._set_search_mode('exact')
         )
         mode_buttons_layout.add_widget(self.exact_btn)
         
+        self.sound_btn = MDRaisedButton(
+            text="近音查找",
+            size_hint_x=0.25,
+            on_release=lambda x: self._set_search_mode('sound')
+        )
+        mode_buttons_layout.add_widget(self.sound_btn)
+        
         mode_layout.add_widget(mode_buttons_layout)
         layout.add_widget(mode_layout)
         
@@ -389,6 +402,7 @@ class AdvancedSearchScreen(BaseScreen):
         self.fuzzy_btn.md_bg_color = self.theme_cls.primary_color if mode == 'fuzzy' else self.theme_cls.primary_light
         self.regex_btn.md_bg_color = self.theme_cls.primary_color if mode == 'regex' else self.theme_cls.primary_light
         self.exact_btn.md_bg_color = self.theme_cls.primary_color if mode == 'exact' else self.theme_cls.primary_light
+        self.sound_btn.md_bg_color = self.theme_cls.primary_color if mode == 'sound' else self.theme_cls.primary_light
         
         self.logger.info(f"搜索模式已设置为: {mode}")
     
@@ -413,46 +427,76 @@ class AdvancedSearchScreen(BaseScreen):
             
             self.current_search_params = search_params
             
-            # 添加到搜索历史
-            self._add_to_history(query, search_params)
-            
-            # 执行搜索
-            results = search_service.advanced_search(search_params)
-            
-            # 显示结果
-            self._display_results(results)
+            # 清空旧结果，结果按批次流式追加
+            self.search_results = []
+            self.results_container.clear_widgets()
+            self.results_count.text = "搜索中..."
             
-            self.logger.info(f"搜索完成，找到 {len(results)} 条结果")
+            # 在后台线程执行流式搜索
+            search_executor.submit_stream(
+                search_service.iter_advanced_search,
+                args=(search_params,),
+                batch_callback=self._append_results,
+                complete_callback=self._on_search_complete,
+                error_callback=self._on_search_failed,
+                delay=0,
+                cancellable=True
+            )
             
         except Exception as e:
             self.logger.error(f"搜索失败: {e}")
             self.show_snackbar("搜索失败，请检查搜索条件")
     
+    def _append_results(self, batch):
+        """追加一批搜索结果（主线程）"""
+        self.search_results.extend(batch)
+        self.results_count.text = f"已找到 {len(self.search_results)} 条"
+        
+        for word_entry in batch:
+            word_card = WordCard(word_entry=word_entry)
+            # 这里可以添加高亮功能
+            self._highlight_search_results(word_card, self.current_search_params['query'])
+            self.results_container.add_widget(word_card)
+    
+    def _on_search_complete(self, total):
+        """流式搜索完成回调（主线程）"""
+        self.results_count.text = f"共 {total} 条"
+        if not total:
+            self._show_no_results()
+        
+        # 添加到搜索历史
+        self._add_to_history(self.current_search_params['query'], self.current_search_params, total)
+        self.logger.info(f"搜索完成，找到 {total} 条结果")
+    
+    def _on_search_failed(self, error):
+        """流式搜索失败回调（主线程）"""
+        self.logger.error(f"搜索失败: {error}")
+        self.results_count.text = ""
+        self.show_snackbar("搜索失败，请检查搜索条件")
+    
+    def _show_no_results(self):
+        """显示无结果提示"""
+        no_results_label = MDLabel(
+            text="未找到匹配的词条",
+            theme_text_color="Secondary",
+            font_style="Body1",
+            halign="center"
+        )
+        self.results_container.add_widget(no_results_label)
     
     def _display_results(self, results):
         """显示搜索结果"""
         # 清空结果容器
         self.results_container.clear_widgets()
-        
-        # 更新统计信息
-        self.results_count.text = f"共 {len(results)} 条"
+        self.search_results = []
         
         if not results:
-            no_results_label = MDLabel(
-                text="未找到匹配的词条",
-                theme_text_color="Secondary",
-                font_style="Body1",
-                halign="center"
-            )
-            self.results_container.add_widget(no_results_label)
+            self.results_count.text = "共 0 条"
+            self._show_no_results()
             return
         
-        # 显示结果
-        for word_entry in results:
-            word_card = WordCard(word_entry=word_entry)
-            # 这里可以添加高亮功能
-            self._highlight_search_results(word_card, self.current_search_params['query'])
-            self.results_container.add_widget(word_card)
+        self._append_results(results)
+        self.results_count.text = f"共 {len(results)} 条"
     
     def _highlight_search_results(self, word_card, query):
         """高亮搜索结果"""
@@ -461,12 +505,15 @@ class AdvancedSearchScreen(BaseScreen):
         word_card.highlight_query = query
         pass
     
-    def _add_to_history(self, query, params):
+    def _add_to_history(self, query, params, result_count=0):
         """添加到搜索历史"""
+        # 持久化由搜索历史服务在后台批量完成
+        search_service.save_search_history(query, params, result_count)
+        
         history_item = {
             'query': query,
             'params': params,
-            'timestamp': self._get_current_time()
+            'last_used_at': datetime.now()
         }
         
         # 避免重复
@@ -483,13 +530,22 @@ class AdvancedSearchScreen(BaseScreen):
         
         self._update_history_display()
     
+    def _load_history(self):
+        """从数据库加载搜索历史（数据库尚未打开时使用启动快照）"""
+        if db_service.is_loaded:
+            self.search_history = search_service.get_search_history(limit=10)
+        else:
+            self.search_history = warm_start_service.get_recent_searches()
+        self._update_history_display()
+    
     def _update_history_display(self):
         """更新历史显示"""
         self.history_list.clear_widgets()
         
         for item in self.search_history:
+            timestamp = format_datetime(item.get('last_used_at'), "%m-%d %H:%M")
             history_list_item = OneLineListItem(
-                text=f"{item['query']} ({item['timestamp']})",
+                text=f"{item['query']} ({timestamp})",
                 on_release=lambda x, item=item: self._use_history_item(item)
             )
             self.history_list.add_widget(history_list_item)
@@ -500,9 +556,9 @@ class AdvancedSearchScreen(BaseScreen):
         
         # 恢复搜索参数
         params = item['params']
-        self.case_sensitive_switch.active = params['case_sensitive']
-        self.search_translation_switch.active = params['search_translation']
-        self._set_search_mode(params['search_mode'])
+        self.case_sensitive_switch.active = params.get('case_sensitive', False)
+        self.search_translation_switch.active = params.get('search_translation', True)
+        self._set_search_mode(params.get('search_mode', 'fuzzy'))
         
         # 恢复字段选择
         for field, switch in self.field_switches.items():
@@ -512,16 +568,12 @@ class AdvancedSearchScreen(BaseScreen):
     
     def _clear_history(self, instance):
         """清除搜索历史"""
+        search_service.clear_search_history()
         self.search_history = []
         self._update_history_display()
         self.logger.info("搜索历史已清除")
     
-    def _get_current_time(self):
-        """获取当前时间字符串"""
-        from datetime import datetime
-        return datetime.now().strftime("%H:%M")
-    
     def refresh_data(self):
         """刷新数据"""
         # 重新加载搜索历史
-        self._update_history_display()
+        self._load_history()
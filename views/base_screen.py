@@ -21,9 +21,10 @@ class BaseScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.logger = get_logger(self.__class__.__name__)
-        self._setup_ui()
+        # 子类在自己的 __init__ 中调用各自的 _setup_ui，这里只搭建公共框架
+        self._setup_base_layout()
     
-    def _setup_ui(self):
+    def _setup_base_layout(self):
         """设置基础UI"""
         # 主布局
         self.main_layout = MDBoxLayout(
@@ -125,3 +126,13 @@ class BaseScreen(MDScreen):
     def refresh_data(self):
         """刷新数据，子类可以重写"""
         pass
+    
+    def navigate_to(self, screen_name: str):
+        """通过上层的屏幕缓存导航到指定屏幕，返回目标屏幕"""
+        widget = self.parent
+        while widget is not None:
+            if hasattr(widget, 'open_screen'):
+                return widget.open_screen(screen_name)
+            widget = widget.parent
+        self.logger.warning(f"未找到可导航的主界面: {screen_name}")
+        return None
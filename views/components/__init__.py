@@ -14,6 +14,7 @@ from .ink_card import InkCard, InkInfoCard, InkActionCard, InkListCard
 from .ink_button import InkButton, InkIconButton, InkFloatingButton, InkButtonGroup, InkToggleButton
 from .ink_input import InkTextField, InkSearchField, InkPasswordField, InkFormField, InkForm
 from .ink_navigation import InkToolbar, InkNavigationDrawer, InkNavigationItem, InkTabBar, InkBreadcrumb, InkPagination
+from .frame_overlay import FrameOverlay, show_frame_overlay, hide_frame_overlay
 
 __all__ = [
     'ImagePicker',
@@ -45,6 +46,9 @@ __all__ = [
     'InkNavigationItem',
     'InkTabBar',
     'InkBreadcrumb',
-    'InkPagination'
+    'InkPagination',
+    'FrameOverlay',
+    'show_frame_overlay',
+    'hide_frame_overlay'
 ]
 
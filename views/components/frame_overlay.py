@@ -0,0 +1,93 @@
+"""
+帧时间浮层组件
+Frame Time Overlay Component
+
+在窗口左上角显示当前屏幕的帧率、p95帧时间和长帧数，随帧时间监测开关显示或隐藏。
+"""
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp, sp
+from kivy.uix.label import Label
+
+from utils.logger import get_logger
+
+
+class FrameOverlay(Label):
+    """帧时间浮层（不拦截触摸事件）"""
+
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, monitor, **kwargs):
+        kwargs.setdefault('font_size', sp(11))
+        kwargs.setdefault('size_hint', (None, None))
+        kwargs.setdefault('halign', 'left')
+        super().__init__(**kwargs)
+        self.logger = get_logger(self.__class__.__name__)
+        self.monitor = monitor
+        self._refresh_event = None
+
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self._background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(texture_size=self._update_layout, pos=self._update_background)
+        Window.bind(size=self._update_layout)
+
+    def show(self):
+        """显示浮层并开始刷新"""
+        if self.parent is None:
+            Window.add_widget(self)
+        if self._refresh_event is None:
+            self._refresh_event = Clock.schedule_interval(self._refresh, self.REFRESH_INTERVAL)
+        self._refresh(0)
+
+    def hide(self):
+        """隐藏浮层"""
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        if self.parent is not None:
+            self.parent.remove_widget(self)
+
+    def on_touch_down(self, touch):
+        return False
+
+    def _refresh(self, dt):
+        """显示当前屏幕的统计"""
+        try:
+            screen = self.monitor.screen_provider()
+            stats = self.monitor.get_stats().get(screen)
+            if stats:
+                self.text = (f"{screen}  {stats['fps']:.0f} fps  p95 {stats['p95']:.0f}ms  "
+                             f"长帧 {stats['long_frames']}")
+            else:
+                self.text = f"{screen}  --"
+        except Exception as e:
+            self.logger.error(f"刷新帧时间浮层失败: {e}")
+
+    def _update_layout(self, *args):
+        self.size = (self.texture_size[0] + dp(12), self.texture_size[1] + dp(6))
+        self.pos = (dp(4), Window.height - self.height - dp(4))
+        self._update_background()
+
+    def _update_background(self, *args):
+        self._background.pos = self.pos
+        self._background.size = self.size
+
+
+_overlay = None
+
+
+def show_frame_overlay(monitor):
+    """显示全局帧时间浮层"""
+    global _overlay
+    if _overlay is None:
+        _overlay = FrameOverlay(monitor)
+    _overlay.show()
+
+
+def hide_frame_overlay():
+    """隐藏全局帧时间浮层"""
+    if _overlay is not None:
+        _overlay.hide()
@@ -11,12 +11,15 @@ from kivymd.uix.chip import MDChip
 from kivy.metrics import dp
 
 from utils.logger import get_logger
+from app.config import config
 
 
 class SearchBar(MDBoxLayout):
     """搜索栏组件"""
     
     def __init__(self, **kwargs):
+        # 搜索回调，未设置时向上查找实现了on_search的父组件
+        self.search_callback = kwargs.pop('search_callback', None)
         super().__init__(**kwargs)
         self.logger = get_logger(self.__class__.__name__)
         self.orientation = 'horizontal'
@@ -28,6 +31,8 @@ class SearchBar(MDBoxLayout):
         self.search_type = 'all'  # all, word_id, latin_form, phonetic, definitions
         self.case_sensitive = False
         self.fuzzy_search = True
+        # 边输入边搜索（由搜索执行器负责防抖）
+        self.live_search = config.get_boolean('SEARCH', 'live_search', True)
         
         self._setup_ui()
     
@@ -49,6 +54,7 @@ class SearchBar(MDBoxLayout):
             size_hint_x=0.7,
             on_text_validate=self._on_search
         )
+        self.search_field.bind(text=self._on_text_changed)
         self.add_widget(self.search_field)
         
         # 搜索按钮
@@ -142,16 +148,31 @@ class SearchBar(MDBoxLayout):
         query = self.search_field.text.strip()
         if query:
             self.logger.info(f"搜索: {query}, 类型: {self.search_type}")
-            # 这里应该触发搜索事件
             self._trigger_search_event(query)
         else:
             self.logger.warning("搜索关键词为空")
     
-    def _trigger_search_event(self, query):
+    def _on_text_changed(self, instance, text):
+        """输入变化时触发增量搜索"""
+        if not self.live_search:
+            return
+        # 清空输入时同样通知父组件，以便恢复完整列表
+        self._trigger_search_event(text.strip(), immediate=False)
+    
+    def _trigger_search_event(self, query, immediate=True):
         """触发搜索事件"""
-        # 这里可以发送事件给父组件
-        if hasattr(self.parent, 'on_search'):
-            self.parent.on_search(query, self.search_type, self.case_sensitive, self.fuzzy_search)
+        if self.search_callback:
+            self.search_callback(query, self.search_type, self.case_sensitive,
+                                 self.fuzzy_search, immediate=immediate)
+            return
+        
+        # 向上查找处理搜索事件的组件
+        target = self.parent
+        while target is not None and not hasattr(target, 'on_search'):
+            target = target.parent
+        if target is not None:
+            target.on_search(query, self.search_type, self.case_sensitive,
+                             self.fuzzy_search, immediate=immediate)
     
     def get_search_params(self):
         """获取搜索参数"""
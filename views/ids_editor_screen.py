@@ -13,52 +13,67 @@ from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.menu import MDDropdownMenu
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle, Line, Ellipse
+from kivy.graphics import Color, Rectangle, Line, Ellipse, InstructionGroup
 from kivy.metrics import dp
 from kivy.clock import Clock
 import os
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
 import io
+from array import array
 
 from .base_screen import BaseScreen
+from app.config import config
 from utils.logger import get_logger
 from services.ids_service import ids_service
+from utils.stroke_codec import simplify_stroke
+from services.ids_render_service import render_symbols
+from utils.ids_parser import is_valid_ids
 
 
 class IdsCanvas(Widget):
-    """IDS符号画布"""
+    """IDS符号画布
+    
+    每个符号对应一个 ``InstructionGroup``，绘制时只更新正在画的笔画；
+    笔画坐标保存为 float32 数组，抬笔时按配置的容差简化。
+    """
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.symbols = []
         self.current_symbol = None
         self.drawing = False
-        self.bind(size=self._update_canvas)
+        self.stroke_tolerance = config.get_float('IDS', 'stroke_tolerance', 1.0)
+        self._groups = []
+        self._active_line = None
+        
+        with self.canvas.before:
+            Color(1, 1, 1, 1)
+            self._background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_canvas, size=self._update_canvas)
     
     def _update_canvas(self, *args):
-        """更新画布"""
-        self.canvas.clear()
-        with self.canvas:
-            # 背景
-            Color(1, 1, 1, 1)
-            Rectangle(pos=self.pos, size=self.size)
-            
-            # 绘制符号
-            for symbol in self.symbols:
-                self._draw_symbol(symbol)
+        """更新画布背景"""
+        self._background.pos = self.pos
+        self._background.size = self.size
+    
+    def redraw(self):
+        """按 ``symbols`` 重建全部符号的绘制指令"""
+        for group in self._groups:
+            self.canvas.remove(group)
+        self._groups = [self._add_symbol_group(symbol) for symbol in self.symbols]
     
-    def _draw_symbol(self, symbol):
-        """绘制符号"""
+    def _add_symbol_group(self, symbol):
+        """为符号创建绘制指令组并加入画布"""
+        group = InstructionGroup()
+        group.add(Color(0, 0, 0, 1))
         if symbol['type'] == 'rectangle':
-            Color(0, 0, 0, 1)
-            Rectangle(pos=symbol['pos'], size=symbol['size'])
+            group.add(Rectangle(pos=symbol['pos'], size=symbol['size']))
         elif symbol['type'] == 'line':
-            Color(0, 0, 0, 1)
-            Line(points=symbol['points'], width=2)
+            group.add(Line(points=symbol['points'], width=2))
         elif symbol['type'] == 'circle':
-            Color(0, 0, 0, 1)
-            Ellipse(pos=symbol['pos'], size=symbol['size'])
+            group.add(Ellipse(pos=symbol['pos'], size=symbol['size']))
+        self.canvas.add(group)
+        return group
     
     def on_touch_down(self, touch):
         """触摸开始"""
@@ -66,24 +81,33 @@ class IdsCanvas(Widget):
             self.drawing = True
             self.current_symbol = {
                 'type': 'line',
-                'points': [touch.x, touch.y]
+                'points': array('f', (touch.x, touch.y))
             }
+            group = self._add_symbol_group(self.current_symbol)
+            self._active_line = group.children[-1]
+            self._groups.append(group)
             return True
         return False
     
     def on_touch_move(self, touch):
         """触摸移动"""
         if self.drawing and self.current_symbol:
-            self.current_symbol['points'].extend([touch.x, touch.y])
-            self._update_canvas()
+            points = self.current_symbol['points']
+            points.append(touch.x)
+            points.append(touch.y)
+            self._active_line.points = points
             return True
         return False
     
     def on_touch_up(self, touch):
         """触摸结束"""
         if self.drawing and self.current_symbol:
+            points = simplify_stroke(self.current_symbol['points'], self.stroke_tolerance)
+            self.current_symbol['points'] = points
+            self._active_line.points = points
             self.symbols.append(self.current_symbol)
             self.current_symbol = None
+            self._active_line = None
             self.drawing = False
             return True
         return False
@@ -91,25 +115,28 @@ class IdsCanvas(Widget):
     def clear_canvas(self):
         """清空画布"""
         self.symbols = []
-        self._update_canvas()
+        self.redraw()
     
     def add_rectangle(self, pos, size):
         """添加矩形"""
-        self.symbols.append({
+        self._add_symbol({
             'type': 'rectangle',
             'pos': pos,
             'size': size
         })
-        self._update_canvas()
     
     def add_circle(self, pos, size):
         """添加圆形"""
-        self.symbols.append({
+        self._add_symbol({
             'type': 'circle',
             'pos': pos,
             'size': size
         })
-        self._update_canvas()
+    
+    def _add_symbol(self, symbol):
+        """添加符号并只绘制该符号"""
+        self.symbols.append(symbol)
+        self._groups.append(self._add_symbol_group(symbol))
 
 
 class IdsEditorScreen(BaseScreen):
@@ -369,25 +396,8 @@ class IdsEditorScreen(BaseScreen):
                 self.show_snackbar("画布为空，无法导出")
                 return
             
-            # 创建PIL图像
-            img = Image.new('RGB', self.canvas_size, 'white')
-            draw = ImageDraw.Draw(img)
-            
-            # 绘制符号
-            for symbol in self.canvas_widget.symbols:
-                if symbol['type'] == 'rectangle':
-                    pos = symbol['pos']
-                    size = symbol['size']
-                    draw.rectangle([pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]], outline='black')
-                elif symbol['type'] == 'circle':
-                    pos = symbol['pos']
-                    size = symbol['size']
-                    draw.ellipse([pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]], outline='black')
-                elif symbol['type'] == 'line':
-                    points = symbol['points']
-                    if len(points) >= 4:
-                        for i in range(0, len(points) - 2, 2):
-                            draw.line([points[i], points[i+1], points[i+2], points[i+3]], fill='black', width=2)
+            # 超采样渲染为导出尺寸
+            img = render_symbols(self.canvas_widget.symbols, self.canvas_size, 'export')
             
             # 保存图片
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -456,6 +466,13 @@ class IdsEditorScreen(BaseScreen):
         )
         form_layout.add_widget(description_field)
         
+        # 结构描述
+        ids_field = MDTextField(
+            hint_text="IDS结构（如 ⿰氵⿱木目）",
+            mode="rectangle"
+        )
+        form_layout.add_widget(ids_field)
+        
         from kivymd.uix.button import MDRaisedButton
         
         dialog = MDDialog(
@@ -469,28 +486,34 @@ class IdsEditorScreen(BaseScreen):
                 ),
                 MDRaisedButton(
                     text="保存",
-                    on_release=lambda x: self._confirm_save_symbol(dialog, name_field, description_field)
+                    on_release=lambda x: self._confirm_save_symbol(dialog, name_field, description_field, ids_field)
                 )
             ]
         )
         dialog.open()
     
-    def _confirm_save_symbol(self, dialog, name_field, description_field):
+    def _confirm_save_symbol(self, dialog, name_field, description_field, ids_field=None):
         """确认保存符号"""
         try:
             name = name_field.text.strip()
             description = description_field.text.strip()
+            ids_string = ids_field.text.strip() if ids_field else ''
             
             if not name:
                 self.show_snackbar("符号名称不能为空")
                 return
             
+            if ids_string and not is_valid_ids(ids_string):
+                self.show_snackbar("IDS结构格式不正确")
+                return
+            
             # 保存符号数据
             symbol_data = {
                 'name': name,
                 'description': description,
                 'symbols': self.canvas_widget.symbols,
-                'canvas_size': self.canvas_size
+                'canvas_size': self.canvas_size,
+                'ids_string': ids_string
             }
             
             ids_service.save_symbol(symbol_data)
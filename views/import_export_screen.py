@@ -706,7 +706,8 @@ class ImportExportScreen(BaseScreen):
         # 在后台线程中执行导入
         self.operation_thread = threading.Thread(
             target=self._execute_import_operation,
-            args=(format_type, file_path)
+            args=(format_type, file_path),
+            name=f"import-{format_type}"
         )
         self.operation_thread.daemon = True
         self.operation_thread.start()
@@ -721,7 +722,8 @@ class ImportExportScreen(BaseScreen):
         # 在后台线程中执行导出
         self.operation_thread = threading.Thread(
             target=self._execute_export_operation,
-            args=(format_type, options)
+            args=(format_type, options),
+            name=f"export-{format_type}"
         )
         self.operation_thread.daemon = True
         self.operation_thread.start()
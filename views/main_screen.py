@@ -18,6 +18,8 @@ from kivy.metrics import dp
 from kivy.uix.boxlayout import BoxLayout
 
 from .base_screen import BaseScreen
+from .screen_cache import ScreenCache
+from app.config import config
 from utils.logger import get_logger
 
 
@@ -29,6 +31,11 @@ class MainScreen(BaseScreen):
         self.logger = get_logger(self.__class__.__name__)
         self._setup_navigation()
         self._setup_content()
+        self._register_screens()
+        
+        # 空闲时预先构造常用屏幕（可选）
+        prewarm = [name.strip() for name in config.get('UI', 'prewarm_screens', '').split(',')]
+        self.screens.prewarm([name for name in prewarm if name])
     
     def get_screen_title(self) -> str:
         return "离线词典"
@@ -98,17 +105,7 @@ class MainScreen(BaseScreen):
         nav_list = MDList()
         
         # 主菜单项
-        menu_items = [
-            ("home", "词库首页", "home"),
-            ("search", "搜索词条", "magnify"),
-            ("favorites", "收藏夹", "heart"),
-            ("add", "添加词条", "plus"),
-            ("tools", "工具", "tools"),
-            ("settings", "设置", "cog"),
-            ("about", "关于", "information")
-        ]
-        
-        for screen_name, title, icon in menu_items:
+        for screen_name, title, icon in self._get_menu_items():
             item = OneLineListItem(
                 text=title,
                 on_release=lambda x, name=screen_name: self._navigate_to_screen(name)
@@ -126,10 +123,53 @@ class MainScreen(BaseScreen):
         # 主内容区域
         self.screen_manager = MDScreenManager()
         self.nav_layout.add_widget(self.screen_manager)
+        self.screens = ScreenCache(self.screen_manager)
         
         # 添加导航抽屉
         self.nav_layout.add_widget(self.nav_drawer)
     
+    def _get_menu_items(self):
+        """导航菜单项 (屏幕名称, 标题, 图标)"""
+        return [
+            ("home", "词库首页", "home"),
+            ("word_list", "词条列表", "format-list-bulleted"),
+            ("search", "搜索词条", "magnify"),
+            ("favorites", "收藏夹", "heart"),
+            ("add", "添加词条", "plus"),
+            ("tools", "工具", "tools"),
+            ("settings", "设置", "cog"),
+            ("about", "关于", "information")
+        ]
+    
+    def _register_screens(self):
+        """注册屏幕工厂，屏幕在首次导航时才导入和构造"""
+        self.screens.register_class("word_list", "views.word_list_screen", "WordListScreen")
+        self.screens.register("favorites", self._create_favorites_screen)
+        self.screens.register_class("search", "views.advanced_search_screen", "AdvancedSearchScreen")
+        self.screens.register_class("add", "views.word_edit_screen", "WordEditScreen")
+        self.screens.register_class("tools", "views.tools_screen", "ToolsScreen")
+        self.screens.register_class("settings", "views.settings_screen", "SettingsScreen")
+        self.screens.register_class("import_export", "views.import_export_screen", "ImportExportScreen")
+        self.screens.register_class("url_bookmarks", "views.url_bookmark_screen", "UrlBookmarkScreen")
+        self.screens.register_class("memo_words", "views.memo_words_screen", "MemoWordsScreen")
+        self.screens.register_class("ids_editor", "views.ids_editor_screen", "IdsEditorScreen")
+    
+    def _create_favorites_screen(self, name):
+        """创建仅显示收藏词条的列表屏幕"""
+        from .word_list_screen import WordListScreen
+        screen = WordListScreen(name=name)
+        screen._set_filter(True)
+        return screen
+    
+    def open_screen(self, screen_name: str):
+        """导航到已注册的屏幕，返回屏幕实例"""
+        try:
+            return self.screens.show(screen_name)
+        except Exception as e:
+            self.logger.error(f"打开屏幕失败 {screen_name}: {e}")
+            self.show_snackbar("界面加载失败")
+            return None
+    
     def _setup_content(self):
         """设置主内容"""
         # 创建主屏幕内容
@@ -205,12 +245,13 @@ class MainScreen(BaseScreen):
             orientation="vertical",
             spacing=dp(4)
         )
-        total_item.add_widget(MDLabel(
+        self.total_count_label = MDLabel(
             text="0",
             theme_text_color="Primary",
             font_style="H4",
             halign="center"
-        ))
+        )
+        total_item.add_widget(self.total_count_label)
         total_item.add_widget(MDLabel(
             text="总词条",
             theme_text_color="Secondary",
@@ -224,12 +265,13 @@ class MainScreen(BaseScreen):
             orientation="vertical",
             spacing=dp(4)
         )
-        favorite_item.add_widget(MDLabel(
+        self.favorite_count_label = MDLabel(
             text="0",
             theme_text_color="Primary",
             font_style="H4",
             halign="center"
-        ))
+        )
+        favorite_item.add_widget(self.favorite_count_label)
         favorite_item.add_widget(MDLabel(
             text="收藏",
             theme_text_color="Secondary",
@@ -243,12 +285,13 @@ class MainScreen(BaseScreen):
             orientation="vertical",
             spacing=dp(4)
         )
-        recent_item.add_widget(MDLabel(
+        self.recent_count_label = MDLabel(
             text="0",
             theme_text_color="Primary",
             font_style="H4",
             halign="center"
-        ))
+        )
+        recent_item.add_widget(self.recent_count_label)
         recent_item.add_widget(MDLabel(
             text="最近",
             theme_text_color="Secondary",
@@ -301,6 +344,8 @@ class MainScreen(BaseScreen):
         # 根据屏幕名称执行相应操作
         if screen_name == "home":
             self.screen_manager.current = "home"
+        elif screen_name == "word_list":
+            self._show_word_list_screen()
         elif screen_name == "search":
             self._show_search_screen()
         elif screen_name == "favorites":
@@ -325,33 +370,54 @@ class MainScreen(BaseScreen):
             self.show_snackbar("请输入搜索关键词")
     
     def _load_home_data(self):
-        """加载首页数据"""
+        """加载首页数据
+
+        先显示上次退出时保存的启动快照，数据库就绪后由应用在后台校正。
+        """
         try:
-            # 这里加载统计数据
-            # 暂时使用模拟数据
-            pass
+            from services.warm_start_service import warm_start_service
+            self.apply_home_data(warm_start_service.get_home_stats())
         except Exception as e:
             self.logger.error(f"加载首页数据失败: {e}")
     
+    def apply_home_data(self, home: dict):
+        """用统计数据更新首页"""
+        if not home:
+            return
+        self.total_count_label.text = str(home.get('total_entries', 0))
+        self.favorite_count_label.text = str(home.get('favorite_entries', 0))
+        self.recent_count_label.text = str(home.get('recent_entries', 0))
+        
+        self.recent_list.clear_widgets()
+        for item in home.get('recent_words', []):
+            self.recent_list.add_widget(TwoLineListItem(
+                text=f"{item.get('word_id', '')}  {item.get('latin_form', '')}",
+                secondary_text=item.get('definition') or ''
+            ))
+    
+    def _show_word_list_screen(self):
+        """显示词条列表屏幕"""
+        self.open_screen("word_list")
+    
     def _show_search_screen(self):
         """显示搜索屏幕"""
-        self.show_snackbar("搜索功能开发中...")
+        self.open_screen("search")
     
     def _show_favorites_screen(self):
         """显示收藏夹屏幕"""
-        self.show_snackbar("收藏夹功能开发中...")
+        self.open_screen("favorites")
     
     def _show_add_word_screen(self):
         """显示添加词条屏幕"""
-        self.show_snackbar("添加词条功能开发中...")
+        self.open_screen("add")
     
     def _show_tools_screen(self):
         """显示工具屏幕"""
-        self.show_snackbar("工具功能开发中...")
+        self.open_screen("tools")
     
     def _show_settings_screen(self):
         """显示设置屏幕"""
-        self.show_snackbar("设置功能开发中...")
+        self.open_screen("settings")
     
     def _show_about_screen(self):
         """显示关于屏幕"""
@@ -166,7 +166,7 @@ class MemoWordsScreen(BaseScreen):
     def _load_memo_words(self):
         """加载备忘列表"""
         try:
-            self.memo_words = memo_service.get_all_memo_words()
+            self.memo_words = self._filter_memo_words()
             self._update_memo_display()
         except Exception as e:
             self.logger.error(f"加载备忘列表失败: {e}")
@@ -176,8 +176,7 @@ class MemoWordsScreen(BaseScreen):
         """更新备忘显示"""
         self.memo_list.clear_widgets()
         
-        # 筛选备忘
-        filtered_memos = self._filter_memo_words()
+        filtered_memos = self.memo_words
         
         if not filtered_memos:
             empty_item = OneLineListItem(
@@ -226,26 +225,17 @@ class MemoWordsScreen(BaseScreen):
             self.memo_list.add_widget(item)
     
     def _filter_memo_words(self):
-        """筛选备忘"""
-        filtered = self.memo_words
-        
-        # 按状态筛选
-        if self.current_status == "已完成":
-            filtered = [m for m in filtered if m.is_completed]
-        elif self.current_status == "待处理":
-            filtered = [m for m in filtered if not m.is_completed]
-        
-        # 按搜索词筛选
-        if self.search_query:
-            query = self.search_query.lower()
-            filtered = [m for m in filtered if query in m.content.lower()]
-        
-        return filtered
+        """筛选备忘（状态和搜索词在数据库中筛选）"""
+        statuses = {"已完成": True, "待处理": False}
+        return memo_service.query_memo_words(
+            is_completed=statuses.get(self.current_status),
+            query=self.search_query.strip()
+        )
     
     def _search_memo_words(self, instance):
         """搜索备忘"""
         self.search_query = self.search_field.text
-        self._update_memo_display()
+        self._load_memo_words()
     
     def _show_status_menu(self, instance):
         """显示状态菜单"""
@@ -269,7 +259,7 @@ class MemoWordsScreen(BaseScreen):
         """选择状态"""
         self.current_status = status
         self.status_btn.text = status
-        self._update_memo_display()
+        self._load_memo_words()
     
     def _view_memo_detail(self, memo):
         """查看备忘详情"""
@@ -0,0 +1,145 @@
+"""
+屏幕缓存
+Screen Cache
+
+屏幕以工厂形式注册，首次导航时才导入模块并构造；
+构造后的屏幕按最近使用顺序缓存，超出上限时移除最久未用的屏幕。
+"""
+
+import importlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from kivy.clock import Clock
+
+from app.config import config
+from utils.logger import get_logger
+
+
+class ScreenCache:
+    """屏幕缓存类"""
+
+    def __init__(self, screen_manager, max_size: int = None):
+        self.logger = get_logger(self.__class__.__name__)
+        self.screen_manager = screen_manager
+        if max_size is None:
+            max_size = config.get_int('UI', 'screen_cache_size', 4)
+        self.max_size = max(1, max_size)
+        self._factories: Dict[str, Callable] = {}
+        self._screens = OrderedDict()
+        self._prewarm_queue: List[str] = []
+        self._prewarm_event = None
+
+    def register(self, name: str, factory: Callable):
+        """注册屏幕工厂，``factory(name)`` 返回屏幕实例"""
+        self._factories[name] = factory
+
+    def register_class(self, name: str, module_path: str, class_name: str, **kwargs):
+        """按模块路径注册屏幕类，模块在首次构造时才导入"""
+        def factory(screen_name):
+            module = importlib.import_module(module_path)
+            screen_class = getattr(module, class_name)
+            return screen_class(name=screen_name, **kwargs)
+        self.register(name, factory)
+
+    def is_registered(self, name: str) -> bool:
+        """屏幕是否已注册"""
+        return name in self._factories
+
+    def is_cached(self, name: str) -> bool:
+        """屏幕是否已构造并缓存"""
+        return name in self._screens
+
+    @property
+    def cached_names(self) -> List[str]:
+        """已缓存的屏幕（从最久未用到最近使用）"""
+        return list(self._screens)
+
+    def get(self, name: str):
+        """获取屏幕，未构造时调用工厂创建"""
+        screen = self._screens.get(name)
+        if screen is not None:
+            self._screens.move_to_end(name)
+            return screen
+
+        factory = self._factories[name]
+        screen = factory(name)
+        screen.name = name
+        self.screen_manager.add_widget(screen)
+        self._screens[name] = screen
+        self.logger.info(f"屏幕已构造: {name}")
+        self._evict()
+        return screen
+
+    def show(self, name: str):
+        """切换到屏幕；已缓存的屏幕只刷新数据而不重建"""
+        cached = self.is_cached(name)
+        screen = self.get(name)
+        if cached and hasattr(screen, 'refresh_data'):
+            screen.refresh_data()
+        self.screen_manager.current = name
+        return screen
+
+    def prewarm(self, names: Iterable[str], delay: float = 0.5):
+        """在空闲帧中逐个预先构造屏幕（每帧最多一个）"""
+        for name in names:
+            if self.is_registered(name) and name not in self._prewarm_queue:
+                self._prewarm_queue.append(name)
+        if self._prewarm_queue and self._prewarm_event is None:
+            self._prewarm_event = Clock.schedule_once(self._prewarm_next, delay)
+
+    def cancel_prewarm(self):
+        """取消尚未执行的预构造"""
+        self._prewarm_queue.clear()
+        if self._prewarm_event is not None:
+            self._prewarm_event.cancel()
+            self._prewarm_event = None
+
+    def remove(self, name: str):
+        """从缓存和屏幕管理器中移除屏幕"""
+        screen = self._screens.pop(name, None)
+        if screen is not None:
+            self.screen_manager.remove_widget(screen)
+
+    def clear(self):
+        """移除所有缓存的屏幕"""
+        self.cancel_prewarm()
+        for name in list(self._screens):
+            self.remove(name)
+
+    def _prewarm_next(self, dt):
+        """预构造队列中的下一个屏幕"""
+        self._prewarm_event = None
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if self.is_cached(name):
+                continue
+            try:
+                # 预构造的屏幕不应挤掉最近使用的屏幕
+                if len(self._screens) >= self.max_size:
+                    self._prewarm_queue.clear()
+                    return
+                self.get(name)
+            except Exception as e:
+                self.logger.error(f"预构造屏幕失败 {name}: {e}")
+            break
+
+        if self._prewarm_queue:
+            self._prewarm_event = Clock.schedule_once(self._prewarm_next, 0)
+
+    def _evict(self):
+        """移除超出上限的最久未用屏幕（当前屏幕除外）"""
+        current = self.screen_manager.current
+        while len(self._screens) > self.max_size:
+            victim: Optional[str] = next(
+                (name for name in self._screens if name != current and name != self._newest()),
+                None
+            )
+            if victim is None:
+                return
+            self.remove(victim)
+            self.logger.info(f"屏幕已移出缓存: {victim}")
+
+    def _newest(self) -> Optional[str]:
+        """最近使用的屏幕"""
+        return next(reversed(self._screens), None)
@@ -68,6 +68,10 @@ class SettingsScreen(BaseScreen):
         self.data_settings_card = self._create_data_settings_card()
         self.main_container.add_widget(self.data_settings_card)
         
+        # 调试卡片
+        self.debug_card = self._create_debug_card()
+        self.main_container.add_widget(self.debug_card)
+        
         # 关于卡片
         self.about_card = self._create_about_card()
         self.main_container.add_widget(self.about_card)
@@ -524,6 +528,176 @@ class SettingsScreen(BaseScreen):
         card.add_widget(layout)
         return card
     
+    def _create_debug_card(self):
+        """创建调试卡片"""
+        card = MDCard(
+            padding=dp(16),
+            radius=[15, 15, 15, 15]
+        )
+        
+        layout = MDBoxLayout(
+            orientation='vertical',
+            spacing=dp(16)
+        )
+        
+        # 标题
+        title = MDLabel(
+            text="调试",
+            theme_text_color="Primary",
+            font_style="H6"
+        )
+        layout.add_widget(title)
+        
+        # 性能统计
+        instrumentation_layout = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
+        instrumentation_label = MDLabel(
+            text="性能统计",
+            theme_text_color="Primary",
+            font_style="Body1",
+            size_hint_x=0.7
+        )
+        instrumentation_layout.add_widget(instrumentation_label)
+        
+        self.instrumentation_switch = MDSwitch(
+            active=False,
+            size_hint_x=0.3
+        )
+        self.instrumentation_switch.bind(active=self._on_instrumentation_toggle)
+        instrumentation_layout.add_widget(self.instrumentation_switch)
+        
+        layout.add_widget(instrumentation_layout)
+        
+        # 查看、导出和重置
+        instrumentation_buttons = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10)
+        )
+        
+        view_stats_btn = MDRaisedButton(
+            text="查看统计",
+            size_hint_x=0.33,
+            on_release=self._show_instrumentation_stats
+        )
+        instrumentation_buttons.add_widget(view_stats_btn)
+        
+        export_stats_btn = MDRaisedButton(
+            text="导出JSON",
+            size_hint_x=0.33,
+            on_release=self._export_instrumentation_stats
+        )
+        instrumentation_buttons.add_widget(export_stats_btn)
+        
+        reset_stats_btn = MDRaisedButton(
+            text="重置",
+            size_hint_x=0.33,
+            on_release=self._reset_instrumentation_stats
+        )
+        instrumentation_buttons.add_widget(reset_stats_btn)
+        
+        layout.add_widget(instrumentation_buttons)
+        
+        # 慢查询
+        slow_query_buttons = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10)
+        )
+        
+        view_slow_queries_btn = MDRaisedButton(
+            text="慢查询",
+            size_hint_x=0.5,
+            on_release=self._show_slow_queries
+        )
+        slow_query_buttons.add_widget(view_slow_queries_btn)
+        
+        export_slow_queries_btn = MDRaisedButton(
+            text="导出慢查询",
+            size_hint_x=0.5,
+            on_release=self._export_slow_queries
+        )
+        slow_query_buttons.add_widget(export_slow_queries_btn)
+        
+        layout.add_widget(slow_query_buttons)
+        
+        # 采样分析
+        profiler_layout = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
+        profiler_label = MDLabel(
+            text="采样分析（停止时导出火焰图数据）",
+            theme_text_color="Primary",
+            font_style="Body1",
+            size_hint_x=0.7
+        )
+        profiler_layout.add_widget(profiler_label)
+        
+        self.profiler_switch = MDSwitch(
+            active=False,
+            size_hint_x=0.3
+        )
+        self.profiler_switch.bind(active=self._on_profiler_toggle)
+        profiler_layout.add_widget(self.profiler_switch)
+        
+        layout.add_widget(profiler_layout)
+        
+        # 帧时间监测
+        frame_monitor_layout = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
+        frame_monitor_label = MDLabel(
+            text="帧时间监测",
+            theme_text_color="Primary",
+            font_style="Body1",
+            size_hint_x=0.7
+        )
+        frame_monitor_layout.add_widget(frame_monitor_label)
+        
+        self.frame_monitor_switch = MDSwitch(
+            active=False,
+            size_hint_x=0.3
+        )
+        self.frame_monitor_switch.bind(active=self._on_frame_monitor_toggle)
+        frame_monitor_layout.add_widget(self.frame_monitor_switch)
+        
+        layout.add_widget(frame_monitor_layout)
+        
+        frame_monitor_buttons = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(10)
+        )
+        
+        view_frames_btn = MDRaisedButton(
+            text="帧时间统计",
+            size_hint_x=0.5,
+            on_release=self._show_frame_stats
+        )
+        frame_monitor_buttons.add_widget(view_frames_btn)
+        
+        export_frames_btn = MDRaisedButton(
+            text="导出帧时间",
+            size_hint_x=0.5,
+            on_release=self._export_frame_stats
+        )
+        frame_monitor_buttons.add_widget(export_frames_btn)
+        
+        layout.add_widget(frame_monitor_buttons)
+        
+        card.add_widget(layout)
+        return card
+    
     def _create_about_card(self):
         """创建关于卡片"""
         card = MDCard(
@@ -638,6 +812,14 @@ class SettingsScreen(BaseScreen):
             self.search_history_switch.active = config.getboolean('SEARCH', 'save_history', True)
             self.fuzzy_search_switch.active = config.getboolean('SEARCH', 'default_fuzzy', True)
             
+            # 加载调试设置
+            from services.instrumentation_service import instrumentation_service
+            from services.profiler_service import profiler_service
+            from services.frame_monitor_service import frame_monitor_service
+            self.instrumentation_switch.active = instrumentation_service.enabled
+            self.profiler_switch.active = profiler_service.running
+            self.frame_monitor_switch.active = frame_monitor_service.enabled
+            
         except Exception as e:
             self.logger.error(f"加载设置失败: {e}")
     
@@ -863,6 +1045,95 @@ class SettingsScreen(BaseScreen):
         """确认清除数据"""
         self.show_snackbar("清除数据功能开发中...")
     
+    def _on_instrumentation_toggle(self, instance, active):
+        """开启或关闭性能统计（立即生效并保存）"""
+        from services.instrumentation_service import instrumentation_service
+        
+        if active == instrumentation_service.enabled:
+            return
+        if active:
+            if not instrumentation_service.enable():
+                self.show_snackbar("开启性能统计失败")
+                instance.active = False
+                return
+        else:
+            instrumentation_service.disable()
+        config.set('DEBUG', 'instrumentation', str(active).lower())
+    
+    def _show_instrumentation_stats(self, instance):
+        """显示性能统计"""
+        from services.instrumentation_service import instrumentation_service
+        self.show_dialog(title="性能统计", text=instrumentation_service.format_report())
+    
+    def _export_instrumentation_stats(self, instance):
+        """导出性能统计到导出目录"""
+        from services.instrumentation_service import instrumentation_service
+        
+        filepath = instrumentation_service.dump_json()
+        self.show_snackbar(f"已导出: {filepath}" if filepath else "导出性能统计失败")
+    
+    def _reset_instrumentation_stats(self, instance):
+        """清空性能统计"""
+        from services.instrumentation_service import instrumentation_service
+        
+        instrumentation_service.reset()
+        self.show_snackbar("性能统计已重置")
+    
+    def _on_profiler_toggle(self, instance, active):
+        """开始或停止采样分析，停止时导出折叠栈文件"""
+        from services.profiler_service import profiler_service
+        
+        if active == profiler_service.running:
+            return
+        if active:
+            profiler_service.start()
+            self.show_snackbar(f"采样分析已开始（{profiler_service.rate_hz:g}Hz）")
+            return
+        filepath = profiler_service.stop()
+        self.show_snackbar(f"已导出: {filepath}" if filepath else "导出采样结果失败")
+    
+    def _on_frame_monitor_toggle(self, instance, active):
+        """开启或关闭帧时间监测及浮层（立即生效并保存）"""
+        from services.frame_monitor_service import frame_monitor_service
+        from views.components.frame_overlay import show_frame_overlay, hide_frame_overlay
+        
+        if active == frame_monitor_service.enabled:
+            return
+        if active:
+            if not frame_monitor_service.start():
+                self.show_snackbar("开启帧时间监测失败")
+                instance.active = False
+                return
+            show_frame_overlay(frame_monitor_service)
+        else:
+            frame_monitor_service.stop()
+            hide_frame_overlay()
+        config.set('DEBUG', 'frame_monitor', str(active).lower())
+    
+    def _show_frame_stats(self, instance):
+        """显示各屏幕的帧时间统计"""
+        from services.frame_monitor_service import frame_monitor_service
+        self.show_dialog(title="帧时间统计", text=frame_monitor_service.format_report())
+    
+    def _export_frame_stats(self, instance):
+        """导出帧时间统计到导出目录"""
+        from services.frame_monitor_service import frame_monitor_service
+        
+        filepath = frame_monitor_service.dump_json()
+        self.show_snackbar(f"已导出: {filepath}" if filepath else "导出帧时间统计失败")
+    
+    def _show_slow_queries(self, instance):
+        """显示最近的慢查询"""
+        from services.slow_query_service import slow_query_service
+        self.show_dialog(title="慢查询", text=slow_query_service.format_report())
+    
+    def _export_slow_queries(self, instance):
+        """导出慢查询到日志目录"""
+        from services.slow_query_service import slow_query_service
+        
+        filepath = slow_query_service.dump_json()
+        self.show_snackbar(f"已导出: {filepath}" if filepath else "导出慢查询失败")
+    
     def _show_help(self, instance):
         """显示帮助"""
         self.show_dialog(
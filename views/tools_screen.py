@@ -283,10 +283,7 @@ class ToolsScreen(BaseScreen):
     def _show_url_bookmarks(self, instance):
         """显示网址收藏界面"""
         try:
-            from .url_bookmark_screen import UrlBookmarkScreen
-            bookmark_screen = UrlBookmarkScreen(name="url_bookmarks")
-            self.screen_manager.add_widget(bookmark_screen)
-            self.screen_manager.current = "url_bookmarks"
+            self.navigate_to("url_bookmarks")
         except Exception as e:
             self.logger.error(f"显示网址收藏界面失败: {e}")
             self.show_snackbar("网址收藏界面加载失败")
@@ -294,10 +291,9 @@ class ToolsScreen(BaseScreen):
     def _add_url_bookmark(self, instance):
         """添加网址收藏"""
         try:
-            from .url_bookmark_screen import UrlBookmarkScreen
-            bookmark_screen = UrlBookmarkScreen(name="add_bookmark")
-            self.screen_manager.add_widget(bookmark_screen)
-            self.screen_manager.current = "add_bookmark"
+            bookmark_screen = self.navigate_to("url_bookmarks")
+            if bookmark_screen:
+                bookmark_screen._show_add_bookmark_dialog(instance)
         except Exception as e:
             self.logger.error(f"添加网址收藏失败: {e}")
             self.show_snackbar("添加网址收藏失败")
@@ -305,10 +301,7 @@ class ToolsScreen(BaseScreen):
     def _show_memo_words(self, instance):
         """显示备忘词条界面"""
         try:
-            from .memo_words_screen import MemoWordsScreen
-            memo_screen = MemoWordsScreen(name="memo_words")
-            self.screen_manager.add_widget(memo_screen)
-            self.screen_manager.current = "memo_words"
+            self.navigate_to("memo_words")
         except Exception as e:
             self.logger.error(f"显示备忘词条界面失败: {e}")
             self.show_snackbar("备忘词条界面加载失败")
@@ -316,10 +309,9 @@ class ToolsScreen(BaseScreen):
     def _add_memo_word(self, instance):
         """添加备忘词条"""
         try:
-            from .memo_words_screen import MemoWordsScreen
-            memo_screen = MemoWordsScreen(name="add_memo")
-            self.screen_manager.add_widget(memo_screen)
-            self.screen_manager.current = "add_memo"
+            memo_screen = self.navigate_to("memo_words")
+            if memo_screen:
+                memo_screen._show_add_memo_dialog(instance)
         except Exception as e:
             self.logger.error(f"添加备忘词条失败: {e}")
             self.show_snackbar("添加备忘词条失败")
@@ -327,10 +319,7 @@ class ToolsScreen(BaseScreen):
     def _open_ids_editor(self, instance):
         """打开IDS符号编辑器"""
         try:
-            from .ids_editor_screen import IdsEditorScreen
-            ids_screen = IdsEditorScreen(name="ids_editor")
-            self.screen_manager.add_widget(ids_screen)
-            self.screen_manager.current = "ids_editor"
+            self.navigate_to("ids_editor")
         except Exception as e:
             self.logger.error(f"打开IDS编辑器失败: {e}")
             self.show_snackbar("IDS编辑器加载失败")
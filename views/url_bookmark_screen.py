@@ -167,7 +167,7 @@ class UrlBookmarkScreen(BaseScreen):
     def _load_bookmarks(self):
         """加载收藏列表"""
         try:
-            self.bookmarks = bookmark_service.get_all_bookmarks()
+            self.bookmarks = self._filter_bookmarks()
             self._update_bookmarks_display()
         except Exception as e:
             self.logger.error(f"加载收藏列表失败: {e}")
@@ -177,8 +177,7 @@ class UrlBookmarkScreen(BaseScreen):
         """更新收藏显示"""
         self.bookmarks_list.clear_widgets()
         
-        # 筛选收藏
-        filtered_bookmarks = self._filter_bookmarks()
+        filtered_bookmarks = self.bookmarks
         
         if not filtered_bookmarks:
             empty_item = OneLineListItem(
@@ -215,36 +214,31 @@ class UrlBookmarkScreen(BaseScreen):
             self.bookmarks_list.add_widget(item)
     
     def _filter_bookmarks(self):
-        """筛选收藏"""
-        filtered = self.bookmarks
-        
-        # 按分类筛选
-        if self.current_category != "全部":
-            filtered = [b for b in filtered if b.category == self.current_category]
-        
-        # 按搜索词筛选
-        if self.search_query:
-            query = self.search_query.lower()
-            filtered = [b for b in filtered if 
-                       query in b.title.lower() or 
-                       query in b.url.lower() or 
-                       query in (b.description or "").lower()]
-        
-        return filtered
+        """筛选收藏（分类和搜索词在数据库中筛选）"""
+        return bookmark_service.query_bookmarks(
+            category=None if self.current_category == "全部" else self.current_category,
+            query=self.search_query.strip()
+        )
     
     def _search_bookmarks(self, instance):
         """搜索收藏"""
         self.search_query = self.search_field.text
-        self._update_bookmarks_display()
+        self._load_bookmarks()
     
     def _show_category_menu(self, instance):
         """显示分类菜单"""
-        categories = ["全部"] + list(set([b.category for b in self.bookmarks]))
-        
-        menu_items = []
-        for category in categories:
+        # 分类及当前搜索结果中的数量
+        counts = bookmark_service.get_category_counts(self.search_query.strip())
+        
+        menu_items = [{
+            "text": f"全部 ({sum(counts.values())})",
+            "on_release": lambda x: self._select_category("全部")
+        }]
+        for category, count in counts.items():
+            if not category:
+                continue
             menu_items.append({
-                "text": category,
+                "text": f"{category} ({count})",
                 "on_release": lambda x, c=category: self._select_category(c)
             })
         
@@ -259,7 +253,7 @@ class UrlBookmarkScreen(BaseScreen):
         """选择分类"""
         self.current_category = category
         self.category_btn.text = category
-        self._update_bookmarks_display()
+        self._load_bookmarks()
     
     def _open_bookmark(self, bookmark):
         """打开收藏"""
@@ -404,6 +398,10 @@ class UrlBookmarkScreen(BaseScreen):
                     'category': category,
                     'description': description
                 }
+                duplicate = bookmark_service.find_duplicate(url)
+                if duplicate:
+                    self.show_snackbar(f"该网址已收藏: {duplicate.title}")
+                    return
                 bookmark_service.add_bookmark(bookmark_data)
                 self.show_snackbar("收藏已添加")
             
@@ -22,6 +22,9 @@ from .components.word_card import WordCard
 from utils.logger import get_logger
 from services.dictionary_service import dictionary_service
 from services.search_service import search_service
+from services.search_executor import search_executor
+from services.database_service import db_service
+from services.warm_start_service import warm_start_service
 
 
 class WordListScreen(BaseScreen):
@@ -254,18 +257,45 @@ class WordListScreen(BaseScreen):
         self._refresh_list()
         self.logger.info(f"筛选已设置为: {'仅收藏' if favorites_only else '全部'}")
     
-    def _load_word_entries(self):
+    def _load_word_entries(self, immediate=True):
         """加载词条列表"""
         try:
             if self.current_search_query:
-                # 执行搜索
-                self.word_entries = search_service.search_words(
-                    self.current_search_query,
-                    search_type=self.search_bar.search_type,
-                    case_sensitive=self.search_bar.case_sensitive,
-                    fuzzy=self.search_bar.fuzzy_search
+                # 在后台线程执行搜索，结果通过回调返回主线程
+                self.stats_label.text = "搜索中..."
+                search_executor.submit(
+                    search_service.search_words,
+                    args=(self.current_search_query,),
+                    kwargs={
+                        'search_type': self.search_bar.search_type,
+                        'case_sensitive': self.search_bar.case_sensitive,
+                        'fuzzy': self.search_bar.fuzzy_search
+                    },
+                    callback=self._on_search_results,
+                    error_callback=self._on_search_failed,
+                    delay=0 if immediate else None
                 )
+                return
             else:
+                # 丢弃尚未返回的搜索结果
+                search_executor.cancel()
+                
+                # 数据库尚未打开时先显示启动快照中的第一页，完整列表在后台加载
+                if not db_service.is_loaded and not self.filter_favorites:
+                    cached_page = warm_start_service.get_first_page(self.sort_by, self.sort_order)
+                    if cached_page:
+                        self.word_entries = cached_page
+                        self._update_display()
+                        self.stats_label.text = f"共 {warm_start_service.get_list_total()} 条词条"
+                        search_executor.submit(
+                            dictionary_service.get_all_word_entries,
+                            kwargs={'limit': 1000, 'sort_by': self.sort_by, 'order': self.sort_order},
+                            callback=self._on_entries_loaded,
+                            error_callback=self._on_search_failed,
+                            delay=0
+                        )
+                        return
+                
                 # 加载所有词条
                 if self.filter_favorites:
                     self.word_entries = dictionary_service.get_favorite_word_entries()
@@ -283,6 +313,24 @@ class WordListScreen(BaseScreen):
             self.logger.error(f"加载词条列表失败: {e}")
             self.show_snackbar("加载词条列表失败")
     
+    def _on_search_results(self, results):
+        """后台搜索完成回调（主线程）"""
+        self.word_entries = results
+        self.current_page = 0
+        self._update_display()
+        self.logger.info(f"搜索到 {len(results)} 条词条")
+    
+    def _on_entries_loaded(self, entries):
+        """后台加载完整列表完成回调（主线程）"""
+        self.word_entries = entries
+        self._update_display()
+        self.logger.info(f"加载了 {len(entries)} 条词条")
+    
+    def _on_search_failed(self, error):
+        """后台搜索失败回调（主线程）"""
+        self.logger.error(f"搜索词条失败: {error}")
+        self.show_snackbar("搜索失败")
+    
     def _update_display(self):
         """更新显示"""
         # 清空列表
@@ -335,11 +383,11 @@ class WordListScreen(BaseScreen):
         # 这里应该导航到添加词条界面
         self.show_snackbar("添加词条功能开发中...")
     
-    def on_search(self, query, search_type, case_sensitive, fuzzy_search):
+    def on_search(self, query, search_type, case_sensitive, fuzzy_search, immediate=True):
         """处理搜索事件"""
         self.current_search_query = query
         self.current_page = 0
-        self._load_word_entries()
+        self._load_word_entries(immediate=immediate)
     
     def refresh_data(self):
         """刷新数据"""